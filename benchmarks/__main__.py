@@ -0,0 +1,50 @@
+"""Run the benchmark suite, write JSON results and check for regressions.
+
+    python -m benchmarks --output bench.json
+    python -m benchmarks --baseline benchmarks/baseline.json --threshold 0.25
+
+Exits with status 1 when a benchmark is slower than the baseline by more
+than the threshold.
+"""
+import argparse
+import json
+import sys
+
+from benchmarks.suite import BENCHMARKS, DEFAULT_THRESHOLD, compare, run_suite
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.split("\n")[0])
+    parser.add_argument("names", nargs="*", help=f"benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown as a fraction (default %(default)s)")
+    parser.add_argument("--scale", type=int, default=1, help="work multiplier per run")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark, best is kept")
+    args = parser.parse_args(argv)
+
+    try:
+        report = run_suite(args.names or None, scale=args.scale, repeat=args.repeat)
+    except ValueError as e:
+        parser.error(str(e))
+    for name, result in report["results"].items():
+        print(f"{name:32s} {result['rate']:14,.0f} {result['unit']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        for name, base, rate, change in regressions:
+            print(f"REGRESSION {name}: {base:,.0f} -> {rate:,.0f} ({change:+.0%})")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
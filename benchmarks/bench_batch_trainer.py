@@ -0,0 +1,33 @@
+"""Episodes per second of sequential vs batched self-play training.
+
+Run with ``python -m benchmarks.bench_batch_trainer``.
+"""
+import time
+
+from game.agent import Agent
+from game.batch_trainer import BatchTrainer
+from game.engine import make_engine
+from game.trainer import Trainer
+
+
+def episodes_per_second(make_trainer, episodes):
+    trainer = make_trainer(Agent(1), Agent(-1), episodes)
+    start = time.perf_counter()
+    trainer.run()
+    return episodes / (time.perf_counter() - start)
+
+
+def main(episodes=20000, batch_sizes=(64, 256, 1024, 4096)):
+    baseline = episodes_per_second(
+        lambda a1, a2, n: Trainer(make_engine(), a1, a2, episodes=n), episodes
+    )
+    print(f"{'sequential':>12}: {baseline:10,.0f} episodes/s")
+    for batch_size in batch_sizes:
+        rate = episodes_per_second(
+            lambda a1, a2, n: BatchTrainer(a1, a2, episodes=n, batch_size=batch_size), episodes
+        )
+        print(f"{'batch ' + str(batch_size):>12}: {rate:10,.0f} episodes/s ({rate / baseline:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
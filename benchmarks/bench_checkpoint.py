@@ -0,0 +1,41 @@
+"""File size, save and load time of pickled models vs streamed checkpoints.
+
+Run with ``python -m benchmarks.bench_checkpoint``.
+"""
+import os
+import tempfile
+import time
+
+from game.agent import Agent
+from game.batch_trainer import BatchTrainer
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e3
+
+
+def main(episodes=50000, repeat=20):
+    for store in Agent.STORES:
+        agent1 = Agent(1, store=store)
+        agent2 = Agent(-1, store=store)
+        BatchTrainer(agent1, agent2, episodes=episodes).run()
+        print(f"{store} store, {len(agent2.memory)} states:")
+
+        formats = [("pickle", {"format": "pickle"})] + [
+            (f"ckpt/{c}", {"format": "checkpoint", "compression": c})
+            for c in ("none", "zlib", "lzma")
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, options in formats:
+                path = os.path.join(tmp, name.replace("/", "_"))
+                save_ms = timed(lambda: agent2.save(path, **options), repeat)
+                load_ms = timed(lambda: Agent(-1).load(path), repeat)
+                print(f"  {name:10s} {os.path.getsize(path) / 1024:8.1f} KiB, "
+                      f"save {save_ms:7.2f} ms, load {load_ms:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Episodes and time saved by early stopping, at equal final strength.
+
+For each seed, trains with the fixed TRAINING_EPISODES budget and again
+with a :class:`ConvergenceMonitor` (same budget as the upper bound), then
+plays both final agents greedily against the perfect and the random
+player.
+
+Run with ``python -m benchmarks.bench_convergence [seeds]``.
+"""
+import sys
+import time
+
+from game.agent import Agent
+from game.config import TRAINING_EPISODES
+from game.convergence import ConvergenceMonitor
+from game.engine import make_engine
+from game.evaluate import agent_player, evaluate, perfect_player, random_player
+from game.rng import spawn
+from game.trainer import Trainer
+
+
+def strength(agent1, agent2, games=20000):
+    """Loss rate against perfect play and win rate against random play, per seat."""
+    p1, p2 = agent_player(agent1), agent_player(agent2)
+    return {
+        "loss_vs_perfect": (evaluate(p1, perfect_player(), games, 0)["p2_win_rate"]["rate"],
+                            evaluate(perfect_player(), p2, games, 0)["p1_win_rate"]["rate"]),
+        "win_vs_random": (evaluate(p1, random_player(), games, 0)["p1_win_rate"]["rate"],
+                          evaluate(random_player(), p2, games, 0)["p2_win_rate"]["rate"]),
+    }
+
+
+def train(seed, monitor):
+    seeds = spawn(seed, 3)
+    agent1, agent2 = Agent(1, seed=seeds[0]), Agent(-1, seed=seeds[1])
+    trainer = Trainer(make_engine(), agent1, agent2, episodes=TRAINING_EPISODES, seed=seeds[2])
+    start = time.perf_counter()
+    stats = trainer.run(monitor=monitor)
+    seconds = time.perf_counter() - start
+    return stats.get("episodes", TRAINING_EPISODES), seconds, strength(agent1, agent2)
+
+
+def fmt(result):
+    return (f"loss vs perfect {result['loss_vs_perfect'][0]:.3f}/{result['loss_vs_perfect'][1]:.3f}, "
+            f"win vs random {result['win_vs_random'][0]:.3f}/{result['win_vs_random'][1]:.3f}")
+
+
+def main(seeds=3):
+    perfect_player()
+    saved_episodes = saved_seconds = 0
+    for seed in range(seeds):
+        fixed = train(seed, None)
+        monitor = ConvergenceMonitor(seed=seed)
+        early = train(seed, monitor)
+        print(f"seed {seed}: fixed {fixed[0]:>7,} episodes {fixed[1]:6.1f} s, {fmt(fixed[2])}")
+        print(f"        early {early[0]:>7,} episodes {early[1]:6.1f} s, {fmt(early[2])}")
+        saved_episodes += 1 - early[0] / fixed[0]
+        saved_seconds += 1 - early[1] / fixed[1]
+    print(f"mean saved: {saved_episodes / seeds:.0%} of episodes, {saved_seconds / seeds:.0%} of time")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,55 @@
+"""Moves per second of the NumPy and bitboard engines on random games,
+and make_move + win detection throughput on make/undo cycles.
+
+Run with ``python -m benchmarks.bench_engine``.
+"""
+import random
+import time
+
+from game.engine import make_engine
+
+
+def moves_per_second(backend, games=20000, seed=0, size=(3, 3, 3)):
+    rng = random.Random(seed)
+    engine = make_engine(backend, *size)
+    moves = 0
+    start = time.perf_counter()
+    for _ in range(games):
+        engine.reset()
+        player = 1
+        while not engine.done:
+            r, c = rng.choice(engine.get_valid_moves())
+            engine.make_move(r, c, player)
+            player = -player
+            moves += 1
+    return moves / (time.perf_counter() - start)
+
+
+def make_undo_per_second(backend, cycles=100000):
+    """make_move (with its win/tie check) followed by undo_move on a mid-game board."""
+    engine = make_engine(backend)
+    for r, c, p in ((0, 0, 1), (1, 1, -1), (0, 1, 1), (2, 2, -1)):
+        engine.make_move(r, c, p)
+    make_move, undo_move = engine.make_move, engine.undo_move
+    start = time.perf_counter()
+    for _ in range(cycles):
+        make_move(0, 2, 1)
+        undo_move(0, 2)
+    return cycles / (time.perf_counter() - start)
+
+
+def main():
+    results = {backend: moves_per_second(backend) for backend in ("numpy", "bitboard")}
+    for backend, rate in results.items():
+        print(f"{backend:>8}: {rate:12,.0f} moves/s in random games, "
+              f"{make_undo_per_second(backend):12,.0f} make+undo/s")
+    print(f" speedup: {results['bitboard'] / results['numpy']:.1f}x")
+
+    for size in ((5, 5, 4), (15, 15, 5)):
+        rates = [moves_per_second(backend, games=200, size=size) for backend in ("numpy", "bitboard")]
+        print(f"{size[0]}x{size[1]} k={size[2]}: numpy {rates[0]:10,.0f}, "
+              f"bitboard {rates[1]:10,.0f} moves/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Game journal costs: recording on the request path, streaming and re-training.
+
+Writes a journal of random games, then reports the time per
+``JournalWriter.record`` call, the streaming rate of ``iter_journal`` and
+the replay rate of ``Trainer.retrain``, with the peak traced memory of
+each pass: it stays flat however large the journal grows.
+
+Run with ``python -m benchmarks.bench_journal [games]``.
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from game.agent import Agent
+from game.engine import make_engine
+from game.journal import JournalWriter, iter_journal
+from game.trainer import Trainer
+
+
+def random_games(n, seed=0):
+    """*n* random games as ``(cells, outcome)``, cycled from a pool of 10000."""
+    rng = np.random.default_rng(seed)
+    engine = make_engine()
+    pool = []
+    for _ in range(min(n, 10000)):
+        engine.reset()
+        cells, player = [], 1
+        for cell in rng.permutation(9).tolist():
+            engine.make_move(cell // 3, cell % 3, player)
+            cells.append(cell)
+            player = -player
+            if engine.done:
+                break
+        pool.append((cells, {"Player 1": 1, "Player 2": -1, None: 0}[engine.winner]))
+    return (pool[i % len(pool)] for i in range(n))
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def peak_memory(fn):
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main(games=1000000):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "games.journal")
+        journal = JournalWriter(path)
+        pool = list(random_games(games))
+        start = time.perf_counter()
+        for cells, outcome in pool:
+            journal.record(cells, outcome)
+        record_seconds = time.perf_counter() - start
+        journal.close()
+        del pool
+        size = os.path.getsize(path)
+        print(f"{games:,} games, {size / 2 ** 20:.1f} MiB ({size / games:.1f} B/game); "
+              f"record {record_seconds / games * 1e6:.2f} us/game")
+
+        count, seconds = timed(lambda: sum(1 for _ in iter_journal(path)))
+        peak = peak_memory(lambda: sum(1 for _ in iter_journal(path)))
+        print(f"iter_journal {count / seconds:12,.0f} games/s, "
+              f"{size / seconds / 2 ** 20:6.1f} MiB/s, peak {peak / 2 ** 20:.1f} MiB")
+
+        trainer = Trainer(make_engine(), Agent(1), Agent(-1))
+        stats, seconds = timed(lambda: trainer.retrain([path]))
+        peak = peak_memory(lambda: trainer.retrain([path]))
+        print(f"retrain      {stats['games'] / seconds:12,.0f} games/s, "
+              f"peak {peak / 2 ** 20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
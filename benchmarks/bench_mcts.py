@@ -0,0 +1,38 @@
+"""Playouts per second and per-move latency of MCTSAgent at several budgets.
+
+Run with ``python -m benchmarks.bench_mcts``.
+"""
+import time
+
+from game.engine import make_engine
+from game.mcts import MCTSAgent
+
+
+def opening(size):
+    engine = make_engine(rows=size[0], cols=size[1], win_length=size[2])
+    engine.make_move(size[0] // 2, size[1] // 2, 1)
+    return engine.state
+
+
+def main():
+    for size in ((3, 3, 3), (7, 7, 4), (15, 15, 5)):
+        state = opening(size)
+        label = f"{size[0]}x{size[1]} k={size[2]}"
+        for iterations in (100, 1000, 5000):
+            agent = MCTSAgent(-1, iterations=iterations, win_length=size[2])
+            start = time.perf_counter()
+            agent.choose_action(state)
+            elapsed = time.perf_counter() - start
+            print(f"{label:>12} {iterations:>5} playouts: {elapsed * 1e3:8.1f} ms/move, "
+                  f"{iterations / elapsed:8,.0f} playouts/s")
+        for budget in (0.01, 0.1):
+            agent = MCTSAgent(-1, time_budget=budget, win_length=size[2])
+            start = time.perf_counter()
+            agent.choose_action(state)
+            elapsed = time.perf_counter() - start
+            print(f"{label:>12} {budget * 1e3:>4.0f} ms budget: {elapsed * 1e3:8.1f} ms/move, "
+                  f"{agent.playouts:6d} playouts")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""Wall-clock speedup of process-parallel training over a single worker.
+
+Run with ``python -m benchmarks.bench_parallel``.
+"""
+import os
+import time
+
+from game.agent import Agent
+from game.parallel import ParallelTrainer
+
+
+def main(episodes=100000, batch_size=1024):
+    counts = sorted({1, 2, 4, 8, os.cpu_count() or 1})
+    baseline = None
+    for workers in counts:
+        start = time.perf_counter()
+        stats = ParallelTrainer(Agent(1), Agent(-1), episodes=episodes, workers=workers,
+                                batch_size=batch_size).run()
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers:>3} workers: {elapsed:7.2f}s wall, {baseline / elapsed:5.1f}x vs 1 worker, "
+              f"parallelism {stats['parallelism']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
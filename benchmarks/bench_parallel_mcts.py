@@ -0,0 +1,41 @@
+"""Root-parallel MCTS scaling from 1 to N worker processes.
+
+With a fixed per-worker time budget, total playouts per move should grow
+with the number of cores; ``merge`` is the time beyond the slowest
+worker's search spent dispatching, transferring and merging visit counts.
+
+Run with ``python -m benchmarks.bench_parallel_mcts``.
+"""
+import os
+import time
+
+from game.engine import make_engine
+from game.parallel_mcts import ParallelMCTSAgent, get_pool, shutdown_pool
+
+
+def main(budget=0.2, size=(7, 7, 4), moves=5):
+    engine = make_engine(rows=size[0], cols=size[1], win_length=size[2])
+    engine.make_move(size[0] // 2, size[1] // 2, 1)
+    state = engine.state
+
+    counts = sorted({1, 2, 4, 8, os.cpu_count() or 1})
+    baseline = None
+    for workers in counts:
+        get_pool(workers)  # warm the pool outside the measurement
+        agent = ParallelMCTSAgent(-1, workers=workers, time_budget=budget, win_length=size[2])
+        playouts = merge = 0.0
+        start = time.perf_counter()
+        for _ in range(moves):
+            agent.choose_action(state)
+            playouts += agent.playouts
+            merge += agent.merge_seconds
+        elapsed = (time.perf_counter() - start) / moves
+        rate = playouts / moves / elapsed
+        baseline = baseline or rate
+        print(f"{workers:>3} workers: {elapsed * 1e3:7.1f} ms/move, {playouts / moves:8.0f} playouts, "
+              f"{rate / baseline:4.1f}x playouts/s vs 1 worker, merge {merge / moves * 1e3:5.1f} ms")
+        shutdown_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Game-start and per-move cost of unpickling p2.dat vs a mapped policy file.
+
+Run with ``python -m benchmarks.bench_policy``.
+"""
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from game.agent import Agent
+from game.batch_trainer import BatchTrainer
+from game.policy import PolicyTable, export_policy
+
+
+def per_call(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main(episodes=50000):
+    agent1 = Agent(1)
+    agent2 = Agent(-1)
+    BatchTrainer(agent1, agent2, episodes=episodes).run()
+    state = np.zeros((3, 3))
+    state[0, 0] = 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = os.path.join(tmp, "p2.dat")
+        policy_path = os.path.join(tmp, "p2.policy")
+        agent2.save(model_path, format="pickle")
+        export_policy(agent2, policy_path)
+
+        def load_pickle():
+            Agent(-1).load(model_path)
+
+        table = PolicyTable(policy_path)
+        print(f"  pickle: {os.path.getsize(model_path) / 1024:7.1f} KiB, "
+              f"{per_call(load_pickle, 50):8.1f} us per game start, "
+              f"{per_call(lambda: agent2.choose_action(state, greedy=True), 20000):6.2f} us per move")
+        print(f"  policy: {os.path.getsize(policy_path) / 1024:7.1f} KiB, "
+              f"{per_call(lambda: PolicyTable(policy_path).close(), 500):8.1f} us to map "
+              f"(once per process), "
+              f"{per_call(lambda: table.choose_action(state), 20000):6.2f} us per move")
+        table.close()
+
+
+if __name__ == "__main__":
+    main()
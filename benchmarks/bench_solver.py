@@ -0,0 +1,28 @@
+"""Full-tree solve time and per-move latency of the perfect-play solver.
+
+Run with ``python -m benchmarks.bench_solver``.
+"""
+import time
+
+from game.engine import make_engine
+from game.solver import Solver, SolverAgent
+
+
+def main(moves=100000):
+    start = time.perf_counter()
+    solver = Solver().solve()
+    print(f"solve: {time.perf_counter() - start:.3f}s for {len(solver.values)} positions "
+          f"({len(solver.table)} transposition-table entries)")
+
+    agent = SolverAgent(-1)
+    engine = make_engine()
+    engine.make_move(0, 0, 1)
+    state = engine.state
+    start = time.perf_counter()
+    for _ in range(moves):
+        agent.choose_action(state, greedy=True)
+    print(f" move: {(time.perf_counter() - start) / moves * 1e6:.2f} us per choose_action")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Startup cost of the command line and the web apps.
+
+Starts a fresh interpreter per run and reports, for each entry point, the
+wall time to import it and play a human-human game, the cumulative
+``python -X importtime`` cost of the import, and whether NumPy, the
+agents or the trainer were loaded on the way. None of them should be: a
+human-human game never needs them.
+
+Run with ``python -m benchmarks.bench_startup [runs]``.
+"""
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY_POINTS = ("cli", "web.app", "web.asgi")
+HEAVY = ("numpy", "game.agent", "game.trainer")
+
+GAME = """
+import sys
+import {module}
+from game.session import GameSession
+
+session = GameSession()
+session.new_game("human-human")
+for row, col in ((0, 0), (1, 0), (0, 1), (1, 1), (0, 2)):
+    session.make_move(row, col)
+print(",".join(name for name in {heavy!r} if name in sys.modules))
+"""
+
+
+def run_game(module):
+    """Play a human-human game in a fresh interpreter; returns ``(seconds, heavy modules loaded)``."""
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", GAME.format(module=module, heavy=HEAVY)],
+                            cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    return time.perf_counter() - start, [name for name in output.strip().split(",") if name]
+
+
+def import_time(module):
+    """Cumulative ``-X importtime`` microseconds of importing *module* in a fresh interpreter."""
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=ROOT, capture_output=True, text=True, check=True).stderr
+    for line in stderr.splitlines():
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1])
+    raise ValueError(f"{module!r} missing from the import time report")
+
+
+def main(runs=5):
+    bare = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        bare.append(time.perf_counter() - start)
+    bare = min(bare)
+    print(f"{'interpreter':12s} {bare * 1e3:7.1f} ms")
+    for module in ENTRY_POINTS:
+        seconds, heavy = min(run_game(module) for _ in range(runs))
+        imported = min(import_time(module) for _ in range(runs))
+        print(f"{module:12s} {seconds * 1e3:7.1f} ms to play, import {imported / 1e3:6.1f} ms, "
+              f"heavy modules: {', '.join(heavy) or 'none'}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
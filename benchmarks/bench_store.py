@@ -0,0 +1,56 @@
+"""Memory footprint and move rate of the dict and array value stores.
+
+Run with ``python -m benchmarks.bench_store``.
+"""
+import pickle
+import sys
+import time
+
+import numpy as np
+
+from game.agent import Agent
+from game.engine import make_engine
+from game.trainer import Trainer
+
+
+def footprint(memory):
+    if isinstance(memory, dict):
+        return sys.getsizeof(memory) + sum(
+            sys.getsizeof(k) + sys.getsizeof(v) for k, v in memory.items()
+        )
+    return memory.nbytes
+
+
+def moves_per_second(agent, positions):
+    start = time.perf_counter()
+    for state in positions:
+        agent.choose_action(state, greedy=True)
+        agent.reset()
+    return len(positions) / (time.perf_counter() - start)
+
+
+def main(episodes=20000):
+    rng = np.random.default_rng(0)
+    positions = []
+    for _ in range(20000):
+        board = np.zeros(9)
+        occupied = rng.choice(9, size=rng.integers(0, 8), replace=False)
+        board[occupied[::2]] = 1
+        board[occupied[1::2]] = -1
+        positions.append(board.reshape(3, 3))
+
+    for store in Agent.STORES:
+        agent1 = Agent(1, store=store)
+        agent2 = Agent(-1, store=store)
+        start = time.perf_counter()
+        Trainer(make_engine(), agent1, agent2, episodes=episodes).run()
+        train_rate = episodes / (time.perf_counter() - start)
+        print(f"{store:>6}: {len(agent2.memory):5d} states, "
+              f"{footprint(agent2.memory) / 1024:7.1f} KiB in memory, "
+              f"{len(pickle.dumps(agent2.memory)) / 1024:7.1f} KiB pickled, "
+              f"{moves_per_second(agent2, positions):9,.0f} moves/s, "
+              f"{train_rate:7,.0f} training episodes/s")
+
+
+if __name__ == "__main__":
+    main()
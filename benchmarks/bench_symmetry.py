@@ -0,0 +1,61 @@
+"""Distinct states stored and episodes to convergence, with and without
+symmetry-canonicalized value tables.
+
+Convergence is the first checkpoint after which the greedy Player 2 agent
+loses at most ``max_loss_rate`` of its games against a random Player 1.
+
+Run with ``python -m benchmarks.bench_symmetry``.
+"""
+import random
+
+from game.agent import Agent
+from game.engine import make_engine
+from game.trainer import Trainer
+
+
+def loss_rate(agent, games=300):
+    engine = make_engine()
+    losses = 0
+    for _ in range(games):
+        engine.reset()
+        player = 1
+        while not engine.done:
+            if player == 1:
+                r, c = random.choice(engine.get_valid_moves())
+                engine.make_move(r, c, 1)
+            else:
+                i, j, sym = agent.choose_action(engine.state, greedy=True)
+                engine.make_move(i, j, sym)
+            player = -player
+        agent.reset()
+        losses += engine.winner == "Player 1"
+    return losses / games
+
+
+def measure(canonical, episodes=40000, every=2000, max_loss_rate=0.02):
+    agent1 = Agent(1, canonical=canonical)
+    agent2 = Agent(-1, canonical=canonical)
+    curve = []
+
+    def checkpoint(episode, total):
+        if episode % every == 0:
+            curve.append((episode, len(agent2.memory), loss_rate(agent2)))
+
+    Trainer(make_engine(), agent1, agent2, episodes=episodes).run(checkpoint)
+    converged = next(
+        (ep for n, (ep, _, rate) in enumerate(curve) if all(r <= max_loss_rate for *_, r in curve[n:])),
+        None,
+    )
+    return len(agent1.memory) + len(agent2.memory), converged, curve
+
+
+def main():
+    for canonical in (False, True):
+        states, converged, curve = measure(canonical)
+        label = "canonical" if canonical else "raw"
+        print(f"{label:>9}: {states:6d} states stored, converged after {converged} episodes")
+        print("           " + " ".join(f"{ep}:{rate:.2f}" for ep, _, rate in curve))
+
+
+if __name__ == "__main__":
+    main()
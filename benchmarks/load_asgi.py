@@ -0,0 +1,126 @@
+"""Throughput and tail latency of the Flask and ASGI servers over real sockets.
+
+Serves :mod:`web.app` with werkzeug's threaded server and :mod:`web.asgi`
+with the bundled asyncio server, each on an ephemeral port in a background
+thread, then drives both with the same load: *clients* concurrent
+connections, each starting a game and playing moves until it ends, over and
+over. Every request opens a new connection so both servers see the same
+traffic. Games are against the AI by default; ``--size 4`` makes every
+reply an MCTS search, a slow handler that shows up in tail latency.
+
+Run with ``python -m benchmarks.load_asgi``.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+
+from werkzeug.serving import make_server
+
+from game.session import GameSession
+from web import app as web_app
+from web import asgi
+from web.asgi_server import serve
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def start_flask():
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server("127.0.0.1", 0, web_app.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.server_port, server.shutdown
+
+
+def start_asgi():
+    loop = asyncio.new_event_loop()
+    bound = threading.Event()
+    port = []
+
+    def ready(p):
+        port.append(p)
+        bound.set()
+
+    task = loop.create_task(serve(asgi.app, port=0, ready=ready))
+
+    def run():
+        try:
+            loop.run_until_complete(task)
+        except asyncio.CancelledError:
+            pass
+
+    threading.Thread(target=run, daemon=True).start()
+    bound.wait()
+    return port[0], lambda: loop.call_soon_threadsafe(task.cancel)
+
+
+async def post(port, path, body):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    data = json.dumps(body).encode()
+    writer.write(f"POST {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nConnection: close\r\n"
+                 f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n"
+                 .encode() + data)
+    response = await reader.read()
+    writer.close()
+    status = int(response.split(b" ", 2)[1])
+    return status, json.loads(response.partition(b"\r\n\r\n")[2] or b"null")
+
+
+async def client(port, game, deadline, latencies, rng):
+    size = game["rows"]
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        _, state = await post(port, "/api/new-game", game)
+        latencies.append(time.perf_counter() - start)
+        game_id = state["game_id"]
+        while not state["done"] and time.perf_counter() < deadline:
+            row, col = rng.choice([(r, c) for r in range(size) for c in range(size)
+                                   if state["board"][r][c] == 0])
+            start = time.perf_counter()
+            _, state = await post(port, "/api/move", {"row": row, "col": col, "game_id": game_id})
+            latencies.append(time.perf_counter() - start)
+
+
+async def load(port, game, clients, seconds):
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    rng = random.Random(0)
+    tasks = [client(port, game, deadline, latencies, rng) for _ in range(clients)]
+    start = time.perf_counter()
+    await asyncio.gather(*tasks)
+    return len(latencies) / (time.perf_counter() - start), latencies
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--mode", default="human-ai", choices=("human-ai", "human-human"))
+    parser.add_argument("--size", type=int, default=3, help="board rows and columns")
+    args = parser.parse_args(argv)
+    game = {"mode": args.mode, "rows": args.size, "cols": args.size, "win_length": 3}
+
+    # Build the solver and model caches once so neither server pays for them.
+    session = GameSession()
+    session.new_game(args.mode, args.size, args.size, 3)
+    session.make_move(0, 0)
+
+    for name, start in (("flask", start_flask), ("asgi", start_asgi)):
+        port, stop = start()
+        try:
+            rate, latencies = asyncio.run(load(port, game, args.clients, args.seconds))
+        finally:
+            stop()
+        print(f"{name:6s} {rate:8,.0f} req/s, p50 {percentile(latencies, 0.5) * 1e3:6.2f} ms, "
+              f"p99 {percentile(latencies, 0.99) * 1e3:7.2f} ms, "
+              f"max {max(latencies) * 1e3:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
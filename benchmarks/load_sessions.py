@@ -0,0 +1,58 @@
+"""Load test for the multi-game web backend.
+
+Starts thousands of simultaneous games through the Flask test client, then
+plays random moves across all of them, reporting memory per live game and
+/api/move latency percentiles. A second pass with more games than the
+store's cap shows memory staying bounded.
+
+Run with ``python -m benchmarks.load_sessions``.
+"""
+import random
+import time
+import tracemalloc
+
+from web import app as web_app
+from web.sessions import SessionStore
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run(games, moves, max_games):
+    web_app.sessions = SessionStore(max_games=max_games)
+    client = web_app.app.test_client()
+    rng = random.Random(0)
+
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    ids = []
+    for _ in range(games):
+        client.delete_cookie("game_id")
+        ids.append(client.post("/api/new-game", json={"mode": "human-human"}).get_json()["game_id"])
+    live_bytes = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+
+    latencies = []
+    for _ in range(moves):
+        game_id = rng.choice(ids)
+        start = time.perf_counter()
+        client.post("/api/move", json={"row": rng.randrange(3), "col": rng.randrange(3),
+                                       "game_id": game_id})
+        latencies.append(time.perf_counter() - start)
+
+    live = len(web_app.sessions)
+    print(f"{games:>7} games started, {live:>6} live (cap {max_games}): "
+          f"{live_bytes / max(live, 1):6.0f} B/game, "
+          f"move p50 {percentile(latencies, 0.5) * 1e3:.2f} ms, "
+          f"p99 {percentile(latencies, 0.99) * 1e3:.2f} ms")
+
+
+def main():
+    run(games=5000, moves=20000, max_games=100000)
+    run(games=20000, moves=20000, max_games=5000)
+
+
+if __name__ == "__main__":
+    main()
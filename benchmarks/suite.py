@@ -0,0 +1,250 @@
+"""Hot-path benchmark suite with JSON results and baseline comparison.
+
+Every benchmark reports a rate (operations per second, higher is better).
+Run with ``python -m benchmarks``; see ``python -m benchmarks --help``.
+"""
+import os
+import platform
+import tempfile
+import time
+
+import numpy as np
+
+from game.agent import Agent
+from game.batch_trainer import BatchTrainer
+from game.engine import make_engine
+from game.trainer import Trainer
+
+BENCHMARKS = {}
+DEFAULT_THRESHOLD = 0.3
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def benchmark(name, unit):
+    """Register ``fn(scale) -> (operations, seconds)`` under *name*."""
+    def register(fn):
+        BENCHMARKS[name] = (fn, unit)
+        return fn
+    return register
+
+
+def _timed(fn, number):
+    start = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return number, time.perf_counter() - start
+
+
+def _midgame(engine):
+    for r, c, p in ((0, 0, 1), (1, 1, -1), (0, 1, 1), (2, 2, -1)):
+        engine.make_move(r, c, p)
+    return engine
+
+
+@benchmark("engine.make_move.numpy", "moves/s")
+def _engine_make_move_numpy(scale):
+    engine = _midgame(make_engine("numpy"))
+    def cycle():
+        engine.make_move(0, 2, 1)
+        engine.undo_move(0, 2)
+    return _timed(cycle, 100000 * scale)
+
+
+@benchmark("engine.make_move.bitboard", "moves/s")
+def _engine_make_move_bitboard(scale):
+    engine = _midgame(make_engine("bitboard"))
+    def cycle():
+        engine.make_move(0, 2, 1)
+        engine.undo_move(0, 2)
+    return _timed(cycle, 100000 * scale)
+
+
+@benchmark("engine.check_winner.numpy", "calls/s")
+def _engine_check_winner_numpy(scale):
+    return _timed(_midgame(make_engine("numpy")).check_winner, 100000 * scale)
+
+
+@benchmark("engine.check_winner.bitboard", "calls/s")
+def _engine_check_winner_bitboard(scale):
+    return _timed(_midgame(make_engine("bitboard")).check_winner, 100000 * scale)
+
+
+def _trained_agents(episodes=2000, **options):
+    agent1 = Agent(1, **options)
+    agent2 = Agent(-1, **options)
+    BatchTrainer(agent1, agent2, episodes=episodes).run()
+    return agent1, agent2
+
+
+def _choose_action(store, scale):
+    agent = _trained_agents(store=store)[1]
+    state = _midgame(make_engine()).state
+    def choose():
+        agent.choose_action(state, greedy=True)
+        agent.reset()
+    return _timed(choose, 30000 * scale)
+
+
+@benchmark("agent.choose_action.dict", "moves/s")
+def _agent_choose_action_dict(scale):
+    return _choose_action("dict", scale)
+
+
+@benchmark("agent.choose_action.array", "moves/s")
+def _agent_choose_action_array(scale):
+    return _choose_action("array", scale)
+
+
+@benchmark("agent.train", "episodes/s")
+def _agent_train(scale):
+    agent = _trained_agents()[0]
+    keys = list(agent.memory)[:4]
+    def train():
+        agent.moves = list(keys)
+        agent.train(1)
+    return _timed(train, 50000 * scale)
+
+
+@benchmark("trainer.run", "episodes/s")
+def _trainer_run(scale):
+    episodes = 1000 * scale
+    trainer = Trainer(make_engine(), Agent(1), Agent(-1), episodes=episodes)
+    return episodes, _timed(trainer.run, 1)[1]
+
+
+@benchmark("trainer.retrain", "games/s")
+def _trainer_retrain(scale):
+    from benchmarks.bench_journal import random_games
+    from game.journal import JournalWriter
+
+    games = 20000 * scale
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "games.journal")
+        journal = JournalWriter(path)
+        for cells, outcome in random_games(games):
+            journal.record(cells, outcome)
+        journal.close()
+        trainer = Trainer(make_engine(), Agent(1), Agent(-1))
+        start = time.perf_counter()
+        trainer.retrain([path])
+        return games, time.perf_counter() - start
+
+
+@benchmark("batch_trainer.run", "episodes/s")
+def _batch_trainer_run(scale):
+    episodes = 4000 * scale
+    trainer = BatchTrainer(Agent(1), Agent(-1), episodes=episodes)
+    return episodes, _timed(trainer.run, 1)[1]
+
+
+def _load(format, scale):
+    agent = _trained_agents(episodes=5000)[1]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "p2.dat")
+        agent.save(path, format=format)
+        return _timed(lambda: Agent(-1).load(path), 100 * scale)
+
+
+@benchmark("model.load.checkpoint", "loads/s")
+def _model_load_checkpoint(scale):
+    return _load("checkpoint", scale)
+
+
+@benchmark("model.load.pickle", "loads/s")
+def _model_load_pickle(scale):
+    return _load("pickle", scale)
+
+
+@benchmark("api.move", "requests/s")
+def _api_move(scale):
+    from web.app import app
+
+    with app.test_client() as client:
+        def game():
+            client.post("/api/new-game", json={"mode": "human-human"})
+            for row, col in ((0, 0), (1, 1), (0, 1), (2, 2), (0, 2)):
+                client.post("/api/move", json={"row": row, "col": col})
+        requests, seconds = _timed(game, 50 * scale)
+    return requests * 6, seconds
+
+
+@benchmark("startup.cli", "starts/s")
+def _startup_cli(scale):
+    from benchmarks.bench_startup import run_game
+
+    seconds = sum(run_game("cli")[0] for _ in range(3 * scale))
+    return 3 * scale, seconds
+
+
+@benchmark("agent.evaluate_many", "positions/s")
+def _agent_evaluate_many(scale):
+    from game.solver import reachable_positions
+
+    agent = _trained_agents()[1]
+    boards = np.array([board for board, _, player in reachable_positions() if player == -1],
+                      dtype=float)
+    operations, seconds = _timed(lambda: agent.evaluate_many(boards), 20 * scale)
+    return operations * len(boards), seconds
+
+
+@benchmark("api.evaluate", "positions/s")
+def _api_evaluate(scale):
+    from game.solver import reachable_positions
+    from web.app import app
+
+    codes = [index for _, index, _ in reachable_positions()] * 2
+    with app.test_client() as client:
+        def batch():
+            assert client.post("/api/evaluate", json={"codes": codes}).status_code == 200
+        operations, seconds = _timed(batch, 5 * scale)
+    return operations * len(codes), seconds
+
+
+def run_suite(names=None, scale=1, repeat=3):
+    """Run the selected benchmarks and return a JSON-serializable report.
+
+    Each benchmark runs *repeat* times and the best rate is kept; *scale*
+    multiplies the work per run.
+    """
+    names = list(BENCHMARKS) if names is None else names
+    unknown = sorted(set(names) - set(BENCHMARKS))
+    if unknown:
+        raise ValueError(f"Unknown benchmarks {unknown}. Choose from {sorted(BENCHMARKS)}")
+    results = {}
+    for name in names:
+        fn, unit = BENCHMARKS[name]
+        rates = []
+        for _ in range(repeat):
+            operations, seconds = fn(scale)
+            rates.append(operations / seconds)
+        results[name] = {"rate": max(rates), "unit": unit, "runs": rates}
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "scale": scale,
+            "repeat": repeat,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(report, baseline, threshold=DEFAULT_THRESHOLD):
+    """Compare two reports. Returns ``[(name, baseline rate, rate, change)]`` regressions.
+
+    A benchmark regresses when its rate drops by more than *threshold*
+    (a fraction) below the baseline; benchmarks missing from either
+    report are ignored.
+    """
+    regressions = []
+    for name, result in report["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        change = result["rate"] / base["rate"] - 1
+        if change < -threshold:
+            regressions.append((name, base["rate"], result["rate"], change))
+    return regressions
@@ -1,3 +1,10 @@
+import argparse
+import json
+import sys
+import time
+
+from game import metrics
+from game.config import MODEL_DIR, TRAINING_EPISODES, TRAINING_SEED, TRAINING_WORKERS
 from game.session import GameSession
 
 KEY_MAP = {
@@ -64,5 +71,160 @@ def play():
         print(f"The winner is {state['winner']}!")
 
 
-if __name__ == "__main__":
+def play_command(args):
     play()
+    return 0
+
+
+def train_command(args):
+    """Train and save models; prints a JSON summary."""
+    if args.early_stop and (args.workers > 1 or args.batch_size):
+        print(json.dumps({"error": "--early-stop needs sequential training"}))
+        return 2
+    profiler = None
+    if args.profile:
+        import cProfile
+        import pstats
+
+        profiler = cProfile.Profile()
+    start = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    stats = GameSession.train(
+        batch_size=args.batch_size, workers=args.workers, episodes=args.episodes,
+        model_dir=args.output, checkpoint_every=args.checkpoint_every, seed=args.seed,
+        early_stop=args.early_stop,
+    )
+    if profiler:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+        pstats.Stats(args.profile, stream=sys.stderr).sort_stats("cumulative").print_stats(20)
+    seconds = time.perf_counter() - start
+    episodes = stats.pop("episodes", args.episodes)
+    print(json.dumps({
+        "episodes": episodes, "seconds": seconds, "episodes_per_second": episodes / seconds,
+        "output": args.output or MODEL_DIR, **stats,
+    }))
+    return 0
+
+
+def retrain_command(args):
+    """Update saved models from recorded game journals; prints a JSON summary."""
+    start = time.perf_counter()
+    try:
+        stats = GameSession.retrain(args.journals, model_dir=args.output,
+                                    learning_rate=args.learning_rate)
+    except ValueError as e:
+        print(json.dumps({"error": str(e)}))
+        return 2
+    seconds = time.perf_counter() - start
+    print(json.dumps({"seconds": seconds, "games_per_second": stats["games"] / seconds,
+                      "output": args.output or MODEL_DIR, **stats}))
+    return 0
+
+
+def evaluate_command(args):
+    """Pit two players against each other; prints a JSON report."""
+    from game.evaluate import evaluate, load_player
+
+    try:
+        player1 = load_player(args.player1, 1)
+        player2 = load_player(args.player2, -1)
+    except ValueError as e:
+        print(json.dumps({"error": str(e)}))
+        return 2
+    start = time.perf_counter()
+    report = evaluate(player1, player2, args.games, seed=args.seed)
+    report["seconds"] = time.perf_counter() - start
+    print(json.dumps(report))
+    return 0
+
+
+def bench_command(args):
+    """Run the benchmark suite; prints the JSON report (and regressions against a baseline)."""
+    from benchmarks.suite import compare, run_suite
+
+    try:
+        report = run_suite(args.names or None, scale=args.scale, repeat=args.repeat)
+    except ValueError as e:
+        print(json.dumps({"error": str(e)}))
+        return 2
+    status = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        report["regressions"] = [
+            {"name": name, "baseline": base, "rate": rate, "change": change}
+            for name, base, rate, change in regressions
+        ]
+        status = 1 if regressions else 0
+    print(json.dumps(report))
+    return status
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Tic-Tac-Toe: play, train, evaluate and benchmark.")
+    parser.add_argument("--metrics", action="store_true",
+                        help="collect metrics and print them in Prometheus format to stderr on exit")
+    parser.set_defaults(command=play_command)
+    commands = parser.add_subparsers(title="commands")
+
+    commands.add_parser("play", help="play in the terminal (default)").set_defaults(
+        command=play_command)
+
+    train = commands.add_parser("train", help="train models and print a JSON summary")
+    train.add_argument("--episodes", type=int, default=TRAINING_EPISODES)
+    train.add_argument("--seed", type=int, default=TRAINING_SEED,
+                       help="seed for a reproducible run (same seed, same model files)")
+    train.add_argument("--workers", type=int, default=TRAINING_WORKERS)
+    train.add_argument("--batch-size", type=int)
+    train.add_argument("--output", metavar="DIR", help=f"model directory (default {MODEL_DIR})")
+    train.add_argument("--checkpoint-every", type=int, metavar="N",
+                       help="checkpoint every N episodes (sequential training)")
+    train.add_argument("--early-stop", action="store_true",
+                       help="stop once training converges (sequential training); "
+                            "the summary includes the learning curve")
+    train.add_argument("--profile", metavar="FILE",
+                       help="write a cProfile/pstats dump of the run to FILE")
+    train.set_defaults(command=train_command)
+
+    retrain = commands.add_parser(
+        "retrain", help="update models from game journals and print a JSON summary")
+    retrain.add_argument("journals", nargs="+", metavar="JOURNAL")
+    retrain.add_argument("--output", metavar="DIR", help=f"model directory (default {MODEL_DIR})")
+    retrain.add_argument("--learning-rate", type=float,
+                         help="TD step size for the replayed games (default: the agents' own)")
+    retrain.set_defaults(command=retrain_command)
+
+    evaluate = commands.add_parser(
+        "evaluate", help="play games in bulk and print win rates with 95%% confidence intervals")
+    evaluate.add_argument("player1", help='"random", "perfect", a model file or a .policy file')
+    evaluate.add_argument("player2", help="same choices as player1")
+    evaluate.add_argument("--games", type=int, default=10000)
+    evaluate.add_argument("--seed", type=int)
+    evaluate.set_defaults(command=evaluate_command)
+
+    bench = commands.add_parser("bench", help="run the benchmark suite and print a JSON report")
+    bench.add_argument("names", nargs="*")
+    bench.add_argument("--baseline", help="JSON report to compare against; exits 1 on regression")
+    bench.add_argument("--threshold", type=float, default=0.3)
+    bench.add_argument("--scale", type=int, default=1)
+    bench.add_argument("--repeat", type=int, default=3)
+    bench.set_defaults(command=bench_command)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.metrics:
+        metrics.enable()
+    try:
+        return args.command(args)
+    finally:
+        if args.metrics:
+            print(metrics.render(), end="", file=sys.stderr)
+            metrics.disable()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
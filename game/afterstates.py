@@ -0,0 +1,57 @@
+import functools
+
+import numpy as np
+
+from game.encoding import POWERS, board_bytes
+from game.solver import reachable_positions
+from game.symmetry import CANONICAL
+
+KEY_TYPES = ("bytes", "index", "canonical")
+
+
+@functools.lru_cache(maxsize=None)
+def _positions():
+    """(indices, empty cells per position) for the reachable non-terminal 3x3 positions."""
+    indices = []
+    empties = []
+    for board, index, _ in reachable_positions():
+        indices.append(index)
+        empties.append(tuple(cell for cell in range(9) if board[cell] == 0))
+    return indices, empties
+
+
+def _keys(codes, key_type):
+    if key_type == "canonical":
+        return CANONICAL[codes].tolist()
+    if key_type == "bytes":
+        boards = (codes[:, None] // POWERS) % 3 - 1
+        return board_bytes(boards.astype(float))
+    return codes.tolist()
+
+
+@functools.lru_cache(maxsize=None)
+def afterstate_index(key_type):
+    """Legal moves and afterstate keys of every reachable 3x3 position.
+
+    Maps a board's base-3 index to ``(moves, {symbol: keys})``, where
+    *moves* are the (row, col) of the empty cells and ``keys[symbol][i]``
+    is the ``memory`` key of the board after *symbol* plays ``moves[i]``.
+    *key_type* is "bytes" (``state.tobytes()``), "index" (base-3 index) or
+    "canonical" (canonical index). Built once per key type and shared.
+    """
+    if key_type not in KEY_TYPES:
+        raise ValueError(f"Invalid key type {key_type!r}. Choose from {KEY_TYPES}")
+    indices, empties = _positions()
+    cells = np.fromiter((c for empty in empties for c in empty), dtype=np.int64)
+    starts = np.cumsum([0] + [len(empty) for empty in empties]).tolist()
+    parents = np.repeat(indices, np.diff(starts))
+    keys = {symbol: _keys(parents + symbol * POWERS[cells], key_type) for symbol in (1, -1)}
+
+    table = {}
+    for n, (index, empty) in enumerate(zip(indices, empties)):
+        start, stop = starts[n], starts[n + 1]
+        table[index] = (
+            tuple(divmod(cell, 3) for cell in empty),
+            {symbol: keys[symbol][start:stop] for symbol in (1, -1)},
+        )
+    return table
@@ -1,67 +1,239 @@
-import random
 import pickle
 
 import numpy as np
 
-from game.config import EXPLOIT_RATE, LEARNING_RATE
+from game.afterstates import afterstate_index
+from game.checkpoint import is_checkpoint, load_checkpoint, save_checkpoint
+from game.config import CANONICAL_STATES, EXPLOIT_RATE, LEARNING_RATE, MODEL_FORMAT, VALUE_STORE
+from game.encoding import (
+    CELLS, N_STATES, OFFSET, POWERS, board_bytes, encode, encode_many, pack_board, pack_boards,
+)
+from game.rng import RandomStream
+from game.store import ArrayStore
+from game.symmetry import CANONICAL, canonical, canonical_many
+
+# Plain-list copy for the per-move path, where NumPy call overhead dominates.
+_POWERS = POWERS.tolist()
+
+
+def _board_index(state):
+    """Base-3 index of a 3x3 board, computed without NumPy arithmetic."""
+    index = OFFSET
+    for value, power in zip(state.ravel().tolist(), _POWERS):
+        if value:
+            index += power if value > 0 else -power
+    return index
 
 
 class Agent:
-    """RL agent using temporal-difference learning."""
+    """RL agent using temporal-difference learning.
+
+    With *canonical* set, ``memory`` is keyed on the canonical index of each
+    board's symmetry class, so the 8 rotations and reflections of a position
+    share one value. Otherwise it is keyed on the raw ``state.tobytes()``,
+    or on the base-3 board index when *store* is "array".
+
+    *store* selects the value table: "dict" (a plain dict) or "array" (an
+    :class:`ArrayStore` indexed by base-3 board index).
+
+    Boards of any size are supported by the dict store: boards other than
+    3x3 are keyed with :func:`pack_board`. Canonical keys and the array
+    store are 3x3 only.
+
+    Exploration and tie-breaking draw from ``rng``, a :class:`RandomStream`
+    seeded with *seed*.
+    """
 
-    def __init__(self, symbol, learning_rate=LEARNING_RATE, epsilon=EXPLOIT_RATE):
+    STORES = ("dict", "array")
+    FORMATS = ("checkpoint", "pickle")
+
+    def __init__(self, symbol, learning_rate=LEARNING_RATE, epsilon=EXPLOIT_RATE,
+                 canonical=CANONICAL_STATES, store=VALUE_STORE, seed=None):
+        if store not in self.STORES:
+            raise ValueError(f"Invalid store {store!r}. Choose from {self.STORES}")
         self.moves = []
-        self.memory = {}
         self.symbol = symbol
         self.epsilon = epsilon
         self.learning_rate = learning_rate
+        self.canonical = canonical
+        self.store = store
+        self.memory = self.new_memory()
+        self.rng = RandomStream(seed)
+
+    def new_memory(self):
+        """Return an empty value table of this agent's store type."""
+        return ArrayStore() if self.store == "array" else {}
+
+    def state_key(self, state):
+        """Return the ``memory`` key for a (rows, cols) board."""
+        if state.shape != (3, 3):
+            self._check_large_board()
+            return pack_board(state)
+        if self.canonical:
+            return canonical(state)
+        if self.store == "array":
+            return encode(state)
+        return state.tobytes()
+
+    def state_keys(self, boards, shape=(3, 3)):
+        """Return ``memory`` keys for an (N, cells) stack of float boards of *shape*."""
+        if shape != (3, 3):
+            self._check_large_board()
+            return pack_boards(boards)
+        if self.canonical:
+            return canonical_many(boards).tolist()
+        if self.store == "array":
+            return encode_many(boards).tolist()
+        return board_bytes(boards)
+
+    def _check_large_board(self):
+        if self.canonical or self.store == "array":
+            raise ValueError("Canonical keys and the array store only support 3x3 boards")
+
+    def lookup(self, keys):
+        """Return the values for *keys*, adding unseen ones at 0.5."""
+        if self.store == "array":
+            return self.memory.lookup(keys)
+        return [self.memory.setdefault(k, 0.5) for k in keys]
 
     def reset(self):
         self.moves = []
 
     def choose_action(self, state, greedy=False):
-        candidate_hashes = []
-        candidate_values = []
-        candidate_positions = []
+        entry = None
+        if state.shape == (3, 3):
+            entry = afterstate_index(self.key_type).get(_board_index(state))
+        if entry is not None:
+            candidate_positions, keys = entry
+            candidate_hashes = keys[self.symbol]
+            candidate_values = self._values(candidate_hashes, add=not greedy)
+        else:
+            candidate_positions, candidate_hashes, candidate_values = self._candidates(
+                state, add=not greedy)
 
-        for i in range(3):
-            for j in range(3):
-                if state[i, j] == 0:
-                    candidate_positions.append((i, j))
-                    state[i, j] = self.symbol
-                    hash_code = state.tobytes()
-                    candidate_hashes.append(hash_code)
-                    if hash_code not in self.memory:
-                        self.memory[hash_code] = 0.5
-                    candidate_values.append(self.memory[hash_code])
-                    state[i, j] = 0
-
-        if np.random.rand() < self.epsilon or greedy:
+        if self.rng.random() < self.epsilon or greedy:
             best = max(candidate_values)
-            indices = [i for i, v in enumerate(candidate_values) if v == best]
-            index = random.choice(indices)
+            index = self.rng.choice([i for i, v in enumerate(candidate_values) if v == best])
         else:
-            index = random.randint(0, len(candidate_hashes) - 1)
+            index = self.rng.randrange(len(candidate_hashes))
 
         action = candidate_positions[index]
         self.remember(candidate_hashes[index])
         return action[0], action[1], self.symbol
 
+    @property
+    def key_type(self):
+        """Kind of 3x3 ``memory`` key: "canonical", "index" or "bytes"."""
+        if self.canonical:
+            return "canonical"
+        return "index" if self.store == "array" else "bytes"
+
+    def _candidates(self, state, add=True):
+        # Positions outside the afterstate index: boards of other sizes and
+        # unreachable 3x3 boards. Works on a copy, never on the caller's state.
+        cols = state.shape[1]
+        flat = state.flatten()
+        candidate_positions = []
+        candidate_hashes = []
+        for cell in np.flatnonzero(flat == 0).tolist():
+            candidate_positions.append(divmod(cell, cols))
+            flat[cell] = self.symbol
+            candidate_hashes.append(self.state_key(flat.reshape(state.shape)))
+            flat[cell] = 0
+        return candidate_positions, candidate_hashes, self._values(candidate_hashes, add)
+
+    def _values(self, keys, add=True):
+        # lookup() for a single move's handful of keys, as plain Python lists.
+        # Without *add*, unseen keys read as 0.5 and memory is left untouched.
+        if self.store == "array":
+            values = self.memory.values
+            if add:
+                seen = self.memory.seen
+                for key in keys:
+                    seen[key] = 1
+            return [values[key] for key in keys]
+        memory = self.memory
+        if not add:
+            return [memory.get(key, 0.5) for key in keys]
+        return [memory.setdefault(key, 0.5) for key in keys]
+
+    def value_table(self):
+        """Afterstate value of every base-3 board index as a float array.
+
+        Unseen states count as 0.5 and ``memory`` is not modified. 3x3 only.
+        """
+        if self.store == "array":
+            table = self.memory.values_view
+        else:
+            table = np.full(N_STATES, 0.5)
+            if self.memory:
+                keys = list(self.memory)
+                if self.canonical:
+                    indices = np.array(keys, dtype=np.int64)
+                else:
+                    boards = np.frombuffer(b"".join(keys), dtype=float).reshape(-1, CELLS)
+                    indices = encode_many(boards)
+                table[indices] = list(self.memory.values())
+        return table[CANONICAL] if self.canonical else table
+
+    def evaluate_many(self, boards):
+        """Greedy move and its value for an (N, 9) stack of boards, this agent to move.
+
+        One vectorized pass over :meth:`value_table`; ties go to the lowest
+        cell, as in exported policies. Returns ``(cells, values)`` arrays,
+        with cell -1 and value NaN for full boards.
+        """
+        boards = np.asarray(boards, dtype=float).reshape(-1, CELLS)
+        # Occupied cells get index 0: adding a stone there could leave the table.
+        afterstates = np.where(boards == 0, encode_many(boards)[:, None] + self.symbol * POWERS, 0)
+        scores = np.where(boards == 0, self.value_table()[afterstates], -np.inf)
+        cells = scores.argmax(axis=1)
+        values = scores[np.arange(len(boards)), cells]
+        full = np.isneginf(values)
+        cells[full] = -1
+        values[full] = np.nan
+        return cells, values
+
     def remember(self, hash_code):
         self.moves.append(hash_code)
 
     def train(self, result):
+        """TD-update the values of this episode's moves towards *result*.
+
+        Returns the total absolute change, a measure of how much is still
+        being learned.
+        """
         self.moves.reverse()
-        self.memory[self.moves[0]] = next_value = result
+        memory = self.memory
+        delta = abs(result - memory.get(self.moves[0], 0.5))
+        memory[self.moves[0]] = next_value = result
         for h in self.moves[1:]:
-            self.memory[h] += self.learning_rate * (next_value - self.memory[h])
-            next_value = self.memory[h]
+            value = memory[h]
+            step = self.learning_rate * (next_value - value)
+            memory[h] = next_value = value + step
+            delta += abs(step)
         self.reset()
+        return delta
+
+    def save(self, file_name, format=MODEL_FORMAT, **checkpoint_options):
+        """Save ``memory`` as a streamed checkpoint (see :mod:`game.checkpoint`) or a pickle.
 
-    def save(self, file_name):
+        *checkpoint_options* (``episodes``, ``compression``, ``board``) are
+        passed to :func:`save_checkpoint`.
+        """
+        if format not in self.FORMATS:
+            raise ValueError(f"Invalid format {format!r}. Choose from {self.FORMATS}")
+        if format == "checkpoint":
+            save_checkpoint(self, file_name, **checkpoint_options)
+            return
         with open(file_name, "wb") as f:
             pickle.dump(self.memory, f)
 
     def load(self, file_name):
+        """Load ``memory`` from a checkpoint or a pickle, detected by the file's magic."""
+        if is_checkpoint(file_name):
+            load_checkpoint(self, file_name)
+            return
         with open(file_name, "rb") as f:
             self.memory = pickle.load(f)
+        self.store = "array" if isinstance(self.memory, ArrayStore) else "dict"
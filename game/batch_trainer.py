@@ -0,0 +1,145 @@
+import numpy as np
+
+from game.config import TRAINING_BATCH_SIZE, TRAINING_EPISODES, TRAINING_SEED
+from game.trainer import schedule
+
+# Flat cell indices of every row, column and diagonal.
+LINES = np.array([
+    [0, 1, 2], [3, 4, 5], [6, 7, 8],
+    [0, 3, 6], [1, 4, 7], [2, 5, 8],
+    [0, 4, 8], [2, 4, 6],
+])
+
+
+class BatchTrainer:
+    """Self-play training that plays *batch_size* games in lockstep.
+
+    Boards are held in one (N, 9) array; legal moves, epsilon-greedy choices
+    and win detection are computed with array operations for the whole
+    batch. Each game gets the same exploration and learning-rate schedule as
+    in :class:`Trainer`, and the TD updates are applied through
+    ``Agent.train`` once the batch has finished.
+    """
+
+    def __init__(self, agent1, agent2, episodes=TRAINING_EPISODES, batch_size=TRAINING_BATCH_SIZE,
+                 seed=TRAINING_SEED):
+        self.agent1 = agent1
+        self.agent2 = agent2
+        self.episodes = episodes
+        self.batch_size = batch_size
+        self.rng = np.random.default_rng(seed)
+
+    def run(self, progress_callback=None):
+        stats = {"p1_wins": 0, "p2_wins": 0, "ties": 0}
+        orig_lr1 = self.agent1.learning_rate
+        orig_lr2 = self.agent2.learning_rate
+
+        for start in range(0, self.episodes, self.batch_size):
+            stop = min(start + self.batch_size, self.episodes)
+            epsilon, lr_scale, use_random_p1 = schedule(self.rng, start, stop, self.episodes)
+
+            winners, moves1, moves2 = self._play_batch(epsilon, use_random_p1)
+
+            for n, winner in enumerate(winners):
+                if winner == 1:
+                    stats["p1_wins"] += 1
+                    results = (1, 0)
+                elif winner == -1:
+                    stats["p2_wins"] += 1
+                    results = (0, 1)
+                else:
+                    stats["ties"] += 1
+                    results = (0.5, 0.5)
+
+                if not use_random_p1[n]:
+                    self.agent1.learning_rate = orig_lr1 * lr_scale[n]
+                    self.agent1.moves = moves1[n]
+                    self.agent1.train(results[0])
+                self.agent2.learning_rate = orig_lr2 * lr_scale[n]
+                self.agent2.moves = moves2[n]
+                self.agent2.train(results[1])
+
+            if progress_callback:
+                progress_callback(stop, self.episodes)
+
+        # Restore original hyperparameters
+        self.agent1.learning_rate = orig_lr1
+        self.agent2.learning_rate = orig_lr2
+
+        return stats
+
+    def _play_batch(self, epsilon, use_random_p1):
+        """Play one batch to completion.
+
+        Returns the winner per game (1, -1 or 0 for a tie) and the list of
+        afterstate keys each agent chose in every game.
+        """
+        n_games = len(epsilon)
+        boards = np.zeros((n_games, 9))
+        winners = np.zeros(n_games, dtype=int)
+        active = np.ones(n_games, dtype=bool)
+        moves = {1: [[] for _ in range(n_games)], -1: [[] for _ in range(n_games)]}
+        agents = {1: self.agent1, -1: self.agent2}
+
+        player = 1
+        while active.any():
+            rows = np.flatnonzero(active)
+            legal = boards[rows] == 0
+            cells = np.empty(len(rows), dtype=int)
+
+            learning = np.ones(len(rows), dtype=bool)
+            if player == 1:
+                learning = ~use_random_p1[rows]
+
+            # Random opponent: uniform over legal cells
+            random_rows = np.flatnonzero(~learning)
+            if len(random_rows):
+                noise = self.rng.random((len(random_rows), 9))
+                cells[random_rows] = np.argmax(np.where(legal[random_rows], noise, -1), axis=1)
+
+            agent_rows = np.flatnonzero(learning)
+            if len(agent_rows):
+                cells[agent_rows], keys = self._choose(
+                    agents[player], boards[rows[agent_rows]], legal[agent_rows],
+                    epsilon[rows[agent_rows]], self.rng,
+                )
+                player_moves = moves[player]
+                for n, key in zip(rows[agent_rows].tolist(), keys):
+                    player_moves[n].append(key)
+
+            boards[rows, cells] = player
+
+            line_sums = boards[rows][:, LINES].sum(axis=2)
+            won = (line_sums == 3 * player).any(axis=1)
+            full = (boards[rows] != 0).all(axis=1)
+            winners[rows[won]] = player
+            active[rows[won | full]] = False
+            player = -player
+
+        return winners.tolist(), moves[1], moves[-1]
+
+    @staticmethod
+    def _choose(agent, boards, legal, epsilon, rng):
+        """Epsilon-greedy move selection for *agent* on a stack of boards.
+
+        Mirrors ``Agent.choose_action``: every legal afterstate is added to
+        ``agent.memory`` with value 0.5 if unseen, exploitation picks a
+        random best-valued cell and exploration a uniformly random one.
+        """
+        n_boards = len(boards)
+        afterstates = np.repeat(boards[:, None, :], 9, axis=1)
+        afterstates[:, np.arange(9), np.arange(9)] = agent.symbol
+        board_idx, cell_idx = np.nonzero(legal)
+        keys = agent.state_keys(afterstates[board_idx, cell_idx])
+
+        values = np.full((n_boards, 9), -np.inf)
+        values[board_idx, cell_idx] = agent.lookup(keys)
+        key_grid = np.empty((n_boards, 9), dtype=object)
+        key_grid[board_idx, cell_idx] = keys
+
+        noise = rng.random((n_boards, 9))
+        is_best = values == values.max(axis=1, keepdims=True)
+        exploit = rng.random(n_boards) < epsilon
+        candidates = np.where(exploit[:, None], is_best, legal)
+        cells = np.argmax(np.where(candidates, noise, -1), axis=1)
+        return cells, key_grid[np.arange(n_boards), cells].tolist()
@@ -0,0 +1,142 @@
+import functools
+
+from game.config import BOARD_COLS, BOARD_ROWS, WIN_LENGTH
+from game.engine import format_board
+from game.lines import board_lines, check_board_size
+
+
+def _win_masks(rows, cols, win_length):
+    lines, cell_lines = board_lines(rows, cols, win_length)
+    masks = tuple(sum(1 << cell for cell in line) for line in lines)
+    cell_masks = tuple(tuple(masks[n] for n in ns) for ns in cell_lines)
+    return masks, cell_masks
+
+
+# Every row, column and diagonal of the 3x3 board as a 9-bit mask (bit 3*row + col).
+WIN_MASKS, CELL_MASKS = _win_masks(3, 3, 3)
+FULL_MASK = (1 << 9) - 1
+
+
+@functools.lru_cache(maxsize=None)
+def _bits_table():
+    """``table[mask]`` is the 0/1 occupancy vector of a 9-bit mask."""
+    import numpy as np
+
+    return ((np.arange(1 << 9)[:, None] >> np.arange(9)) & 1).astype(float)
+
+
+def _unpack(bits, cells):
+    # NumPy is only loaded once a caller asks for ``state``: human games
+    # play through make_move and board() alone.
+    if cells == 9:
+        return _bits_table()[bits]
+    import numpy as np
+
+    raw = np.frombuffer(bits.to_bytes((cells + 7) // 8, "little"), dtype=np.uint8)
+    return np.unpackbits(raw, bitorder="little")[:cells].astype(float)
+
+
+class BitboardEngine:
+    """Drop-in replacement for :class:`GameEngine` backed by two integer bitmasks.
+
+    Player 1 and Player 2 stones are kept as bitmasks (bit ``row * cols +
+    col``), wins are detected against precomputed window masks through the
+    cell just played and ``state`` is materialised on demand.
+    """
+
+    PLAYER_NAMES = {1: "Player 1", -1: "Player 2"}
+
+    __slots__ = ("rows", "cols", "win_length", "cell_masks", "full_mask", "bits", "done", "winner")
+
+    def __init__(self, rows=BOARD_ROWS, cols=BOARD_COLS, win_length=WIN_LENGTH):
+        check_board_size(rows, cols, win_length)
+        self.rows = rows
+        self.cols = cols
+        self.win_length = win_length
+        if (rows, cols, win_length) == (3, 3, 3):
+            self.cell_masks = CELL_MASKS
+        else:
+            self.cell_masks = _win_masks(rows, cols, win_length)[1]
+        self.full_mask = (1 << rows * cols) - 1
+        self.bits = {1: 0, -1: 0}
+        self.done = False
+        self.winner = None
+
+    @property
+    def state(self):
+        """A fresh float board (1, -1, 0) built from the bitmasks."""
+        cells = self.rows * self.cols
+        board = _unpack(self.bits[1], cells) - _unpack(self.bits[-1], cells)
+        return board.reshape(self.rows, self.cols)
+
+    def board(self):
+        """The board as nested lists of floats (1.0, -1.0, 0.0), without NumPy."""
+        p1, p2 = self.bits[1], self.bits[-1]
+        cols = self.cols
+        return [[float((p1 >> cell) & 1) - ((p2 >> cell) & 1)
+                 for cell in range(row * cols, (row + 1) * cols)]
+                for row in range(self.rows)]
+
+    def reset(self):
+        self.bits = {1: 0, -1: 0}
+        self.done = False
+        self.winner = None
+
+    def make_move(self, row, col, player):
+        """Place *player* (1 or -1) at (row, col). Returns False if cell is occupied.
+
+        Raises ValueError for a cell off the board.
+        """
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            raise ValueError(f"({row}, {col}) is off the {self.rows}x{self.cols} board")
+        cell = row * self.cols + col
+        bit = 1 << cell
+        if (self.bits[1] | self.bits[-1]) & bit:
+            return False
+        bits = self.bits[player] = self.bits[player] | bit
+        for mask in self.cell_masks[cell]:
+            if bits & mask == mask:
+                self.done = True
+                self.winner = self.PLAYER_NAMES[player]
+                return True
+
+        # Tie
+        if self.bits[1] | self.bits[-1] == self.full_mask:
+            self.done = True
+        return True
+
+    def undo_move(self, row, col):
+        """Take back the stone at (row, col). Returns False if the cell is empty.
+
+        Raises ValueError for a cell off the board.
+        """
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            raise ValueError(f"({row}, {col}) is off the {self.rows}x{self.cols} board")
+        bit = 1 << (row * self.cols + col)
+        for player in self.bits:
+            if self.bits[player] & bit:
+                self.bits[player] &= ~bit
+                self.done = False
+                self.winner = None
+                return True
+        return False
+
+    def get_valid_moves(self):
+        empty = self.full_mask & ~(self.bits[1] | self.bits[-1])
+        return [divmod(i, self.cols) for i in range(self.rows * self.cols) if empty >> i & 1]
+
+    def check_winner(self):
+        for player, bits in self.bits.items():
+            for masks in self.cell_masks:
+                for mask in masks:
+                    if bits & mask == mask:
+                        self.done = True
+                        self.winner = self.PLAYER_NAMES[player]
+                        return
+
+        # Tie
+        if self.bits[1] | self.bits[-1] == self.full_mask:
+            self.done = True
+
+    def state_to_display(self):
+        return format_board(self.state)
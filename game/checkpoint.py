@@ -0,0 +1,197 @@
+import lzma
+import os
+import struct
+import zlib
+from itertools import islice
+
+import numpy as np
+
+from game.config import BOARD_COLS, BOARD_ROWS, CHECKPOINT_COMPRESSION, WIN_LENGTH
+from game.encoding import CELLS, POWERS, board_bytes, encode_many
+
+MAGIC = b"TTTC"
+VERSION = 1
+CHUNK_RECORDS = 65536
+
+# How memory keys are stored in the records
+ENCODING_BYTES = 0   # 3x3 state.tobytes() keys, stored as their base-3 index
+ENCODING_INDEX = 1   # base-3 (or canonical) index keys, stored as-is
+ENCODING_PACKED = 2  # pack_board() bit-plane keys, stored as raw bytes
+
+COMPRESSIONS = {"none": 0, "zlib": 1, "lzma": 2}
+
+FLAG_CANONICAL = 1
+FLAG_ARRAY_STORE = 2
+
+# magic, version, rows, cols, win_length, encoding, compression, flags,
+# key width, episodes, record count
+_HEADER = struct.Struct("<4sHBBBBBBHQQ")
+
+
+def _key_width(memory, encoding, rows, cols):
+    if encoding == ENCODING_PACKED:
+        key = next(iter(memory), None)
+        return len(key) if key is not None else (2 * rows * cols + 7) // 8  # two bit planes
+    bits = (3 ** (rows * cols) - 1).bit_length()
+    return next(w for w in (1, 2, 4, 8) if w * 8 >= bits)
+
+
+def _record_dtype(encoding, width):
+    key = f"V{width}" if encoding == ENCODING_PACKED else f"<u{width}"
+    return np.dtype([("key", key), ("value", "<f8")])
+
+
+def _compressor(compression):
+    if compression == COMPRESSIONS["zlib"]:
+        return zlib.compressobj(6)
+    if compression == COMPRESSIONS["lzma"]:
+        return lzma.LZMACompressor()
+    return None
+
+
+def _decompressor(compression):
+    if compression == COMPRESSIONS["zlib"]:
+        return zlib.decompressobj()
+    if compression == COMPRESSIONS["lzma"]:
+        return lzma.LZMADecompressor()
+    return None
+
+
+def _detect_encoding(memory, rows, cols):
+    if 3 ** (rows * cols) > 1 << 64:
+        return ENCODING_PACKED  # only pack_board() keys exist for boards this large
+    key = next(iter(memory), None)
+    if isinstance(key, bytes) and len(key) == CELLS * 8:
+        return ENCODING_BYTES
+    if isinstance(key, bytes):
+        return ENCODING_PACKED
+    return ENCODING_INDEX
+
+
+def is_checkpoint(file_name):
+    with open(file_name, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def read_header(file_name):
+    """Return the header fields of a checkpoint as a dict."""
+    with open(file_name, "rb") as f:
+        return _unpack_header(f.read(_HEADER.size), file_name)
+
+
+def _unpack_header(raw, file_name):
+    if len(raw) < _HEADER.size:
+        raise ValueError(f"{file_name!r} is not a checkpoint file")
+    (magic, version, rows, cols, win_length, encoding, compression, flags, width,
+     episodes, count) = _HEADER.unpack(raw)
+    if magic != MAGIC:
+        raise ValueError(f"{file_name!r} is not a checkpoint file")
+    if version != VERSION:
+        raise ValueError(f"Unsupported checkpoint version {version} in {file_name!r}")
+    return {
+        "version": version, "rows": rows, "cols": cols, "win_length": win_length,
+        "encoding": encoding, "compression": compression,
+        "canonical": bool(flags & FLAG_CANONICAL), "array_store": bool(flags & FLAG_ARRAY_STORE),
+        "key_width": width, "episodes": episodes, "records": count,
+    }
+
+
+def save_checkpoint(agent, file_name, episodes=0, compression=CHECKPOINT_COMPRESSION,
+                    board=None):
+    """Stream ``agent.memory`` to *file_name* as a checkpoint.
+
+    The file is a header (format version, board size, key encoding,
+    compression, episode count) followed by packed ``(key, value)`` records,
+    written and optionally compressed ("zlib" or "lzma") a chunk at a time
+    so the table is never duplicated in full. The file is written under a
+    temporary name and renamed into place.
+    """
+    memory = agent.memory
+    rows, cols, win_length = board or (BOARD_ROWS, BOARD_COLS, WIN_LENGTH)
+    encoding = _detect_encoding(memory, rows, cols)
+    width = _key_width(memory, encoding, rows, cols)
+    dtype = _record_dtype(encoding, width)
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Invalid compression {compression!r}. Choose from {tuple(COMPRESSIONS)}")
+    level = COMPRESSIONS[compression]
+    flags = (FLAG_CANONICAL if agent.canonical else 0) | (
+        FLAG_ARRAY_STORE if agent.store == "array" else 0)
+
+    tmp_name = f"{file_name}.tmp"
+    with open(tmp_name, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, rows, cols, win_length, encoding, level, flags,
+                             width, episodes, len(memory)))
+        compressor = _compressor(level)
+        items = iter(memory.items())
+        while True:
+            chunk = list(islice(items, CHUNK_RECORDS))
+            if not chunk:
+                break
+            keys, values = zip(*chunk)
+            records = np.empty(len(chunk), dtype=dtype)
+            if encoding == ENCODING_BYTES:
+                boards = np.frombuffer(b"".join(keys), dtype=float).reshape(-1, CELLS)
+                records["key"] = encode_many(boards)
+            elif encoding == ENCODING_PACKED:
+                records["key"] = np.frombuffer(b"".join(keys), dtype=f"V{width}")
+            else:
+                records["key"] = keys
+            records["value"] = values
+            data = records.tobytes()
+            f.write(compressor.compress(data) if compressor else data)
+        if compressor:
+            f.write(compressor.flush())
+    os.replace(tmp_name, file_name)
+
+
+def _iter_records(file_name, chunk_bytes):
+    with open(file_name, "rb") as f:
+        header = _unpack_header(f.read(_HEADER.size), file_name)
+        dtype = _record_dtype(header["encoding"], header["key_width"])
+        decompressor = _decompressor(header["compression"])
+        pending = b""
+        while True:
+            raw = f.read(chunk_bytes)
+            if not raw:
+                break
+            pending += decompressor.decompress(raw) if decompressor else raw
+            usable = len(pending) - len(pending) % dtype.itemsize
+            yield header, np.frombuffer(pending[:usable], dtype=dtype)
+            pending = pending[usable:]
+        if pending:
+            raise ValueError(f"Truncated checkpoint {file_name!r}")
+
+
+def _memory_keys(records, encoding):
+    if encoding == ENCODING_BYTES:
+        boards = (records["key"].astype(np.int64)[:, None] // POWERS) % 3 - 1
+        return board_bytes(boards.astype(float))
+    if encoding == ENCODING_PACKED:
+        return [key.tobytes() for key in records["key"]]
+    return records["key"].tolist()
+
+
+def iter_checkpoint(file_name, chunk_bytes=1 << 20):
+    """Yield ``(key, value)`` pairs from a checkpoint, reading it in chunks.
+
+    Keys come back in the form the agent uses in memory.
+    """
+    for header, records in _iter_records(file_name, chunk_bytes):
+        yield from zip(_memory_keys(records, header["encoding"]), records["value"].tolist())
+
+
+def load_checkpoint(agent, file_name, chunk_bytes=1 << 20):
+    """Load a checkpoint into *agent*. Returns the header dict."""
+    header = read_header(file_name)
+    agent.canonical = header["canonical"]
+    agent.store = "array" if header["array_store"] else "dict"
+    agent.memory = memory = agent.new_memory()
+    for _, records in _iter_records(file_name, chunk_bytes):
+        if agent.store == "array":
+            keys = records["key"].astype(np.int64)
+            memory.values_view[keys] = records["value"]
+            memory.seen_view[keys] = True
+        else:
+            memory.update(zip(_memory_keys(records, header["encoding"]),
+                              records["value"].tolist()))
+    return header
@@ -2,3 +2,40 @@ TRAINING_EPISODES = 200000
 LEARNING_RATE = 0.5
 EXPLOIT_RATE = 0.7
 MODEL_DIR = "models/"
+ENGINE_BACKEND = "bitboard"
+TRAINING_BATCH_SIZE = 1024
+TRAINING_WORKERS = 1
+CANONICAL_STATES = False
+VALUE_STORE = "dict"
+AI_OPPONENT = "model"
+MODEL_CHECK_INTERVAL = 1.0
+SESSION_MAX_GAMES = 100000
+SESSION_TTL = 3600
+PROGRESS_INTERVAL = 0.25
+MAX_FINISHED_JOBS = 100
+BOARD_ROWS = 3
+BOARD_COLS = 3
+WIN_LENGTH = 3
+MAX_BOARD_SIZE = 19
+MCTS_ITERATIONS = 2000
+MCTS_TIME_BUDGET = None
+MCTS_EXPLORATION = 1.4
+MCTS_WORKERS = 1
+MODEL_FORMAT = "checkpoint"
+CHECKPOINT_COMPRESSION = "zlib"
+CHECKPOINT_EVERY = None
+METRICS_ENABLED = False
+TRAINING_SEED = None
+ASGI_THREADS = 8
+MAX_EVALUATE_POSITIONS = 100000
+JOURNAL_FILE = None
+JOURNAL_FLUSH_BYTES = 64 * 1024
+JOURNAL_FLUSH_INTERVAL = 1.0
+CONVERGENCE_WINDOW = 5000
+CONVERGENCE_TD_THRESHOLD = 0.2
+CONVERGENCE_OPPONENT = "perfect"
+CONVERGENCE_EVAL_GAMES = 2000
+CONVERGENCE_MAX_LOSS_RATE = 0.0
+CONVERGENCE_PATIENCE = 2
+CONVERGENCE_EVAL_EVERY = 4
+PRELOAD_MODELS = False
@@ -0,0 +1,87 @@
+"""Early stopping for self-play training.
+
+A :class:`ConvergenceMonitor` watches :meth:`Trainer.run`: it averages the
+TD change per episode over each window and, at the end of the window,
+plays both agents greedily against a fixed opponent with the batched
+evaluator (:mod:`game.evaluate`). Training stops once the value tables
+have settled and neither agent loses more than allowed, for *patience*
+windows in a row.
+"""
+import time
+
+from game.config import (
+    CONVERGENCE_EVAL_EVERY, CONVERGENCE_EVAL_GAMES, CONVERGENCE_MAX_LOSS_RATE, CONVERGENCE_OPPONENT,
+    CONVERGENCE_PATIENCE, CONVERGENCE_TD_THRESHOLD, CONVERGENCE_WINDOW,
+)
+from game.evaluate import agent_player, evaluate, load_player
+
+OPPONENTS = ("perfect", "random")
+
+
+class ConvergenceMonitor:
+    """Decides when :meth:`Trainer.run` can stop, and records a learning curve.
+
+    Each point of ``curve`` holds the episode count, the mean TD change per
+    episode over the window and, unless *opponent* is None, each agent's
+    win and loss rate over *eval_games* greedy games against *opponent*
+    ("perfect" or "random"). Evaluation needs a 3x3 board; without it only
+    the TD change is checked. To keep its cost off most windows, agents
+    are only evaluated once the TD change is below *td_threshold*, and
+    every *eval_every* windows for the curve.
+    """
+
+    def __init__(self, window=CONVERGENCE_WINDOW, td_threshold=CONVERGENCE_TD_THRESHOLD,
+                 opponent=CONVERGENCE_OPPONENT, eval_games=CONVERGENCE_EVAL_GAMES,
+                 max_loss_rate=CONVERGENCE_MAX_LOSS_RATE, patience=CONVERGENCE_PATIENCE,
+                 eval_every=CONVERGENCE_EVAL_EVERY, seed=None):
+        if opponent is not None and opponent not in OPPONENTS:
+            raise ValueError(f"Invalid opponent {opponent!r}. Choose from {OPPONENTS}")
+        self.window = window
+        self.td_threshold = td_threshold
+        self.opponent = opponent
+        self.eval_games = eval_games
+        self.max_loss_rate = max_loss_rate
+        self.patience = patience
+        self.eval_every = eval_every
+        self.seed = seed
+        self.curve = []
+        self.converged = False
+        self._td_total = 0.0
+        self._episodes = 0
+        self._streak = 0
+        self._windows = 0
+        self._start = time.perf_counter()
+
+    def observe(self, td_delta):
+        """Add one episode's total TD change."""
+        self._td_total += td_delta
+        self._episodes += 1
+
+    def check(self, episode, agent1, agent2):
+        """Close the window ending at *episode*; returns True once training has converged."""
+        td = self._td_total / max(self._episodes, 1)
+        self._td_total = 0.0
+        self._episodes = 0
+        point = {"episode": episode, "td_delta": td}
+        ok = td <= self.td_threshold
+        self._windows += 1
+        if self.opponent is not None and (ok or self._windows % self.eval_every == 0):
+            point.update(self._evaluate(agent1, agent2))
+            ok = ok and max(point["p1_loss_rate"], point["p2_loss_rate"]) <= self.max_loss_rate
+        point["seconds"] = time.perf_counter() - self._start
+        self.curve.append(point)
+        self._streak = self._streak + 1 if ok else 0
+        self.converged = self._streak >= self.patience
+        return self.converged
+
+    def _evaluate(self, agent1, agent2):
+        as_p1 = evaluate(agent_player(agent1, "p1"), load_player(self.opponent, -1),
+                         self.eval_games, self.seed)
+        as_p2 = evaluate(load_player(self.opponent, 1), agent_player(agent2, "p2"),
+                         self.eval_games, self.seed)
+        return {
+            "p1_win_rate": as_p1["p1_win_rate"]["rate"],
+            "p1_loss_rate": as_p1["p2_win_rate"]["rate"],
+            "p2_win_rate": as_p2["p2_win_rate"]["rate"],
+            "p2_loss_rate": as_p2["p1_win_rate"]["rate"],
+        }
@@ -0,0 +1,49 @@
+import numpy as np
+
+CELLS = 9
+N_STATES = 3 ** CELLS
+
+# Base-3 digit of each cell is its value + 1 (0 = Player 2, 1 = empty, 2 = Player 1).
+POWERS = 3 ** np.arange(CELLS)
+OFFSET = (N_STATES - 1) // 2
+EMPTY_INDEX = OFFSET
+
+_KEY_DTYPE = np.dtype((np.void, CELLS * 8))
+
+
+def encode(state):
+    """Return the base-3 index (0..3^9-1) of a 3x3 board."""
+    return int(state.ravel() @ POWERS) + OFFSET
+
+
+def encode_many(boards):
+    """Return base-3 indices for an (N, 9) stack of boards."""
+    return (np.asarray(boards).reshape(-1, CELLS) @ POWERS).astype(np.int64) + OFFSET
+
+
+def decode(index):
+    """Return the 3x3 float board for a base-3 index."""
+    digits = (index // POWERS) % 3
+    return (digits - 1).astype(float).reshape(3, 3)
+
+
+def board_bytes(boards):
+    """Return ``state.tobytes()`` for each row of an (N, 9) float64 board array."""
+    return np.ascontiguousarray(boards, dtype=float).view(_KEY_DTYPE).ravel().tolist()
+
+
+def pack_board(board):
+    """Compact key for a board of any size: Player 1 and Player 2 bit planes.
+
+    Takes 2 bits per cell (57 bytes for 15x15), versus 8 bytes per cell for
+    the float64 ``tobytes()`` keys used on 3x3 boards.
+    """
+    flat = np.asarray(board).ravel()
+    return np.packbits(np.concatenate((flat > 0, flat < 0))).tobytes()
+
+
+def pack_boards(boards):
+    """Return :func:`pack_board` keys for an (N, cells) stack of boards."""
+    boards = np.asarray(boards)
+    planes = np.packbits(np.concatenate((boards > 0, boards < 0), axis=1), axis=1)
+    return [row.tobytes() for row in planes]
@@ -1,74 +1,124 @@
-import numpy as np
+from game.config import BOARD_COLS, BOARD_ROWS, ENGINE_BACKEND, WIN_LENGTH
+from game.lines import board_lines, check_board_size
+
+# Flat cell indices of every row, column and diagonal of the 3x3 board,
+# and the lines through each cell.
+LINES, CELL_LINES = board_lines(3, 3, 3)
 
 
 class GameEngine:
-    """Pure game state and rules — no I/O."""
+    """Pure game state and rules — no I/O.
+
+    Plays on a *rows* x *cols* board where *win_length* in a row wins. Keeps
+    a running sum per winning window and a move counter, updated in
+    ``make_move`` and reverted in ``undo_move``, so win and tie detection
+    only look at the windows through the cell just played.
+    """
 
     PLAYER_NAMES = {3: "Player 1", -3: "Player 2"}
 
-    def __init__(self):
-        self.state = np.zeros((3, 3))
+    def __init__(self, rows=BOARD_ROWS, cols=BOARD_COLS, win_length=WIN_LENGTH):
+        check_board_size(rows, cols, win_length)
+        self.rows = rows
+        self.cols = cols
+        self.win_length = win_length
+        self.lines, self.cell_lines = board_lines(rows, cols, win_length)
+        if win_length != 3:
+            self.PLAYER_NAMES = {win_length: "Player 1", -win_length: "Player 2"}
+        import numpy as np  # only this backend needs NumPy to play
+
+        self.state = np.zeros((rows, cols))
+        self.line_sums = [0] * len(self.lines)
+        self.move_count = 0
         self.done = False
         self.winner = None
 
     def reset(self):
         self.state[:, :] = 0
+        self.line_sums = [0] * len(self.lines)
+        self.move_count = 0
         self.done = False
         self.winner = None
 
     def make_move(self, row, col, player):
-        """Place *player* (1 or -1) at (row, col). Returns False if cell is occupied."""
+        """Place *player* (1 or -1) at (row, col). Returns False if cell is occupied.
+
+        Raises ValueError for a cell off the board.
+        """
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            raise ValueError(f"({row}, {col}) is off the {self.rows}x{self.cols} board")
         if self.state[row, col] != 0:
             return False
         self.state[row, col] = player
-        self.check_winner()
+        self.move_count += 1
+        line_sums = self.line_sums
+        for n in self.cell_lines[row * self.cols + col]:
+            total = line_sums[n] + player
+            line_sums[n] = total
+            if total in self.PLAYER_NAMES:
+                self.done = True
+                self.winner = self.PLAYER_NAMES[total]
+
+        # Tie
+        if self.move_count == self.state.size:
+            self.done = True
+        return True
+
+    def undo_move(self, row, col):
+        """Take back the stone at (row, col). Returns False if the cell is empty.
+
+        Raises ValueError for a cell off the board.
+        """
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            raise ValueError(f"({row}, {col}) is off the {self.rows}x{self.cols} board")
+        player = int(self.state[row, col])
+        if player == 0:
+            return False
+        self.state[row, col] = 0
+        self.move_count -= 1
+        for n in self.cell_lines[row * self.cols + col]:
+            self.line_sums[n] -= player
+        # The position before any finishing move was still in progress.
+        self.done = False
+        self.winner = None
         return True
 
+    def board(self):
+        """The board as nested lists of floats (1.0, -1.0, 0.0)."""
+        return self.state.tolist()
+
     def get_valid_moves(self):
-        return [(i, j) for i in range(3) for j in range(3) if self.state[i, j] == 0]
+        cols = self.cols
+        return [divmod(cell, cols) for cell, v in enumerate(self.state.ravel().tolist()) if v == 0]
 
     def check_winner(self):
-        # Columns
-        for col in range(3):
-            total = sum(self.state[:, col])
-            if total in self.PLAYER_NAMES:
-                self.done = True
-                self.winner = self.PLAYER_NAMES[total]
-                return
-
-        # Rows
-        for row in range(3):
-            total = sum(self.state[row, :])
+        for total in self.line_sums:
             if total in self.PLAYER_NAMES:
                 self.done = True
                 self.winner = self.PLAYER_NAMES[total]
                 return
 
-        # Diagonal (top-left to bottom-right)
-        total = sum(self.state[i, i] for i in range(3))
-        if total in self.PLAYER_NAMES:
-            self.done = True
-            self.winner = self.PLAYER_NAMES[total]
-            return
-
-        # Diagonal (bottom-left to top-right)
-        total = self.state[0, 2] + self.state[1, 1] + self.state[2, 0]
-        if total in self.PLAYER_NAMES:
-            self.done = True
-            self.winner = self.PLAYER_NAMES[total]
-            return
-
         # Tie
-        if 0 not in self.state:
+        if self.move_count == self.state.size:
             self.done = True
 
     def state_to_display(self):
-        cells = []
-        for val in np.nditer(self.state):
-            if val == -1:
-                cells.append(" X ")
-            elif val == 0:
-                cells.append("   ")
-            else:
-                cells.append(" O ")
-        return "{}|{}|{}\n-----------\n{}|{}|{}\n-----------\n{}|{}|{}\n".format(*cells)
+        return format_board(self.state)
+
+
+def format_board(state):
+    """Render a board as a text grid (O for Player 1, X for Player 2)."""
+    symbols = {1: " O ", -1: " X ", 0: "   "}
+    rows = ["|".join(symbols[int(v)] for v in row) for row in state]
+    separator = "\n" + "-" * (4 * state.shape[1] - 1) + "\n"
+    return separator.join(rows) + "\n"
+
+
+def make_engine(backend=ENGINE_BACKEND, rows=BOARD_ROWS, cols=BOARD_COLS, win_length=WIN_LENGTH):
+    """Build an engine for *backend*: "numpy" (:class:`GameEngine`) or "bitboard"."""
+    if backend == "numpy":
+        return GameEngine(rows, cols, win_length)
+    if backend == "bitboard":
+        from game.bitboard import BitboardEngine
+        return BitboardEngine(rows, cols, win_length)
+    raise ValueError(f"Unknown engine backend {backend!r}. Choose 'numpy' or 'bitboard'")
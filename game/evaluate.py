@@ -0,0 +1,148 @@
+import functools
+import math
+import os
+
+import numpy as np
+
+from game.agent import Agent
+from game.encoding import CELLS, N_STATES, POWERS
+from game.policy import NO_MOVE, PolicyTable, _HEADER
+from game.solver import solved
+
+PLAYERS = ("random", "perfect")
+ONGOING = 2
+
+
+@functools.lru_cache(maxsize=None)
+def _tables():
+    """Per board index: the empty cells and the status (1, -1, 0 for a tie, or ONGOING)."""
+    digits = (np.arange(N_STATES)[:, None] // POWERS) % 3 - 1
+    empty = digits == 0
+    lines = np.array([
+        [0, 1, 2], [3, 4, 5], [6, 7, 8],
+        [0, 3, 6], [1, 4, 7], [2, 5, 8],
+        [0, 4, 8], [2, 4, 6],
+    ])
+    sums = digits[:, lines].sum(axis=2)
+    status = np.full(N_STATES, ONGOING, dtype=np.int8)
+    status[~empty.any(axis=1)] = 0
+    status[(sums == -3).any(axis=1)] = -1
+    status[(sums == 3).any(axis=1)] = 1
+    return empty, status
+
+
+class TablePlayer:
+    """A player for bulk evaluation: ``masks[index]`` marks the cells it may
+    play at each base-3 board index, and it picks uniformly among them."""
+
+    def __init__(self, name, masks):
+        self.name = name
+        self.masks = masks
+
+
+def random_player():
+    return TablePlayer("random", _tables()[0])
+
+
+@functools.lru_cache(maxsize=None)
+def perfect_player():
+    masks = np.zeros((N_STATES, CELLS), dtype=bool)
+    for index, best in solved().best_moves.items():
+        masks[index, list(best)] = True
+    return TablePlayer("perfect", masks)
+
+
+def agent_player(agent, name="agent"):
+    """Greedy play from an :class:`Agent`'s table; ties are broken at random.
+
+    Unseen afterstates count as 0.5 and ``agent.memory`` is not modified.
+    """
+    empty = _tables()[0]
+    indices = np.arange(N_STATES)[:, None]
+    afterstates = np.where(empty, indices + agent.symbol * POWERS, indices)
+    values = np.where(empty, agent.value_table()[afterstates], -np.inf)
+    return TablePlayer(name, empty & (values == values.max(axis=1, keepdims=True)))
+
+
+def policy_player(table, name="policy"):
+    """Play a :class:`PolicyTable`'s stored move."""
+    moves = np.frombuffer(table._map, dtype=np.uint8, count=N_STATES, offset=_HEADER.size)
+    masks = np.zeros((N_STATES, CELLS), dtype=bool)
+    covered = np.flatnonzero(moves != NO_MOVE)
+    masks[covered, moves[covered]] = True
+    return TablePlayer(name, masks)
+
+
+def load_player(spec, symbol):
+    """Player from a spec: "random", "perfect", a ``.policy`` file or a model file."""
+    if spec == "random":
+        return random_player()
+    if spec == "perfect":
+        return perfect_player()
+    if not os.path.exists(spec):
+        raise ValueError(f"Unknown player {spec!r}: use {PLAYERS} or a model file")
+    if spec.endswith(".policy"):
+        table = PolicyTable(spec)
+        try:
+            return policy_player(table, spec)
+        finally:
+            table.close()
+    agent = Agent(symbol)
+    agent.load(spec)
+    return agent_player(agent, spec)
+
+
+def wilson_interval(successes, n, z=1.96):
+    """Wilson score interval ``(low, high)`` for a binomial proportion."""
+    if n == 0:
+        return 0.0, 1.0
+    p = successes / n
+    denominator = 1 + z * z / n
+    centre = (p + z * z / (2 * n)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denominator
+    return max(0.0, centre - margin), min(1.0, centre + margin)
+
+
+def _play(player1, player2, games, rng):
+    """Play *games* games in lockstep; returns the status code of each."""
+    _, status = _tables()
+    index = np.full(games, (N_STATES - 1) // 2, dtype=np.int64)
+    result = np.full(games, ONGOING, dtype=np.int8)
+    active = np.arange(games)
+    for ply in range(CELLS):
+        player = player1 if ply % 2 == 0 else player2
+        symbol = 1 if ply % 2 == 0 else -1
+        masks = player.masks[index[active]]
+        if not masks.any(axis=1).all():
+            raise ValueError(f"Player {player.name!r} has no move for some positions")
+        noise = rng.random(masks.shape)
+        cells = np.argmax(np.where(masks, noise, -1.0), axis=1)
+        index[active] += symbol * POWERS[cells]
+        result[active] = status[index[active]]
+        active = active[result[active] == ONGOING]
+        if not len(active):
+            break
+    return result
+
+
+def evaluate(player1, player2, games, seed=None, chunk_size=100000):
+    """Play *games* games of *player1* (moving first) against *player2*.
+
+    All games advance together one ply at a time as array operations, in
+    chunks of *chunk_size*. Returns counts and each outcome's rate with a
+    95% Wilson confidence interval.
+    """
+    rng = np.random.default_rng(seed)
+    counts = {1: 0, -1: 0, 0: 0}
+    for start in range(0, games, chunk_size):
+        result = _play(player1, player2, min(chunk_size, games - start), rng)
+        for code in counts:
+            counts[code] += int(np.count_nonzero(result == code))
+
+    report = {"games": games, "player1": player1.name, "player2": player2.name,
+              "p1_wins": counts[1], "p2_wins": counts[-1], "ties": counts[0]}
+    for name, count in (("p1_win_rate", counts[1]), ("p2_win_rate", counts[-1]),
+                        ("tie_rate", counts[0])):
+        low, high = wilson_interval(count, games)
+        report[name] = {"rate": count / games if games else 0.0, "low": low, "high": high}
+    return report
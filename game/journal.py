@@ -0,0 +1,170 @@
+"""Append-only journal of finished games.
+
+A journal file is a fixed header followed by one record per game: a byte
+per move holding the cell index (``row * cols + col``, below 0x80),
+closed by an outcome byte ``0x80 | (outcome + 1)`` where the outcome is 1
+for a Player 1 win, -1 for a Player 2 win and 0 for a tie. A 3x3 game
+takes at most 10 bytes. Records never span a write, so a journal cut off
+mid-flush loses at most its unterminated tail.
+"""
+import atexit
+import os
+import struct
+import threading
+
+from game.config import JOURNAL_FILE, JOURNAL_FLUSH_BYTES, JOURNAL_FLUSH_INTERVAL
+
+MAGIC = b"TTTJ"
+VERSION = 1
+OUTCOME_FLAG = 0x80
+MAX_CELLS = OUTCOME_FLAG - 1
+CHUNK_BYTES = 1 << 20
+
+_HEADER = struct.Struct("<4sHBBB")
+
+OUTCOMES = {"Player 1": 1, "Player 2": -1, None: 0}
+
+
+def read_header(file_name):
+    """Return ``(rows, cols, win_length)`` of a journal file."""
+    with open(file_name, "rb") as f:
+        data = f.read(_HEADER.size)
+    if len(data) < _HEADER.size:
+        raise ValueError(f"{file_name!r} is not a game journal")
+    magic, version, rows, cols, win_length = _HEADER.unpack(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{file_name!r} is not a version {VERSION} game journal")
+    return rows, cols, win_length
+
+
+def _truncate_tail(file_name):
+    """Cut an unterminated trailing record so the next game does not extend it."""
+    with open(file_name, "r+b") as f:
+        end = f.seek(0, os.SEEK_END)
+        while end > _HEADER.size:
+            start = max(_HEADER.size, end - 4096)
+            f.seek(start)
+            chunk = f.read(end - start)
+            last = next((i for i in range(len(chunk) - 1, -1, -1) if chunk[i] >= OUTCOME_FLAG), None)
+            if last is not None:
+                end = start + last + 1
+                break
+            end = start
+        f.truncate(end)
+
+
+class JournalWriter:
+    """Buffered, append-only journal writer.
+
+    :meth:`record` only appends to an in-memory buffer; a background thread
+    writes the buffer out once it holds *flush_bytes* or every
+    *flush_interval* seconds, so callers never wait on the disk. Appending
+    to an existing journal requires the same board and first drops any
+    unterminated record a crash left at its end.
+    """
+
+    def __init__(self, file_name, rows=3, cols=3, win_length=3,
+                 flush_bytes=JOURNAL_FLUSH_BYTES, flush_interval=JOURNAL_FLUSH_INTERVAL):
+        if rows * cols > MAX_CELLS:
+            raise ValueError(f"Journals support boards of at most {MAX_CELLS} cells")
+        self.file_name = file_name
+        self.board = (rows, cols, win_length)
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.games = 0
+        if os.path.exists(file_name) and os.path.getsize(file_name):
+            if read_header(file_name) != self.board:
+                raise ValueError(f"{file_name!r} journals a different board")
+            _truncate_tail(file_name)
+            self._file = open(file_name, "ab")
+        else:
+            self._file = open(file_name, "wb")
+            self._file.write(_HEADER.pack(MAGIC, VERSION, rows, cols, win_length))
+            self._file.flush()
+        self._buffer = bytearray()
+        self._closed = False
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="journal")
+        self._thread.start()
+
+    def record(self, cells, outcome):
+        """Queue a finished game: its move *cells* and *outcome* (1, -1 or 0)."""
+        record = bytes(cells) + bytes((OUTCOME_FLAG | (outcome + 1),))
+        with self._cond:
+            if self._closed:
+                raise ValueError("Journal is closed")
+            self._buffer += record
+            self.games += 1
+            if len(self._buffer) >= self.flush_bytes:
+                self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._closed:
+                    self._cond.wait(self.flush_interval)
+                closed = self._closed
+            self.flush()
+            if closed:
+                return
+
+    def flush(self):
+        """Write out everything recorded so far before returning."""
+        with self._write_lock:
+            with self._cond:
+                data, self._buffer = self._buffer, bytearray()
+            if data:
+                self._file.write(data)
+                self._file.flush()
+
+    def close(self):
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        self._file.close()
+
+
+def iter_journal(file_name, chunk_bytes=CHUNK_BYTES):
+    """Yield ``(cells, outcome)`` for each game in a journal, reading it in chunks.
+
+    *cells* is a ``bytes`` of move cell indices. Memory use is bounded by
+    *chunk_bytes* however large the file; an unterminated trailing record
+    is skipped.
+    """
+    import numpy as np
+
+    read_header(file_name)
+    with open(file_name, "rb") as f:
+        f.seek(_HEADER.size)
+        tail = b""
+        while True:
+            chunk = f.read(chunk_bytes)
+            if not chunk:
+                return
+            data = tail + chunk
+            ends = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) >= OUTCOME_FLAG).tolist()
+            start = 0
+            for end in ends:
+                yield data[start:end], data[end] - OUTCOME_FLAG - 1
+                start = end + 1
+            tail = data[start:]
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_journal():
+    """The process-wide writer for JOURNAL_FILE (3x3 games), or None if journaling is off."""
+    global _default
+    if JOURNAL_FILE is None:
+        return None
+    with _default_lock:
+        if _default is None:
+            _default = JournalWriter(JOURNAL_FILE)
+            atexit.register(_default.close)
+    return _default
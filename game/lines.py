@@ -0,0 +1,35 @@
+import functools
+
+
+@functools.lru_cache(maxsize=None)
+def board_lines(rows, cols, win_length):
+    """Winning windows of an m,n,k board.
+
+    Returns ``(lines, cell_lines)``: every run of *win_length* cells along a
+    row, column or diagonal as a tuple of flat cell indices, and for each
+    cell the indices of the lines through it.
+    """
+    lines = []
+    for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+        for r in range(rows):
+            for c in range(cols):
+                end_r = r + dr * (win_length - 1)
+                end_c = c + dc * (win_length - 1)
+                if 0 <= end_r < rows and 0 <= end_c < cols:
+                    lines.append(tuple(
+                        (r + dr * n) * cols + c + dc * n for n in range(win_length)
+                    ))
+
+    cell_lines = [[] for _ in range(rows * cols)]
+    for n, line in enumerate(lines):
+        for cell in line:
+            cell_lines[cell].append(n)
+    return tuple(lines), tuple(tuple(ns) for ns in cell_lines)
+
+
+def check_board_size(rows, cols, win_length):
+    """Raise ValueError unless *win_length* fits on a *rows* x *cols* board."""
+    if rows < 1 or cols < 1:
+        raise ValueError(f"Invalid board size {rows}x{cols}")
+    if not 1 <= win_length <= max(rows, cols):
+        raise ValueError(f"Win length {win_length} does not fit a {rows}x{cols} board")
@@ -0,0 +1,186 @@
+import math
+import random
+import time
+
+import numpy as np
+
+from game.bitboard import BitboardEngine
+from game.config import MCTS_EXPLORATION, MCTS_ITERATIONS, MCTS_TIME_BUDGET, WIN_LENGTH
+
+_RESULTS = {"Player 1": 1, "Player 2": -1, None: 0}
+
+
+class Node:
+    """Search-tree node for the position reached by *player* playing *move*."""
+
+    __slots__ = ("move", "player", "parent", "children", "untried", "visits", "wins")
+
+    def __init__(self, move, player, parent, untried):
+        self.move = move
+        self.player = player
+        self.parent = parent
+        self.children = []
+        self.untried = untried
+        self.visits = 0
+        self.wins = 0.0
+
+    def select(self, exploration):
+        """Child with the highest UCT score."""
+        log_visits = math.log(self.visits)
+        return max(
+            self.children,
+            key=lambda c: c.wins / c.visits + exploration * math.sqrt(log_visits / c.visits),
+        )
+
+
+def td_evaluator(agent):
+    """Leaf evaluator reading an :class:`Agent`'s value table.
+
+    Returns the stored value of a position reached by the agent's own move,
+    from that mover's point of view, and None (fall back to a rollout) for
+    positions the agent never learned or did not move into.
+    """
+    def evaluate(state, player):
+        if player != agent.symbol:
+            return None
+        return agent.memory.get(agent.state_key(state))
+
+    return evaluate
+
+
+class MCTSAgent:
+    """Monte Carlo Tree Search (UCT) player with the :class:`Agent` interface.
+
+    Each decision runs *iterations* playouts, or as many as fit in
+    *time_budget* seconds when that is set. Playouts are random rollouts
+    played and undone on a single :class:`BitboardEngine`, so no board is
+    copied. The subtree under the opponent's reply is kept between moves of
+    the same game. An optional *evaluator* ``(state, player) -> value or
+    None`` scores leaves instead of rolling out, e.g. :func:`td_evaluator`.
+    """
+
+    def __init__(self, symbol, iterations=MCTS_ITERATIONS, time_budget=MCTS_TIME_BUDGET,
+                 win_length=WIN_LENGTH, exploration=MCTS_EXPLORATION, evaluator=None):
+        self.symbol = symbol
+        self.iterations = iterations
+        self.time_budget = time_budget
+        self.win_length = win_length
+        self.exploration = exploration
+        self.evaluator = evaluator
+        self.playouts = 0
+        self.reset()
+
+    def reset(self):
+        self._root = None
+        self._board = None
+
+    def choose_action(self, state, greedy=True):
+        root = self.search(state)
+        best = max(root.children, key=lambda c: c.visits)
+        row, col = best.move
+        self._root = best
+        self._board = state.copy()
+        self._board[row, col] = self.symbol
+        return row, col, self.symbol
+
+    def search(self, state):
+        """Run this decision's playouts from *state* and return the root node."""
+        engine = self._engine_for(state)
+        root = self._reuse_root(state) or Node(None, -self.symbol, None, self._moves(engine))
+        root.parent = None
+        self.playouts = self._search(root, engine)
+        return root
+
+    def root_visits(self, state):
+        """Run a search from *state* and return ``{move: visits}`` for the root's children."""
+        return {child.move: child.visits for child in self.search(state).children}
+
+    def _engine_for(self, state):
+        rows, cols = state.shape
+        engine = BitboardEngine(rows, cols, self.win_length)
+        for cell in np.flatnonzero(state).tolist():
+            engine.bits[int(state.flat[cell])] |= 1 << cell
+        return engine
+
+    def _reuse_root(self, state):
+        """Subtree for the opponent's reply to our last move, if it was explored."""
+        if self._root is None or self._board.shape != state.shape:
+            return None
+        changed = np.argwhere(self._board != state)
+        if len(changed) != 1:
+            return None
+        move = tuple(changed[0].tolist())
+        return next((c for c in self._root.children if c.move == move), None)
+
+    @staticmethod
+    def _moves(engine):
+        if engine.done:
+            return []
+        moves = engine.get_valid_moves()
+        random.shuffle(moves)
+        return moves
+
+    def _search(self, root, engine):
+        deadline = time.perf_counter() + self.time_budget if self.time_budget else None
+        playouts = 0
+        while True:
+            if deadline is None:
+                if playouts >= self.iterations:
+                    break
+            elif time.perf_counter() >= deadline and playouts:
+                break
+            self._playout(root, engine)
+            playouts += 1
+        return playouts
+
+    def _playout(self, root, engine):
+        node = root
+        played = []
+
+        # Selection
+        while not node.untried and node.children:
+            node = node.select(self.exploration)
+            engine.make_move(*node.move, node.player)
+            played.append(node.move)
+
+        # Expansion
+        if node.untried:
+            move = node.untried.pop()
+            player = -node.player
+            engine.make_move(*move, player)
+            played.append(move)
+            node = Node(move, player, node, self._moves(engine))
+            node.parent.children.append(node)
+
+        # Evaluation: the leaf mover's score in [0, 1]
+        score = None
+        if self.evaluator is not None and not engine.done:
+            score = self.evaluator(engine.state, node.player)
+        if score is None:
+            score = self._rollout(engine, node.player, played)
+
+        # Backpropagation
+        while node is not None:
+            node.visits += 1
+            node.wins += score
+            score = 1 - score
+            node = node.parent
+
+        for move in reversed(played):
+            engine.undo_move(*move)
+
+    @staticmethod
+    def _rollout(engine, player, played):
+        """Random playout; returns *player*'s score (1 win, 0.5 tie, 0 loss)."""
+        if not engine.done:
+            moves = engine.get_valid_moves()
+            random.shuffle(moves)
+            mover = -player
+            for move in moves:
+                engine.make_move(*move, mover)
+                played.append(move)
+                if engine.done:
+                    break
+                mover = -mover
+        result = _RESULTS[engine.winner]
+        return 0.5 if result == 0 else float(result == player)
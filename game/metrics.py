@@ -0,0 +1,313 @@
+"""Optional counters, latency histograms and gauges in Prometheus text format.
+
+Nothing is measured until :func:`enable` is called: it wraps the
+instrumented methods (moves, AI decisions, model loads, training episodes
+and TD updates) in place, and :func:`disable` puts the originals back, so
+with instrumentation off the hot paths run exactly the code they always
+did.
+"""
+import bisect
+import functools
+import sys
+import threading
+import time
+import weakref
+
+# Seconds; the last bucket is +Inf.
+LATENCY_BUCKETS = (1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in pairs) + "}"
+
+
+class _CounterValue:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+
+class _HistogramValue:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Metric:
+    """A named metric with optional labels; ``labels(*values)`` selects a series."""
+
+    kind = None
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        series = self._series.get(values)
+        if series is None:
+            with self._lock:
+                series = self._series.setdefault(values, self._new_series())
+        return series
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def _new_series(self):
+        raise NotImplementedError
+
+    def samples(self):
+        """Yield ``(suffix, labels, value)`` for every sample of this metric."""
+        raise NotImplementedError
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, labels, value in self.samples():
+            lines.append(f"{self.name}{suffix}{labels} {value}")
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def _new_series(self):
+        return _CounterValue()
+
+    def inc(self, amount=1):
+        self.labels().inc(amount)
+
+    def samples(self):
+        for values, series in sorted(self._series.items()):
+            yield "_total", _format_labels(self.labelnames, values), series.value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+
+    def _new_series(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value):
+        self.labels().observe(value)
+
+    def samples(self):
+        for values, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), series.counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, values, [("le", bound)])
+                yield "_bucket", labels, cumulative
+            labels = _format_labels(self.labelnames, values)
+            yield "_sum", labels, series.sum
+            yield "_count", labels, series.count
+
+
+class Gauge(Metric):
+    """Gauge read at render time from ``collect() -> {label values: value}``."""
+
+    kind = "gauge"
+
+    def __init__(self, name, help, labelnames=(), collect=None):
+        super().__init__(name, help, labelnames)
+        self.collect = collect
+
+    def samples(self):
+        for values, value in sorted(self.collect().items()):
+            yield "", _format_labels(self.labelnames, values), value
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        return "".join(metric.render() + "\n" for metric in self.metrics)
+
+    def reset(self):
+        for metric in self.metrics:
+            metric.clear()
+
+
+# Agents seen by instrumented code, for the table gauges.
+_agents = weakref.WeakSet()
+
+
+def table_bytes(memory):
+    """Approximate memory used by a value table."""
+    if isinstance(memory, dict):
+        return sys.getsizeof(memory) + sum(
+            sys.getsizeof(k) + sys.getsizeof(v) for k, v in memory.items()
+        )
+    return memory.nbytes
+
+
+def _tables():
+    tables = {}
+    for agent in list(_agents):
+        tables[id(agent.memory)] = (agent.symbol, agent.memory)
+    return tables.values()
+
+
+def _table_states():
+    states = {}
+    for symbol, memory in _tables():
+        states[(symbol,)] = states.get((symbol,), 0) + len(memory)
+    return states
+
+
+def _table_bytes():
+    sizes = {}
+    for symbol, memory in _tables():
+        sizes[(symbol,)] = sizes.get((symbol,), 0) + table_bytes(memory)
+    return sizes
+
+
+registry = Registry()
+moves = registry.register(Counter(
+    "tictactoe_moves", "Human moves processed by GameSession.make_move"))
+move_seconds = registry.register(Histogram(
+    "tictactoe_move_seconds", "GameSession.make_move latency, including the AI reply"))
+decision_seconds = registry.register(Histogram(
+    "tictactoe_decision_seconds", "choose_action latency by player class", ["player"]))
+model_load_seconds = registry.register(Histogram(
+    "tictactoe_model_load_seconds", "Model file load time by kind", ["kind"]))
+episodes = registry.register(Counter(
+    "tictactoe_episodes", "Self-play training episodes played", ["trainer"]))
+episode_seconds = registry.register(Histogram(
+    "tictactoe_episode_seconds", "Trainer.play_episode latency"))
+td_updates = registry.register(Counter(
+    "tictactoe_td_updates", "State values updated by Agent.train"))
+td_update_seconds = registry.register(Histogram(
+    "tictactoe_td_update_seconds", "Agent.train latency per episode"))
+registry.register(Gauge(
+    "tictactoe_agent_table_states", "States in live agents' value tables", ["symbol"],
+    _table_states))
+registry.register(Gauge(
+    "tictactoe_agent_table_bytes", "Approximate bytes used by live agents' value tables",
+    ["symbol"], _table_bytes))
+
+_patches = []
+_patch_lock = threading.Lock()
+
+
+def _timed(histogram, label=None, before=None):
+    """Decorator factory observing a method's duration in *histogram*.
+
+    *label* maps the wrapped call's ``self`` to a label value; *before* is
+    called with ``self`` (and the arguments) ahead of the call.
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            if before is not None:
+                before(self, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(self, *args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                if label is None:
+                    histogram.observe(elapsed)
+                else:
+                    histogram.labels(label(self)).observe(elapsed)
+        return wrapper
+    return decorate
+
+
+def _patch(owner, name, decorator):
+    original = owner.__dict__[name]
+    setattr(owner, name, decorator(original))
+    _patches.append((owner, name, original))
+
+
+def _before_train(agent, *args, **kwargs):
+    _agents.add(agent)
+    td_updates.inc(len(agent.moves))
+
+
+def _before_load(agent, *args, **kwargs):
+    _agents.add(agent)
+
+
+def _before_episode(trainer, *args, **kwargs):
+    episodes.labels(type(trainer).__name__).inc()
+
+
+def _count_batch(fn):
+    @functools.wraps(fn)
+    def wrapper(self, epsilon, use_random_p1):
+        episodes.labels(type(self).__name__).inc(len(epsilon))
+        return fn(self, epsilon, use_random_p1)
+    return wrapper
+
+
+def enable():
+    """Instrument the hot paths. Calling it again is a no-op."""
+    from game.agent import Agent
+    from game.batch_trainer import BatchTrainer
+    from game.mcts import MCTSAgent
+    from game.parallel_mcts import ParallelMCTSAgent
+    from game.policy import PolicyTable
+    from game.session import GameSession
+    from game.solver import SolverAgent
+    from game.trainer import Trainer
+
+    with _patch_lock:
+        if _patches:
+            return
+        _patch(GameSession, "make_move",
+               _timed(move_seconds, before=lambda *args, **kwargs: moves.inc()))
+        for player in (Agent, SolverAgent, MCTSAgent, ParallelMCTSAgent, PolicyTable):
+            _patch(player, "choose_action",
+                   _timed(decision_seconds, label=lambda p: type(p).__name__))
+        _patch(Agent, "load", _timed(model_load_seconds, label=lambda _: "agent",
+                                     before=_before_load))
+        _patch(PolicyTable, "__init__", _timed(model_load_seconds, label=lambda _: "policy"))
+        _patch(Agent, "train", _timed(td_update_seconds, before=_before_train))
+        _patch(Trainer, "play_episode", _timed(episode_seconds, before=_before_episode))
+        _patch(BatchTrainer, "_play_batch", _count_batch)
+
+
+def disable():
+    """Restore the uninstrumented methods. Collected values are kept."""
+    with _patch_lock:
+        while _patches:
+            owner, name, original = _patches.pop()
+            setattr(owner, name, original)
+
+
+def enabled():
+    return bool(_patches)
+
+
+def render():
+    """The current metrics in the Prometheus text exposition format."""
+    return registry.render()
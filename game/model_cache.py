@@ -0,0 +1,80 @@
+import os
+import threading
+import time
+
+from game.config import MODEL_CHECK_INTERVAL
+
+
+class ModelCache:
+    """Process-wide cache of loaded models with hot reload.
+
+    ``get(path, loader)`` returns ``loader(path)``, loading it only on the
+    first request. The file's (mtime, size, inode) signature is re-checked
+    at most every *check_interval* seconds; when it changes the model is
+    reloaded and swapped in atomically. Callers holding the previous model
+    keep using it unchanged.
+    """
+
+    def __init__(self, check_interval=MODEL_CHECK_INTERVAL):
+        self.check_interval = check_interval
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+
+    @staticmethod
+    def _signature(path):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def get(self, path, loader):
+        """Return the cached model for *path*, or None if the file does not exist."""
+        now = time.monotonic()
+        entry = self._entries.get(path)
+        if entry is not None and now - entry[2] < self.check_interval:
+            self.hits += 1
+            return entry[1]
+
+        with self._lock:
+            entry = self._entries.get(path)
+            signature = self._signature(path)
+            if signature is None:
+                self._entries.pop(path, None)
+                self.misses += 1
+                return None
+            if entry is not None and entry[0] == signature:
+                self._entries[path] = (signature, entry[1], now)
+                self.hits += 1
+                return entry[1]
+
+            model = loader(path)
+            if entry is None:
+                self.misses += 1
+            else:
+                self.reloads += 1
+            self._entries[path] = (signature, model, now)
+            return model
+
+    def invalidate(self, path=None):
+        """Force the next ``get`` for *path* (or every path) to re-check the file."""
+        with self._lock:
+            paths = [path] if path is not None else list(self._entries)
+            for p in paths:
+                if p in self._entries:
+                    signature, model, _ = self._entries[p]
+                    self._entries[p] = (signature, model, float("-inf"))
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "reloads": self.reloads,
+            "models": len(self._entries),
+        }
+
+
+model_cache = ModelCache()
@@ -0,0 +1,135 @@
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from game.agent import Agent
+from game.batch_trainer import BatchTrainer
+from game.config import TRAINING_EPISODES, TRAINING_SEED, TRAINING_WORKERS
+from game.engine import make_engine
+from game.rng import spawn
+from game.trainer import Trainer
+
+
+class _CountingAgent(Agent):
+    """Agent that counts how often each state received a TD update."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.visits = {}
+
+    def train(self, result):
+        for h in self.moves:
+            self.visits[h] = self.visits.get(h, 0) + 1
+        return super().train(result)
+
+
+def merge_memories(tables):
+    """Merge ``(memory, visits)`` pairs into one value table.
+
+    Each state's merged value is the average of the workers' values weighted
+    by how many TD updates each worker applied to it. States that no worker
+    updated (seen only as unchosen candidates) get the plain mean.
+    """
+    totals = {}
+    for memory, visits in tables:
+        for h, value in memory.items():
+            n = visits.get(h, 0)
+            weighted, weight, plain, count = totals.get(h, (0.0, 0, 0.0, 0))
+            totals[h] = (weighted + n * value, weight + n, plain + value, count + 1)
+
+    return {
+        h: weighted / weight if weight else plain / count
+        for h, (weighted, weight, plain, count) in totals.items()
+    }
+
+
+def _train_worker(episodes, batch_size, agent_params, memories, seed):
+    # Each worker gets its own child seed, so workers diverge but repeat.
+    agent_seeds = spawn(seed, 3)
+    agents = []
+    for params, memory, agent_seed in zip(agent_params, memories, agent_seeds):
+        agent = _CountingAgent(*params, seed=agent_seed)
+        agent.memory = memory.copy()
+        agents.append(agent)
+
+    if batch_size:
+        trainer = BatchTrainer(agents[0], agents[1], episodes=episodes, batch_size=batch_size,
+                               seed=agent_seeds[2])
+    else:
+        trainer = Trainer(make_engine(), agents[0], agents[1], episodes=episodes,
+                          seed=agent_seeds[2])
+
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    stats = trainer.run()
+    stats["episodes"] = episodes
+    stats["seconds"] = time.perf_counter() - start
+    stats["cpu_seconds"] = time.process_time() - cpu_start
+    return stats, [(agent.memory, agent.visits) for agent in agents]
+
+
+class ParallelTrainer:
+    """Self-play training split across a pool of worker processes.
+
+    Each worker trains its own copy of both agents on a share of the episode
+    budget (sequentially, or in lockstep when *batch_size* is set). When all
+    workers finish, their value tables are merged with
+    :func:`merge_memories` into ``agent1.memory`` and ``agent2.memory``.
+    Worker *n* is seeded with the *n*-th child of *seed*, and tables are
+    merged in worker order, so a seeded run is reproducible.
+    """
+
+    def __init__(self, agent1, agent2, episodes=TRAINING_EPISODES, workers=TRAINING_WORKERS,
+                 batch_size=None, seed=TRAINING_SEED):
+        self.agent1 = agent1
+        self.agent2 = agent2
+        self.episodes = episodes
+        self.workers = workers
+        self.batch_size = batch_size
+        self.seed = seed
+
+    def run(self, progress_callback=None):
+        """Train and merge. Returns aggregate stats plus per-worker stats,
+        wall-clock seconds and parallelism (summed worker CPU time / wall time,
+        how many workers were busy on average; not a speedup over one worker)."""
+        shares = [self.episodes // self.workers] * self.workers
+        for n in range(self.episodes % self.workers):
+            shares[n] += 1
+        agent_params = [
+            (a.symbol, a.learning_rate, a.epsilon, a.canonical, a.store)
+            for a in (self.agent1, self.agent2)
+        ]
+        memories = [self.agent1.memory, self.agent2.memory]
+        seeds = spawn(self.seed, self.workers)
+
+        start = time.perf_counter()
+        worker_stats = [None] * self.workers
+        tables = [None] * self.workers
+        done = 0
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = {
+                pool.submit(_train_worker, share, self.batch_size, agent_params, memories,
+                            seeds[n]): n
+                for n, share in enumerate(shares) if share
+            }
+            for future in as_completed(futures):
+                n = futures[future]
+                worker_stats[n], tables[n] = future.result()
+                stats = worker_stats[n]
+                done += stats["episodes"]
+                if progress_callback:
+                    progress_callback(done, self.episodes)
+        wall_time = time.perf_counter() - start
+
+        tables = [t for t in tables if t is not None]
+        for agent, merged in zip((self.agent1, self.agent2), zip(*tables)):
+            agent.memory = agent.new_memory()
+            agent.memory.update(merge_memories(merged))
+
+        worker_stats = [s for s in worker_stats if s is not None]
+        aggregate = {
+            key: sum(s[key] for s in worker_stats) for key in ("p1_wins", "p2_wins", "ties")
+        }
+        aggregate["workers"] = worker_stats
+        aggregate["seconds"] = wall_time
+        aggregate["parallelism"] = sum(s["cpu_seconds"] for s in worker_stats) / wall_time
+        return aggregate
@@ -0,0 +1,104 @@
+import atexit
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from game.config import (
+    MCTS_EXPLORATION, MCTS_ITERATIONS, MCTS_TIME_BUDGET, MCTS_WORKERS, WIN_LENGTH,
+)
+from game.mcts import MCTSAgent
+
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def get_pool(workers=MCTS_WORKERS):
+    """Return the process-wide search pool, starting it on first use.
+
+    The pool stays up for the life of the process so requests do not pay
+    for spawning workers; asking for more workers replaces it.
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers < workers:
+            shutdown_pool()
+            _pool = ProcessPoolExecutor(max_workers=workers)
+            _pool_workers = workers
+            # Start every worker now rather than on the first move.
+            for future in [_pool.submit(_ping) for _ in range(workers)]:
+                future.result()
+        return _pool
+
+
+def shutdown_pool():
+    global _pool, _pool_workers
+    if _pool is not None:
+        _pool.shutdown(wait=True)
+    _pool = None
+    _pool_workers = 0
+
+
+atexit.register(shutdown_pool)
+
+
+def _ping():
+    return True
+
+
+def _root_search(state, symbol, iterations, time_budget, win_length, exploration, seed):
+    random.seed(seed)
+    agent = MCTSAgent(symbol, iterations=iterations, time_budget=time_budget,
+                      win_length=win_length, exploration=exploration)
+    start = time.perf_counter()
+    visits = agent.root_visits(state)
+    return visits, agent.playouts, time.perf_counter() - start
+
+
+class ParallelMCTSAgent:
+    """Root-parallel MCTS: independent trees in worker processes.
+
+    Every worker searches the same position with its own random seed and
+    the given per-worker budget; the root visit counts are summed and the
+    most visited move is played. Workers come from the warm pool returned
+    by :func:`get_pool`. After each move, ``playouts`` holds the total
+    playouts and ``merge_seconds`` the time spent beyond the slowest
+    worker's search (dispatch, transfer and merge).
+    """
+
+    def __init__(self, symbol, workers=MCTS_WORKERS, iterations=MCTS_ITERATIONS,
+                 time_budget=MCTS_TIME_BUDGET, win_length=WIN_LENGTH,
+                 exploration=MCTS_EXPLORATION):
+        self.symbol = symbol
+        self.workers = workers
+        self.iterations = iterations
+        self.time_budget = time_budget
+        self.win_length = win_length
+        self.exploration = exploration
+        self.playouts = 0
+        self.merge_seconds = 0.0
+
+    def reset(self):
+        pass
+
+    def choose_action(self, state, greedy=True):
+        pool = get_pool(self.workers)
+        start = time.perf_counter()
+        futures = [
+            pool.submit(_root_search, state, self.symbol, self.iterations, self.time_budget,
+                        self.win_length, self.exploration, random.randrange(2 ** 32))
+            for _ in range(self.workers)
+        ]
+        visits = Counter()
+        self.playouts = 0
+        slowest = 0.0
+        for future in futures:
+            worker_visits, playouts, seconds = future.result()
+            visits.update(worker_visits)
+            self.playouts += playouts
+            slowest = max(slowest, seconds)
+        (row, col), _ = visits.most_common(1)[0]
+        self.merge_seconds = time.perf_counter() - start - slowest
+        return row, col, self.symbol
@@ -0,0 +1,106 @@
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from game.encoding import CELLS, N_STATES, encode
+from game.solver import SolverAgent, reachable_positions
+
+MAGIC = b"TTTP"
+VERSION = 1
+NO_MOVE = 255
+
+# magic, version, symbol, has_values, n_states
+_HEADER = struct.Struct("<4sHbBI")
+_VALUES_OFFSET = (_HEADER.size + N_STATES + 3) // 4 * 4
+
+
+def _agent_policy(agent):
+    """Greedy move and value per reachable position where *agent* is to move.
+
+    Reads ``agent.memory`` without adding entries; unseen afterstates count
+    as 0.5 and ties go to the lowest cell.
+    """
+    moves = np.full(N_STATES, NO_MOVE, dtype=np.uint8)
+    values = np.zeros(N_STATES, dtype=np.float32)
+    for board, index, player in reachable_positions():
+        if player != agent.symbol:
+            continue
+        empty = [cell for cell in range(CELLS) if board[cell] == 0]
+        afterstates = np.repeat([board], len(empty), axis=0).astype(float)
+        afterstates[np.arange(len(empty)), empty] = agent.symbol
+        scores = [agent.memory.get(k, 0.5) for k in agent.state_keys(afterstates)]
+        best = int(np.argmax(scores))
+        moves[index] = empty[best]
+        values[index] = scores[best]
+    return moves, values
+
+
+def _solver_policy(solver):
+    moves = np.full(N_STATES, NO_MOVE, dtype=np.uint8)
+    values = np.zeros(N_STATES, dtype=np.float32)
+    for index, best in solver.best_moves.items():
+        moves[index] = best[0]
+        values[index] = solver.values[index]
+    return moves, values
+
+
+def export_policy(source, file_name, with_values=True):
+    """Write the greedy policy of an :class:`Agent` or :class:`SolverAgent`.
+
+    The file is a fixed header, one byte per base-3 board index holding the
+    best cell (255 where there is no move) and, optionally, a float32 value
+    per index. Solver policies cover both players; agent policies cover the
+    positions where the agent is to move. The file is written next to
+    *file_name* and renamed into place, so existing mappings stay valid.
+    """
+    if isinstance(source, SolverAgent):
+        moves, values = _solver_policy(source.solver)
+    else:
+        moves, values = _agent_policy(source)
+
+    tmp_name = f"{file_name}.tmp"
+    with open(tmp_name, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, source.symbol, with_values, N_STATES))
+        f.write(moves.tobytes())
+        if with_values:
+            f.write(b"\0" * (_VALUES_OFFSET - _HEADER.size - N_STATES))
+            f.write(values.tobytes())
+    os.replace(tmp_name, file_name)
+
+
+class PolicyTable:
+    """Memory-mapped policy file answering ``choose_action`` with no deserialization.
+
+    Every process mapping the same file shares one page-cache copy, and a
+    move is a single byte read at the board's base-3 index.
+    """
+
+    def __init__(self, file_name):
+        with open(file_name, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, symbol, has_values, n_states = _HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION or n_states != N_STATES:
+            self._map.close()
+            raise ValueError(f"{file_name!r} is not a version {VERSION} policy file")
+        self.symbol = symbol
+        self.has_values = bool(has_values)
+
+    def reset(self):
+        pass
+
+    def choose_action(self, state, greedy=True):
+        cell = self._map[_HEADER.size + encode(state)]
+        if cell == NO_MOVE:
+            raise KeyError("Position is not covered by this policy")
+        return cell // 3, cell % 3, self.symbol
+
+    def value(self, state):
+        """Stored value of the best move from *state*."""
+        if not self.has_values:
+            raise ValueError("Policy file was exported without values")
+        return struct.unpack_from("<f", self._map, _VALUES_OFFSET + 4 * encode(state))[0]
+
+    def close(self):
+        self._map.close()
@@ -0,0 +1,44 @@
+import numpy as np
+
+BLOCK = 4096
+
+
+def spawn(seed, n):
+    """*n* independent child seeds of *seed* (an int, a SeedSequence or None for fresh entropy)."""
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return seed.spawn(n)
+
+
+class RandomStream:
+    """Scalar random draws served from blocks of a ``numpy.random.Generator``.
+
+    A ``Generator`` call costs about a microsecond, far more than the
+    per-move work it feeds, so uniforms are drawn *block* at a time and
+    handed out one by one. The same seed always gives the same sequence.
+    """
+
+    def __init__(self, seed=None, block=BLOCK):
+        self.generator = np.random.default_rng(seed)
+        self.block = block
+        self._buffer = []
+
+    def random(self):
+        """Uniform float in [0, 1)."""
+        if not self._buffer:
+            self._buffer = self.generator.random(self.block).tolist()
+            self._buffer.reverse()
+        return self._buffer.pop()
+
+    def randrange(self, n):
+        """Uniform int in [0, n)."""
+        return int(self.random() * n)
+
+    def choice(self, seq):
+        return seq[int(self.random() * len(seq))]
+
+    def shuffle(self, items):
+        """Shuffle a list in place (Fisher-Yates)."""
+        for i in range(len(items) - 1, 0, -1):
+            j = int(self.random() * (i + 1))
+            items[i], items[j] = items[j], items[i]
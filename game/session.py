@@ -1,45 +1,190 @@
+"""Game sessions for every frontend.
+
+Only the engine, the model cache and the journal are imported up front.
+NumPy, the agents, the solver and the trainers are imported by the
+methods that need them, so a human-human game or a server worker that
+has not served an AI move yet never loads them; :func:`preload` loads
+them ahead of time.
+"""
+import copy
+import functools
 import os
 
-from game.engine import GameEngine
-from game.agent import Agent
-from game.trainer import Trainer
-from game.config import MODEL_DIR
+from game.engine import make_engine
+from game.model_cache import model_cache
+from game.journal import OUTCOMES, default_journal, read_header
+from game.config import (
+    AI_OPPONENT, BOARD_COLS, BOARD_ROWS, CONVERGENCE_OPPONENT, MAX_EVALUATE_POSITIONS,
+    MCTS_WORKERS, MODEL_DIR, TRAINING_EPISODES, TRAINING_SEED, TRAINING_WORKERS, WIN_LENGTH,
+)
+
+CLASSIC = (3, 3, 3)
+
+
+def model_path(file_name, rows=BOARD_ROWS, cols=BOARD_COLS, win_length=WIN_LENGTH,
+               model_dir=None):
+    """Path of a model file in *model_dir* (default MODEL_DIR) for the given board.
+
+    3x3 models keep their plain names (``p2.dat``); other boards get the
+    size appended (``p2_15x15k5.dat``).
+    """
+    if (rows, cols, win_length) != CLASSIC:
+        stem, ext = os.path.splitext(file_name)
+        file_name = f"{stem}_{rows}x{cols}k{win_length}{ext}"
+    return os.path.join(model_dir or MODEL_DIR, file_name)
+
+
+def _load_agent(path, symbol=-1):
+    from game.agent import Agent
+
+    agent = Agent(symbol)
+    agent.load(path)
+    return agent
+
+
+@functools.lru_cache(maxsize=None)
+def _solver_tables():
+    """Perfect-play move and score per base-3 index, as dense arrays."""
+    from game.policy import _solver_policy
+    from game.solver import solved
+
+    return _solver_policy(solved())
+
+
+def _position_indices(boards, codes):
+    """Validated base-3 indices from a list of 3x3 boards or of state codes."""
+    import numpy as np
+
+    from game.encoding import CELLS, N_STATES, POWERS
+
+    if (boards is None) == (codes is None):
+        raise ValueError("Pass either boards or codes")
+    if boards is not None:
+        try:
+            boards = np.asarray(boards, dtype=float)
+        except (TypeError, ValueError):
+            raise ValueError("boards must be a list of 3x3 boards") from None
+        if boards.ndim not in (2, 3) or boards.size != len(boards) * CELLS:
+            raise ValueError("boards must be a list of 3x3 boards")
+        boards = boards.reshape(-1, CELLS)
+        if not np.isin(boards, (-1, 0, 1)).all():
+            raise ValueError("Board cells must be -1, 0 or 1")
+        return (boards @ POWERS).astype(np.int64) + (N_STATES - 1) // 2
+    if not isinstance(codes, list) or not all(
+            isinstance(c, int) and not isinstance(c, bool) and 0 <= c < N_STATES for c in codes):
+        raise ValueError(f"codes must be a list of integers from 0 to {N_STATES - 1}")
+    return np.array(codes, dtype=np.int64)
+
+
+def _mcts_agent(size):
+    from game.mcts import MCTSAgent
+    from game.parallel_mcts import ParallelMCTSAgent
+
+    if MCTS_WORKERS > 1:
+        return ParallelMCTSAgent(-1, workers=MCTS_WORKERS, win_length=size[2])
+    return MCTSAgent(-1, win_length=size[2])
+
+
+def preload(rows=BOARD_ROWS, cols=BOARD_COLS, win_length=WIN_LENGTH):
+    """Import the AI modules and load the AI model into the model cache.
+
+    Call it before a server forks its workers (or set PRELOAD_MODELS) so
+    the workers share the loaded modules and tables instead of each paying
+    for them on its first AI request.
+    """
+    import numpy  # noqa: F401  (the engines' ``state`` and every agent need it)
+
+    from game import agent, trainer  # noqa: F401
+
+    GameSession._load_ai((rows, cols, win_length))
 
 
 class GameSession:
     """Frontend-agnostic game orchestration.
 
-    Any UI (CLI, web, desktop) drives a game through this class.
+    Any UI (CLI, web, desktop) drives a game through this class. The board
+    is *rows* x *cols* with *win_length* in a row to win; the trained-policy
+    and perfect-play opponents are only available on 3x3, larger boards
+    fall back to tree search.
+
+    Finished games on the *journal*'s board (by default the JOURNAL_FILE
+    journal, if set) are appended to it for later re-training.
     """
 
     MODES = ("human-ai", "human-human")
 
-    def __init__(self):
-        self._engine = GameEngine()
+    __slots__ = ("_engine", "_mode", "_current_player", "_ai", "_cells", "journal")
+
+    def __init__(self, rows=BOARD_ROWS, cols=BOARD_COLS, win_length=WIN_LENGTH, journal=None):
+        self._engine = make_engine(rows=rows, cols=cols, win_length=win_length)
         self._mode = None
         self._current_player = 1
         self._ai = None
+        self._cells = []
+        self.journal = journal if journal is not None else default_journal()
 
-    def new_game(self, mode):
-        """Start a new game. *mode* must be "human-ai" or "human-human"."""
+    @property
+    def board_size(self):
+        """(rows, cols, win_length) of the current board."""
+        return self._engine.rows, self._engine.cols, self._engine.win_length
+
+    def new_game(self, mode, rows=None, cols=None, win_length=None):
+        """Start a new game. *mode* must be "human-ai" or "human-human".
+
+        Passing *rows*, *cols* or *win_length* switches to that board size.
+        """
         if mode not in self.MODES:
             raise ValueError(f"Invalid mode {mode!r}. Choose from {self.MODES}")
+        size = tuple(new if new is not None else old
+                     for new, old in zip((rows, cols, win_length), self.board_size))
+        if size != self.board_size:
+            self._engine = make_engine(rows=size[0], cols=size[1], win_length=size[2])
         self._mode = mode
         self._current_player = 1
+        self._cells = []
         self._engine.reset()
 
         if mode == "human-ai":
-            p2_path = os.path.join(MODEL_DIR, "p2.dat")
-            if os.path.exists(p2_path):
-                self._ai = Agent(-1)
-                self._ai.load(p2_path)
-            else:
-                self._ai = None
+            self._ai = self._load_ai(size)
         else:
             self._ai = None
 
         return self.get_state()
 
+    @staticmethod
+    def _load_ai(size):
+        """Player 2 for a new human-ai game.
+
+        AI_OPPONENT "model" uses the trained policy or value table if
+        present, "mcts" always searches with :class:`MCTSAgent`. Without a
+        model, 3x3 games get perfect play and other boards MCTS.
+        """
+        from game.policy import PolicyTable
+        from game.solver import SolverAgent
+
+        ai = None
+        if AI_OPPONENT == "mcts":
+            return _mcts_agent(size)
+        if AI_OPPONENT == "model":
+            if size == CLASSIC:
+                ai = model_cache.get(model_path("p2.policy"), PolicyTable)
+            if ai is None:
+                agent = model_cache.get(model_path("p2.dat", *size), _load_agent)
+                if agent is not None:
+                    # Shares the cached value table, which greedy play only
+                    # reads; moves and random draws stay per game.
+                    from game.rng import RandomStream
+
+                    ai = copy.copy(agent)
+                    ai.rng = RandomStream(block=64)
+                    ai.reset()
+        if ai is None and size == CLASSIC:
+            # No trained model (or solver requested): play perfectly.
+            ai = SolverAgent(-1)
+        elif ai is None:
+            ai = _mcts_agent(size)
+        return ai
+
     def make_move(self, row, col):
         """Process a human move and, in human-ai mode, auto-play the AI response.
 
@@ -51,9 +196,13 @@ class GameSession:
         if self._engine.done:
             return {**self.get_state(), "error": "Game is already over."}
 
+        if not (0 <= row < self._engine.rows and 0 <= col < self._engine.cols):
+            return {**self.get_state(), "error": "Move is off the board."}
+
         if not self._engine.make_move(row, col, self._current_player):
             return {**self.get_state(), "error": "Cell already occupied."}
 
+        self._cells.append(row * self._engine.cols + col)
         self._current_player *= -1
         state = self.get_state()
 
@@ -61,16 +210,19 @@ class GameSession:
         if self._mode == "human-ai" and self._ai and not self._engine.done:
             i, j, symbol = self._ai.choose_action(self._engine.state, greedy=True)
             self._engine.make_move(i, j, symbol)
+            self._cells.append(i * self._engine.cols + j)
             self._current_player *= -1
             state = self.get_state()
             state["ai_move"] = [i, j]
 
+        if self._engine.done and self.journal is not None and self.journal.board == self.board_size:
+            self.journal.record(self._cells, OUTCOMES[self._engine.winner])
         return state
 
     def get_state(self):
         """Return the current game state as a JSON-serializable dict."""
         return {
-            "board": self._engine.state.tolist(),
+            "board": self._engine.board(),
             "current_player": self._current_player,
             "done": self._engine.done,
             "winner": self._engine.winner,
@@ -78,19 +230,150 @@ class GameSession:
         }
 
     @staticmethod
-    def train(progress_callback=None):
-        """Run self-play training and save models. Returns stats dict."""
-        engine = GameEngine()
-        agent1 = Agent(1)
-        agent2 = Agent(-1)
-        trainer = Trainer(engine, agent1, agent2)
-        stats = trainer.run(progress_callback)
-        os.makedirs(MODEL_DIR, exist_ok=True)
-        agent1.save(os.path.join(MODEL_DIR, "p1.dat"))
-        agent2.save(os.path.join(MODEL_DIR, "p2.dat"))
+    def evaluate_positions(boards=None, codes=None):
+        """AI move and value estimate for a batch of 3x3 positions.
+
+        Positions are given as *boards* (3x3 or flat lists of 1, -1 and 0)
+        or as *codes*, the base-3 board index used by the policy files. The
+        side to move follows from the piece counts. Each side is answered by
+        its trained value table (``p1.dat``/``p2.dat``) in one vectorized
+        pass, or by the solver when no model exists, whose values are exact
+        scores rather than win estimates. Finished games get no move.
+        """
+        import numpy as np
+
+        from game.encoding import POWERS
+        from game.evaluate import ONGOING, _tables
+        from game.policy import NO_MOVE
+
+        indices = _position_indices(boards, codes)
+        if len(indices) > MAX_EVALUATE_POSITIONS:
+            raise ValueError(f"At most {MAX_EVALUATE_POSITIONS} positions per batch")
+        digits = (indices[:, None] // POWERS) % 3 - 1
+        balance = digits.sum(axis=1)
+        if not np.isin(balance, (0, 1)).all():
+            raise ValueError("Player 1 moves first: piece counts must be equal or one ahead")
+        player = np.where(balance == 0, 1, -1)
+        ongoing = _tables()[1][indices] == ONGOING
+
+        cells = np.full(len(indices), -1, dtype=np.int64)
+        values = np.full(len(indices), np.nan)
+        sources = {}
+        for symbol, file_name in ((1, "p1.dat"), (-1, "p2.dat")):
+            rows = np.flatnonzero(ongoing & (player == symbol))
+            agent = model_cache.get(model_path(file_name),
+                                    functools.partial(_load_agent, symbol=symbol))
+            if agent is not None:
+                cells[rows], values[rows] = agent.evaluate_many(digits[rows])
+                sources[str(symbol)] = "model"
+            else:
+                moves, scores = _solver_tables()
+                cells[rows] = moves[indices[rows]]
+                values[rows] = scores[indices[rows]]
+                sources[str(symbol)] = "solver"
+        cells[cells == NO_MOVE] = -1
+
+        return {
+            "positions": len(indices),
+            "player": player.tolist(),
+            "moves": [[cell // 3, cell % 3] if cell >= 0 else None for cell in cells.tolist()],
+            "values": [None if v != v else v for v in values.tolist()],
+            "source": sources,
+        }
+
+    @staticmethod
+    def train(progress_callback=None, batch_size=None, workers=TRAINING_WORKERS,
+              rows=BOARD_ROWS, cols=BOARD_COLS, win_length=WIN_LENGTH,
+              episodes=TRAINING_EPISODES, model_dir=None, checkpoint_every=None,
+              seed=TRAINING_SEED, early_stop=False):
+        """Run self-play training and save models. Returns stats dict.
+
+        With *batch_size* set, games are played in lockstep by
+        :class:`BatchTrainer` instead of one at a time. With more than one
+        worker, the episodes are split across processes by
+        :class:`ParallelTrainer` and the value tables merged at the end.
+        Boards other than 3x3 always train sequentially. Models are written
+        to *model_dir* (default MODEL_DIR); sequential runs can checkpoint
+        into its ``checkpoints`` directory every *checkpoint_every* episodes.
+        The same *seed* and settings reproduce bit-identical model files.
+        With *early_stop*, sequential runs stop once a
+        :class:`ConvergenceMonitor` reports convergence; the stats then
+        include the episodes played and the learning curve.
+        """
+        from game.agent import Agent
+        from game.batch_trainer import BatchTrainer
+        from game.convergence import ConvergenceMonitor
+        from game.parallel import ParallelTrainer
+        from game.policy import export_policy
+        from game.rng import spawn
+        from game.trainer import Trainer
+
+        size = (rows, cols, win_length)
+        seeds = spawn(seed, 3)
+        agent1 = Agent(1, seed=seeds[0])
+        agent2 = Agent(-1, seed=seeds[1])
+        model_dir = model_dir or MODEL_DIR
+        if size != CLASSIC or not (workers > 1 or batch_size):
+            trainer = Trainer(make_engine(rows=rows, cols=cols, win_length=win_length),
+                              agent1, agent2, episodes=episodes,
+                              checkpoint_every=checkpoint_every,
+                              checkpoint_dir=os.path.join(model_dir, "checkpoints"),
+                              seed=seeds[2])
+        elif workers > 1:
+            trainer = ParallelTrainer(agent1, agent2, episodes=episodes, workers=workers,
+                                      batch_size=batch_size, seed=seeds[2])
+        else:
+            trainer = BatchTrainer(agent1, agent2, episodes=episodes, batch_size=batch_size,
+                                   seed=seeds[2])
+        if early_stop:
+            if not isinstance(trainer, Trainer):
+                raise ValueError("Early stopping needs sequential training")
+            opponent = CONVERGENCE_OPPONENT if size == CLASSIC else None
+            monitor = ConvergenceMonitor(opponent=opponent, seed=seed)
+            stats = trainer.run(progress_callback, monitor=monitor)
+            episodes = stats["episodes"]
+        else:
+            stats = trainer.run(progress_callback)
+        os.makedirs(model_dir, exist_ok=True)
+        agent1.save(model_path("p1.dat", *size, model_dir), episodes=episodes, board=size)
+        agent2.save(model_path("p2.dat", *size, model_dir), episodes=episodes, board=size)
+        if size == CLASSIC:
+            export_policy(agent2, model_path("p2.policy", model_dir=model_dir))
+        model_cache.invalidate()
+        return stats
+
+    @staticmethod
+    def retrain(journal_files, model_dir=None, learning_rate=None):
+        """Update the saved models with the games recorded in *journal_files*.
+
+        Starts from the models in *model_dir* (default MODEL_DIR), or empty
+        tables if there are none, replays the journals with
+        :meth:`Trainer.retrain` and saves the result in place. Returns the
+        game counts.
+        """
+        from game.agent import Agent
+        from game.policy import export_policy
+        from game.trainer import Trainer
+
+        if not journal_files:
+            raise ValueError("No journal files given")
+        size = read_header(journal_files[0])
+        model_dir = model_dir or MODEL_DIR
+        agents = []
+        for symbol, file_name in ((1, "p1.dat"), (-1, "p2.dat")):
+            path = model_path(file_name, *size, model_dir)
+            agents.append(_load_agent(path, symbol) if os.path.exists(path) else Agent(symbol))
+        engine = make_engine(rows=size[0], cols=size[1], win_length=size[2])
+        stats = Trainer(engine, *agents).retrain(journal_files, learning_rate)
+        os.makedirs(model_dir, exist_ok=True)
+        agents[0].save(model_path("p1.dat", *size, model_dir), board=size)
+        agents[1].save(model_path("p2.dat", *size, model_dir), board=size)
+        if size == CLASSIC:
+            export_policy(agents[1], model_path("p2.policy", model_dir=model_dir))
+        model_cache.invalidate()
         return stats
 
     @staticmethod
-    def model_exists():
+    def model_exists(rows=BOARD_ROWS, cols=BOARD_COLS, win_length=WIN_LENGTH):
         """Check whether a trained model is available."""
-        return os.path.exists(os.path.join(MODEL_DIR, "p2.dat"))
+        return os.path.exists(model_path("p2.dat", rows, cols, win_length))
@@ -0,0 +1,151 @@
+import functools
+import random
+
+from game.encoding import OFFSET, POWERS, encode
+
+_POWERS = POWERS.tolist()
+_LINES = (
+    (0, 1, 2), (3, 4, 5), (6, 7, 8),
+    (0, 3, 6), (1, 4, 7), (2, 5, 8),
+    (0, 4, 8), (2, 4, 6),
+)
+_CELL_LINES = tuple(tuple(line for line in _LINES if cell in line) for cell in range(9))
+
+# Transposition-table bound flags
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+def _wins(board, cell, player):
+    return any(all(board[c] == player for c in line) for line in _CELL_LINES[cell])
+
+
+def reachable_positions():
+    """Yield (board, index, player to move) for every reachable non-terminal position.
+
+    *board* is a list of 9 cell values (1, -1 or 0) and *index* its base-3 index.
+    """
+    seen = set()
+    stack = [([0] * 9, OFFSET, 1)]
+    while stack:
+        board, index, player = stack.pop()
+        if index in seen:
+            continue
+        seen.add(index)
+        yield board, index, player
+        for cell in range(9):
+            if board[cell] == 0:
+                child = board.copy()
+                child[cell] = player
+                if not _wins(child, cell, player) and 0 in child:
+                    stack.append((child, index + player * _POWERS[cell], -player))
+
+
+class Solver:
+    """Exact game-theoretic values for every reachable position.
+
+    Negamax with alpha-beta pruning over boards encoded as base-3 indices,
+    with a transposition table storing each score and its bound type. A win
+    scores ``1 + empty cells left`` so quicker wins are preferred; a draw
+    scores 0. Scores are from the point of view of the player to move.
+    """
+
+    def __init__(self):
+        self.table = {}
+        self.values = {}
+        self.best_moves = {}
+
+    def solve(self):
+        """Solve every reachable non-terminal position. Returns self."""
+        for board, index, player in reachable_positions():
+            self.values[index] = self._negamax(board, index, player, -10, 10)
+
+        # Optimal moves follow from the exact values of the children.
+        for board, index, player in reachable_positions():
+            scores = {}
+            for cell in range(9):
+                if board[cell] == 0:
+                    child = index + player * _POWERS[cell]
+                    board[cell] = player
+                    if _wins(board, cell, player):
+                        scores[cell] = 1 + board.count(0)
+                    elif 0 not in board:
+                        scores[cell] = 0
+                    else:
+                        scores[cell] = -self.values[child]
+                    board[cell] = 0
+            best = max(scores.values())
+            self.best_moves[index] = tuple(c for c, s in scores.items() if s == best)
+        return self
+
+    def _negamax(self, board, index, player, alpha, beta):
+        entry = self.table.get(index)
+        if entry is not None:
+            value, flag = entry
+            if flag == EXACT:
+                return value
+            if flag == LOWER:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                return value
+
+        orig_alpha = alpha
+        best = -10
+        for cell in range(9):
+            if board[cell]:
+                continue
+            board[cell] = player
+            if _wins(board, cell, player):
+                score = 1 + board.count(0)
+            elif 0 not in board:
+                score = 0
+            else:
+                score = -self._negamax(board, index + player * _POWERS[cell], -player,
+                                       -beta, -alpha)
+            board[cell] = 0
+            if score > best:
+                best = score
+            if best > alpha:
+                alpha = best
+            if alpha >= beta:
+                break
+
+        if best <= orig_alpha:
+            flag = UPPER
+        elif best >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table[index] = (best, flag)
+        return best
+
+
+@functools.lru_cache(maxsize=None)
+def solved():
+    """Return the process-wide :class:`Solver`, solving it on first use."""
+    return Solver().solve()
+
+
+class SolverAgent:
+    """Perfect player with the same ``choose_action`` interface as :class:`Agent`.
+
+    Moves are lookups into the shared solved table. Greedy play takes the
+    first optimal move; otherwise a random optimal move is chosen.
+    """
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+        self.solver = solved()
+
+    def reset(self):
+        pass
+
+    def choose_action(self, state, greedy=False):
+        moves = self.solver.best_moves[encode(state)]
+        cell = moves[0] if greedy else random.choice(moves)
+        return cell // 3, cell % 3, self.symbol
+
+    def value(self, state):
+        """Exact score of *state* for the player to move."""
+        return self.solver.values[encode(state)]
@@ -0,0 +1,88 @@
+from array import array
+
+import numpy as np
+
+from game.encoding import N_STATES
+
+
+class ArrayStore:
+    """Value table backed by a preallocated ``array('d')``.
+
+    Keys are base-3 board indices (0..3^9-1) and every entry starts at 0.5.
+    A byte mask tracks which states have been looked up or written, so
+    ``len``, ``in`` and iteration behave like the dict store they replace.
+    Both buffers are also exposed as zero-copy NumPy views for batch access.
+    """
+
+    def __init__(self, size=N_STATES, initial=0.5):
+        self.values = array("d", [initial]) * size
+        self.seen = bytearray(size)
+        self._views()
+
+    def _views(self):
+        self.values_view = np.frombuffer(self.values, dtype=float)
+        self.seen_view = np.frombuffer(self.seen, dtype=bool)
+
+    def __getstate__(self):
+        return {"values": self.values, "seen": self.seen}
+
+    def __setstate__(self, state):
+        self.values = state["values"]
+        self.seen = state["seen"]
+        self._views()
+
+    def __getitem__(self, key):
+        return self.values[key]
+
+    def __setitem__(self, key, value):
+        self.values[key] = value
+        self.seen[key] = 1
+
+    def __contains__(self, key):
+        return bool(self.seen[key])
+
+    def __len__(self):
+        return int(self.seen_view.sum())
+
+    def __iter__(self):
+        return iter(np.flatnonzero(self.seen_view).tolist())
+
+    def __eq__(self, other):
+        if not isinstance(other, ArrayStore):
+            return NotImplemented
+        return self.seen == other.seen and np.array_equal(
+            self.values_view[self.seen_view], other.values_view[other.seen_view]
+        )
+
+    def get(self, key, default=None):
+        return self.values[key] if self.seen[key] else default
+
+    def setdefault(self, key, default=0.5):
+        if not self.seen[key]:
+            self[key] = default
+        return self.values[key]
+
+    def lookup(self, keys):
+        """Mark *keys* as seen and return their values as an array."""
+        self.seen_view[keys] = True
+        return self.values_view[keys]
+
+    def keys(self):
+        return list(self)
+
+    def items(self):
+        keys = np.flatnonzero(self.seen_view)
+        return zip(keys.tolist(), self.values_view[keys].tolist())
+
+    def update(self, mapping):
+        for key, value in mapping.items():
+            self[key] = value
+
+    def copy(self):
+        other = ArrayStore.__new__(ArrayStore)
+        other.__setstate__({"values": array("d", self.values), "seen": bytearray(self.seen)})
+        return other
+
+    @property
+    def nbytes(self):
+        return self.values.itemsize * len(self.values) + len(self.seen)
@@ -0,0 +1,42 @@
+import numpy as np
+
+from game.encoding import CELLS, N_STATES, OFFSET, POWERS, encode, encode_many
+
+
+def _permutations():
+    grid = np.arange(CELLS).reshape(3, 3)
+    transforms = []
+    for k in range(4):
+        rotated = np.rot90(grid, k)
+        transforms.append(rotated.ravel())
+        transforms.append(np.fliplr(rotated).ravel())
+    return np.array(transforms)
+
+
+# The 8 rotations and reflections of the board (the D4 group) as cell
+# permutations: transformed.ravel()[i] == state.ravel()[PERMUTATIONS[k, i]].
+PERMUTATIONS = _permutations()
+
+# SYMMETRY_WEIGHTS[k] @ state.ravel() is the code of the k-th transform.
+SYMMETRY_WEIGHTS = np.zeros((len(PERMUTATIONS), CELLS), dtype=np.int64)
+for _k, _perm in enumerate(PERMUTATIONS):
+    SYMMETRY_WEIGHTS[_k, _perm] = POWERS
+
+
+def _canonical_table():
+    digits = (np.arange(N_STATES)[:, None] // POWERS) % 3 - 1
+    return ((digits @ SYMMETRY_WEIGHTS.T).min(axis=1) + OFFSET).astype(np.int64)
+
+
+# CANONICAL[index] is the smallest index among the 8 symmetric variants.
+CANONICAL = _canonical_table()
+
+
+def canonical(state):
+    """Return the canonical base-3 index of a board's symmetry class."""
+    return int(CANONICAL[encode(state)])
+
+
+def canonical_many(boards):
+    """Return canonical indices for an (N, 9) stack of boards."""
+    return CANONICAL[encode_many(boards)]
@@ -1,6 +1,29 @@
-import random
+import copy
+import os
+import threading
 
-from game.config import TRAINING_EPISODES
+import numpy as np
+
+from game.checkpoint import load_checkpoint, save_checkpoint
+from game.config import CHECKPOINT_EVERY, TRAINING_EPISODES, TRAINING_SEED
+from game.journal import OUTCOMES, iter_journal, read_header
+from game.rng import RandomStream
+
+CHECKPOINT_FILES = ("p1.ckpt", "p2.ckpt")
+
+
+def schedule(generator, start, stop, episodes):
+    """Exploration schedule for episodes *start* to *stop* of *episodes*, drawn in bulk.
+
+    Returns arrays of epsilon, learning-rate scale and whether Player 1
+    plays randomly: exploration and random openings fade as training
+    progresses.
+    """
+    progress = np.arange(start, stop) / episodes
+    epsilon = 0.1 + 0.8 * progress
+    lr_scale = 1 - 0.9 * progress
+    use_random_p1 = generator.random(len(progress)) < (1 - progress) * 0.5
+    return epsilon, lr_scale, use_random_p1
 
 
 class Trainer:
@@ -9,71 +32,225 @@ class Trainer:
     Uses a training schedule: early episodes favour exploration and random
     opponents so the agents discover all board positions; later episodes
     shift to exploitation and self-play to refine values.
+
+    With *checkpoint_dir* set, both agents are checkpointed there every
+    *checkpoint_every* episodes. Each checkpoint is a snapshot of the value
+    tables written by a background thread while training carries on;
+    :meth:`resume` continues a run from the last one.
+
+    The trainer's own draws (schedule and random openings) come from
+    ``rng``, seeded with *seed*; the agents draw from their own streams.
+
+    :meth:`retrain` updates existing tables from recorded games instead of
+    self-play.
     """
 
-    def __init__(self, engine, agent1, agent2, episodes=TRAINING_EPISODES):
+    def __init__(self, engine, agent1, agent2, episodes=TRAINING_EPISODES,
+                 checkpoint_every=CHECKPOINT_EVERY, checkpoint_dir=None, seed=TRAINING_SEED):
         self.engine = engine
         self.agent1 = agent1
         self.agent2 = agent2
         self.episodes = episodes
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_dir = checkpoint_dir
+        self.start_episode = 0
+        self.td_delta = 0.0
+        self.rng = RandomStream(seed)
+        self._writer = None
+
+    def resume(self, checkpoint_dir=None):
+        """Load both agents from *checkpoint_dir* and continue from its episode count.
+
+        Returns the episode the next :meth:`run` starts from.
+        """
+        checkpoint_dir = checkpoint_dir or self.checkpoint_dir
+        episodes = []
+        for agent, name in zip((self.agent1, self.agent2), CHECKPOINT_FILES):
+            header = load_checkpoint(agent, os.path.join(checkpoint_dir, name))
+            episodes.append(header["episodes"])
+        self.start_episode = min(episodes)
+        return self.start_episode
+
+    def checkpoint(self, episodes):
+        """Write both agents' tables to ``checkpoint_dir`` in the background.
+
+        The tables are copied first, so training keeps updating them while
+        the files are written; an unfinished checkpoint is waited for first.
+        """
+        self.wait_checkpoint()
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        snapshots = []
+        for agent in (self.agent1, self.agent2):
+            snapshot = copy.copy(agent)
+            snapshot.memory = agent.memory.copy()
+            snapshots.append(snapshot)
+        board = (self.engine.rows, self.engine.cols, self.engine.win_length)
+
+        def write():
+            for snapshot, name in zip(snapshots, CHECKPOINT_FILES):
+                save_checkpoint(snapshot, os.path.join(self.checkpoint_dir, name),
+                                episodes=episodes, board=board)
+
+        self._writer = threading.Thread(target=write, daemon=True)
+        self._writer.start()
+
+    def wait_checkpoint(self):
+        """Block until the checkpoint being written, if any, is on disk."""
+        if self._writer is not None:
+            self._writer.join()
+            self._writer = None
 
-    def run(self, progress_callback=None):
+    def run(self, progress_callback=None, monitor=None):
+        """Play the remaining episodes of the schedule; returns win/tie counts.
+
+        With a :class:`ConvergenceMonitor`, the run stops early once the
+        monitor reports convergence, and the stats also hold the episodes
+        played and the monitor's learning curve.
+        """
         p1_wins = p2_wins = ties = 0
+        episode = self.start_episode - 1
         orig_eps1 = self.agent1.epsilon
         orig_eps2 = self.agent2.epsilon
         orig_lr1 = self.agent1.learning_rate
         orig_lr2 = self.agent2.learning_rate
 
-        for episode in range(self.episodes):
-            self.engine.reset()
-            progress = episode / self.episodes
-
-            # Schedule: explore broadly early, exploit later
-            self.agent1.epsilon = 0.1 + 0.8 * progress
-            self.agent2.epsilon = 0.1 + 0.8 * progress
-            self.agent1.learning_rate = orig_lr1 * (1 - 0.9 * progress)
-            self.agent2.learning_rate = orig_lr2 * (1 - 0.9 * progress)
-
-            # More random opponents early to cover all openings
-            use_random_p1 = random.random() < (1 - progress) * 0.5
-
-            first_player = True
-            while not self.engine.done:
-                if first_player:
-                    if use_random_p1:
-                        r, c = random.choice(self.engine.get_valid_moves())
-                        self.engine.make_move(r, c, self.agent1.symbol)
-                    else:
-                        i, j, sym = self.agent1.choose_action(self.engine.state)
-                        self.engine.make_move(i, j, sym)
-                else:
-                    i, j, sym = self.agent2.choose_action(self.engine.state)
-                    self.engine.make_move(i, j, sym)
-                first_player = not first_player
+        # Schedule: explore broadly early, exploit later, with more random
+        # opponents early to cover all openings
+        epsilons, lr_scales, random_p1 = (a.tolist() for a in schedule(
+            self.rng.generator, self.start_episode, self.episodes, self.episodes))
+        for n, episode in enumerate(range(self.start_episode, self.episodes)):
+            self.agent1.epsilon = self.agent2.epsilon = epsilons[n]
+            self.agent1.learning_rate = orig_lr1 * lr_scales[n]
+            self.agent2.learning_rate = orig_lr2 * lr_scales[n]
+            use_random_p1 = random_p1[n]
 
-            if self.engine.winner == "Player 1":
+            winner = self.play_episode(use_random_p1)
+            if winner == "Player 1":
                 p1_wins += 1
-                if not use_random_p1:
-                    self.agent1.train(1)
-                self.agent2.train(0)
-            elif self.engine.winner == "Player 2":
+            elif winner == "Player 2":
                 p2_wins += 1
-                if not use_random_p1:
-                    self.agent1.train(0)
-                self.agent2.train(1)
             else:
                 ties += 1
-                if not use_random_p1:
-                    self.agent1.train(0.5)
-                self.agent2.train(0.5)
 
             if progress_callback:
                 progress_callback(episode + 1, self.episodes)
 
+            if (self.checkpoint_dir and self.checkpoint_every
+                    and (episode + 1) % self.checkpoint_every == 0):
+                self.checkpoint(episode + 1)
+
+            if monitor is not None:
+                monitor.observe(self.td_delta)
+                if ((episode + 1) % monitor.window == 0
+                        and monitor.check(episode + 1, self.agent1, self.agent2)):
+                    break
+        self.wait_checkpoint()
+
         # Restore original hyperparameters
         self.agent1.epsilon = orig_eps1
         self.agent2.epsilon = orig_eps2
         self.agent1.learning_rate = orig_lr1
         self.agent2.learning_rate = orig_lr2
 
-        return {"p1_wins": p1_wins, "p2_wins": p2_wins, "ties": ties}
+        stats = {"p1_wins": p1_wins, "p2_wins": p2_wins, "ties": ties}
+        if monitor is not None:
+            stats.update(episodes=episode + 1, converged=monitor.converged, curve=monitor.curve)
+        return stats
+
+    def retrain(self, file_names, learning_rate=None):
+        """Replay the games in journal files and apply TD updates to both agents.
+
+        Games stream from disk one at a time (see :func:`iter_journal`), so
+        journals of any size are replayed in constant memory. Each game is
+        replayed on ``engine`` first and rejected unless its moves end in
+        the recorded outcome with no move after a win. It then trains both agents as :meth:`play_episode` would, with
+        *learning_rate* overriding the agents' own for the duration.
+        Returns game counts like :meth:`run`.
+        """
+        board_size = (self.engine.rows, self.engine.cols, self.engine.win_length)
+        for file_name in file_names:
+            if read_header(file_name) != board_size:
+                raise ValueError(f"{file_name!r} was recorded on a different board")
+        agents = {self.agent1.symbol: self.agent1, self.agent2.symbol: self.agent2}
+        orig_lr = {symbol: agent.learning_rate for symbol, agent in agents.items()}
+        if learning_rate is not None:
+            for agent in agents.values():
+                agent.learning_rate = learning_rate
+
+        counts = {1: 0, -1: 0, 0: 0}
+        cells_total = self.engine.rows * self.engine.cols
+        try:
+            for file_name in file_names:
+                for n, (cells, outcome) in enumerate(iter_journal(file_name)):
+                    if (not cells or max(cells) >= cells_total or len(set(cells)) != len(cells)
+                            or outcome not in (1, -1, 0)):
+                        raise ValueError(f"Game {n} in {file_name!r} is not a valid game")
+                    if not self._replays(cells, outcome):
+                        raise ValueError(f"Game {n} in {file_name!r} does not end as recorded")
+                    board = np.zeros((self.engine.rows, self.engine.cols))
+                    flat = board.reshape(-1)  # a view: moves land on *board*
+                    keys = {1: [], -1: []}
+                    player = 1
+                    for cell in cells:
+                        flat[cell] = player
+                        keys[player].append(agents[player].state_key(board))
+                        player = -player
+                    results = {1: (1, 0), -1: (0, 1), 0: (0.5, 0.5)}[outcome]
+                    for symbol, result in zip((1, -1), results):
+                        if keys[symbol]:
+                            agent = agents[symbol]
+                            agent.lookup(keys[symbol])
+                            agent.moves = keys[symbol]
+                            agent.train(result)
+                    counts[outcome] += 1
+        finally:
+            for symbol, agent in agents.items():
+                agent.learning_rate = orig_lr[symbol]
+                agent.reset()
+        return {"games": sum(counts.values()), "p1_wins": counts[1], "p2_wins": counts[-1],
+                "ties": counts[0]}
+
+    def _replays(self, cells, outcome):
+        """Whether *cells*, played on ``engine``, finish the game with *outcome* on the last move."""
+        engine = self.engine
+        engine.reset()
+        player = 1
+        for cell in cells:
+            if engine.done:
+                return False
+            engine.make_move(*divmod(cell, engine.cols), player)
+            player = -player
+        return engine.done and OUTCOMES[engine.winner] == outcome
+
+    def play_episode(self, use_random_p1=False):
+        """Play one game on ``engine``, train both agents and return the winner.
+
+        With *use_random_p1*, Player 1 plays uniformly random moves and is
+        not trained. The episode's total TD change is left in ``td_delta``.
+        """
+        self.engine.reset()
+        first_player = True
+        while not self.engine.done:
+            if first_player:
+                if use_random_p1:
+                    r, c = self.rng.choice(self.engine.get_valid_moves())
+                    self.engine.make_move(r, c, self.agent1.symbol)
+                else:
+                    i, j, sym = self.agent1.choose_action(self.engine.state)
+                    self.engine.make_move(i, j, sym)
+            else:
+                i, j, sym = self.agent2.choose_action(self.engine.state)
+                self.engine.make_move(i, j, sym)
+            first_player = not first_player
+
+        if self.engine.winner == "Player 1":
+            results = (1, 0)
+        elif self.engine.winner == "Player 2":
+            results = (0, 1)
+        else:
+            results = (0.5, 0.5)
+        self.td_delta = 0.0
+        if not use_random_p1:
+            self.td_delta += self.agent1.train(results[0])
+        self.td_delta += self.agent2.train(results[1])
+        return self.engine.winner
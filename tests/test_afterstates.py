@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from game.afterstates import afterstate_index
+from game.agent import Agent
+from game.encoding import decode
+
+
+def test_covers_reachable_positions():
+    table = afterstate_index("bytes")
+    assert len(table) == 4520
+    assert afterstate_index("bytes") is table
+
+
+@pytest.mark.parametrize("options", [{}, {"store": "array"}, {"canonical": True}])
+def test_keys_match_state_key(options):
+    agent = Agent(1, **options)
+    table = afterstate_index(agent.key_type)
+    for index in list(table)[::97]:
+        moves, keys = table[index]
+        board = decode(index)
+        assert [tuple(m) for m in np.argwhere(board == 0).tolist()] == list(moves)
+        for symbol in (1, -1):
+            for (row, col), key in zip(moves, keys[symbol]):
+                child = board.copy()
+                child[row, col] = symbol
+                assert agent.state_key(child) == key
+
+
+def test_invalid_key_type():
+    with pytest.raises(ValueError):
+        afterstate_index("json")
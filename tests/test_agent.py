@@ -2,6 +2,7 @@ import os
 import tempfile
 
 import numpy as np
+import pytest
 
 from game.agent import Agent
 
@@ -71,3 +72,121 @@ def test_save_load_roundtrip():
         assert agent2.memory == agent.memory
     finally:
         os.unlink(tmp_path)
+
+
+def test_array_store_choose_action_returns_valid_move():
+    agent = Agent(1, store="array")
+    state = np.zeros((3, 3))
+    state[1, 1] = -1
+    i, j, symbol = agent.choose_action(state)
+    assert state[i, j] == 0
+    assert symbol == 1
+    assert len(agent.memory) == 8
+
+
+def test_array_store_greedy_picks_best_value():
+    agent = Agent(1, store="array")
+    state = np.zeros((3, 3))
+    state[2, 1] = 1
+    agent.memory[agent.state_key(state)] = 1.0
+    state[2, 1] = 0
+
+    i, j, _ = agent.choose_action(state, greedy=True)
+    assert (i, j) == (2, 1)
+
+
+def test_array_store_train_and_save_load_roundtrip():
+    agent = Agent(1, store="array")
+    state = np.zeros((3, 3))
+    agent.choose_action(state, greedy=True)
+    agent.train(1.0)
+    assert 1.0 in [v for _, v in agent.memory.items()]
+
+    with tempfile.NamedTemporaryFile(suffix=".dat", delete=False) as f:
+        tmp_path = f.name
+
+    try:
+        agent.save(tmp_path)
+        agent2 = Agent(1)
+        agent2.load(tmp_path)
+        assert agent2.store == "array"
+        assert agent2.memory == agent.memory
+    finally:
+        os.unlink(tmp_path)
+
+
+def test_invalid_store_raises():
+    with pytest.raises(ValueError):
+        Agent(1, store="invalid")
+
+
+def test_choose_action_on_larger_board():
+    agent = Agent(-1)
+    state = np.zeros((5, 5))
+    state[2, 2] = 1
+    i, j, symbol = agent.choose_action(state)
+    assert state[i, j] == 0
+    assert len(agent.memory) == 24
+    assert all(len(key) == 7 for key in agent.memory)  # 2 bit planes of 25 cells
+
+
+def test_array_store_rejects_larger_board():
+    agent = Agent(1, store="array")
+    with pytest.raises(ValueError):
+        agent.choose_action(np.zeros((4, 4)))
+
+
+def test_choose_action_does_not_write_to_state():
+    state = np.zeros((3, 3))
+    state[1, 1] = 1
+    state.setflags(write=False)
+    for options in ({}, {"store": "array"}, {"canonical": True}):
+        i, j, _ = Agent(-1, **options).choose_action(state)
+        assert state[i, j] == 0
+
+    # Unreachable 3x3 boards fall back to a copy of the board.
+    unreachable = np.zeros((3, 3))
+    unreachable[0] = 1
+    unreachable.setflags(write=False)
+    agent = Agent(-1)
+    agent.choose_action(unreachable)
+    assert len(agent.memory) == 6
+
+
+@pytest.mark.parametrize("options", [{}, {"store": "array"}, {"canonical": True}])
+def test_evaluate_many_matches_greedy_choice(options):
+    agent = Agent(-1, **options)
+    state = np.zeros((3, 3))
+    state[0, 0] = 1
+    agent.memory[agent.state_key(np.array([[1., 0, 0], [0, 0, 0], [0, 0, -1]]))] = 0.9
+    seen = len(agent.memory)
+
+    boards = np.array([state.ravel(), np.ones(9)])
+    cells, values = agent.evaluate_many(boards)
+    assert cells.tolist()[0] == 8 and values[0] == 0.9
+    assert cells[1] == -1 and np.isnan(values[1])
+    assert len(agent.memory) == seen
+    assert agent.choose_action(state, greedy=True)[:2] == (2, 2)
+
+
+@pytest.mark.parametrize("options", [{}, {"store": "array"}, {"canonical": True}])
+def test_evaluate_many_on_occupied_corners(options):
+    agent = Agent(1, **options)
+    board = np.array([-1., 0, 0, 0, 0, 0, 0, 0, 1])  # player 1 at (2,2), player 2 at (0,0)
+    afterstate = board.copy()
+    afterstate[4] = 1
+    agent.memory[agent.state_key(afterstate.reshape(3, 3))] = 0.9
+    cells, values = agent.evaluate_many(np.array([board, -board]))
+    assert cells[0] == 4 and values[0] == 0.9
+    assert cells[1] in range(1, 8)
+
+
+def test_single_line_boards_use_their_own_keys():
+    board = np.zeros((1, 9))
+    board[0, 4] = 1
+    assert Agent(1).state_key(board) != Agent(1).state_key(board.reshape(3, 3))
+    for options in ({"canonical": True}, {"store": "array"}):
+        with pytest.raises(ValueError):
+            Agent(1, **options).state_key(board)
+        with pytest.raises(ValueError):
+            Agent(1, **options).state_keys(board, shape=(1, 9))
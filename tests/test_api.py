@@ -53,6 +53,28 @@ def test_invalid_move_returns_error(client):
     assert "error" in data
 
 
+def test_move_validates_position(client):
+    client.post("/api/new-game", json={"mode": "human-human", "rows": 3, "cols": 4})
+    for body in ({"row": "0", "col": 0}, {"row": 0}, {"row": True, "col": 0}, {"row": -1, "col": 0}):
+        assert client.post("/api/move", json=body).status_code == 400
+    data = client.post("/api/move", json={"row": 3, "col": 0}).get_json()
+    assert data["error"] == "Move is off the board."
+    assert client.post("/api/move", json={"row": 2, "col": 3}).get_json()["board"][2][3] == 1
+
+
+@pytest.mark.parametrize("path", ["/api/new-game", "/api/move", "/api/evaluate", "/api/train"])
+def test_rejects_bodies_that_are_not_objects(client, path):
+    res = client.post(path, json=[1])
+    assert res.status_code == 400
+    assert res.get_json()["error"] == "Request body must be a JSON object."
+
+
+def test_rejects_game_id_that_is_not_a_string(client):
+    for path in ("/api/new-game", "/api/move"):
+        res = client.post(path, json={"mode": "human-human", "game_id": ["x"]})
+        assert res.status_code == 400
+
+
 def test_game_over_detection(client):
     client.post("/api/new-game", json={"mode": "human-human"})
     # Player 1 wins across row 0
@@ -64,3 +86,113 @@ def test_game_over_detection(client):
     data = res.get_json()
     assert data["done"] is True
     assert data["winner"] == "Player 1"
+
+
+def test_model_cache_stats(client):
+    res = client.get("/api/model-cache")
+    data = res.get_json()
+    assert {"hits", "misses", "reloads", "models"} <= set(data)
+
+
+def test_games_are_isolated_per_game_id(client):
+    first = client.post("/api/new-game", json={"mode": "human-human"}).get_json()
+    with app.test_client() as other:
+        second = other.post("/api/new-game", json={"mode": "human-human"}).get_json()
+    assert first["game_id"] != second["game_id"]
+
+    client.post("/api/move", json={"row": 0, "col": 0, "game_id": first["game_id"]})
+    res = client.post("/api/move", json={"row": 2, "col": 2, "game_id": second["game_id"]})
+    data = res.get_json()
+    assert data["board"][0][0] == 0
+    assert data["board"][2][2] == 1
+
+
+def test_new_game_reuses_known_game_id(client):
+    first = client.post("/api/new-game", json={"mode": "human-human"}).get_json()
+    again = client.post(
+        "/api/new-game", json={"mode": "human-human", "game_id": first["game_id"]}
+    ).get_json()
+    assert again["game_id"] == first["game_id"]
+
+
+def test_move_for_unknown_game_returns_404(client):
+    res = client.post("/api/move", json={"row": 0, "col": 0, "game_id": "missing"})
+    assert res.status_code == 404
+    assert "error" in res.get_json()
+
+
+def test_new_game_invalid_mode_returns_400(client):
+    res = client.post("/api/new-game", json={"mode": "invalid"})
+    assert res.status_code == 400
+
+
+def test_training_job_lifecycle(client, monkeypatch):
+    import threading
+
+    from web import app as web_app
+
+    release = threading.Event()
+
+    def fake_train(progress_callback=None):
+        release.wait(5)
+        for episode in range(1, 4):
+            progress_callback(episode, 3)
+        return {"p1_wins": 1, "p2_wins": 1, "ties": 1}
+
+    monkeypatch.setattr(web_app.GameSession, "train", staticmethod(fake_train))
+    monkeypatch.setattr(web_app, "jobs", web_app.JobManager())
+
+    res = client.post("/api/train/jobs")
+    assert res.status_code == 202
+    job_id = res.get_json()["job_id"]
+    assert client.post("/api/train/jobs").status_code == 409
+
+    # Game endpoints stay responsive while training runs
+    assert client.post("/api/new-game", json={"mode": "human-human"}).status_code == 200
+
+    release.set()
+    events = client.get(f"/api/train/jobs/{job_id}/events").get_data(as_text=True)
+    assert '"status": "done"' in events
+    data = client.get(f"/api/train/jobs/{job_id}").get_json()
+    assert data["stats"]["ties"] == 1
+
+
+def test_unknown_training_job_returns_404(client):
+    assert client.get("/api/train/jobs/missing").status_code == 404
+    assert client.post("/api/train/jobs/missing/cancel").status_code == 404
+
+
+def test_new_game_with_board_size(client):
+    res = client.post("/api/new-game",
+                      json={"mode": "human-human", "rows": 4, "cols": 4, "win_length": 3})
+    assert res.get_json()["board"] == [[0] * 4] * 4
+
+
+def test_new_game_rejects_oversized_board(client):
+    res = client.post("/api/new-game", json={"mode": "human-human", "rows": 1000})
+    assert res.status_code == 400
+    for name in ("rows", "cols", "win_length"):
+        assert client.post("/api/new-game", json={"mode": "human-human", name: True}).status_code == 400
+
+
+def test_metrics_endpoint_is_prometheus_text(client):
+    res = client.get("/metrics")
+    assert res.status_code == 200
+    assert res.content_type.startswith("text/plain")
+    assert "# TYPE tictactoe_moves counter" in res.get_data(as_text=True)
+
+
+def test_training_job_rejects_bad_seed(client):
+    res = client.post("/api/train/jobs", json={"seed": "abc"})
+    assert res.status_code == 400
+    assert "seed" in res.get_json()["error"]
+
+
+def test_evaluate_batch(client):
+    res = client.post("/api/evaluate", json={"codes": [9841] * 1000})
+    assert res.status_code == 200
+    data = res.get_json()
+    assert data["positions"] == 1000
+    assert len(data["moves"]) == len(data["values"]) == 1000
+    res = client.post("/api/evaluate", json={"boards": [[2] * 9]})
+    assert res.status_code == 400
@@ -0,0 +1,199 @@
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from web import asgi
+from web.asgi_server import serve
+
+
+def request(method, path, body=None, cookie=None):
+    """Run one request through the ASGI app; returns (status, headers, body)."""
+    scope = {"type": "http", "method": method, "path": path, "headers": []}
+    if cookie:
+        scope["headers"].append((b"cookie", cookie.encode()))
+    payload = json.dumps(body).encode() if body is not None else b""
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": payload, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(asgi.app(scope, receive, send))
+    headers = dict(sent[0]["headers"])
+    data = b"".join(m.get("body", b"") for m in sent[1:])
+    return sent[0]["status"], headers, data
+
+
+def request_json(*args, **kwargs):
+    status, headers, data = request(*args, **kwargs)
+    return status, json.loads(data)
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(asgi, "sessions", asgi.SessionStore())
+    monkeypatch.setattr(asgi, "jobs", asgi.JobManager())
+
+
+def test_new_game_and_move_by_game_id():
+    status, data = request_json("POST", "/api/new-game", {"mode": "human-human"})
+    assert status == 200
+    assert data["board"] == [[0, 0, 0]] * 3
+    status, data = request_json("POST", "/api/move",
+                                {"row": 1, "col": 2, "game_id": data["game_id"]})
+    assert status == 200
+    assert data["board"][1][2] == 1
+
+
+def test_game_id_cookie():
+    status, headers, data = request("POST", "/api/new-game", {"mode": "human-human"})
+    cookie = headers[b"set-cookie"].decode().split(";")[0]
+    assert cookie == f"game_id={json.loads(data)['game_id']}"
+    status, data = request_json("POST", "/api/move", {"row": 0, "col": 0}, cookie=cookie)
+    assert data["board"][0][0] == 1
+
+
+def test_errors_match_flask_contract():
+    assert request_json("POST", "/api/move", {"row": 0, "col": 0, "game_id": "nope"})[0] == 404
+    assert request_json("POST", "/api/new-game", {"mode": "bogus"})[0] == 400
+    assert request_json("POST", "/api/new-game", {"mode": "human-ai", "rows": 99})[0] == 400
+    assert request_json("POST", "/api/new-game", {"mode": "human-human", "rows": True})[0] == 400
+    assert request_json("POST", "/api/move", {"row": 0, "col": 0, "game_id": ["x"]})[0] == 400
+    game_id = request_json("POST", "/api/new-game", {"mode": "human-human"})[1]["game_id"]
+    assert request_json("POST", "/api/move", {"row": "1", "col": 0, "game_id": game_id})[0] == 400
+    assert request_json("POST", "/api/train/jobs", {"seed": "x"})[0] == 400
+    assert request_json("GET", "/api/move")[0] == 405
+    assert request_json("GET", "/api/nothing")[0] == 404
+    assert request("POST", "/api/move", None)[0] == 404
+    status, _, _ = request("GET", "/static/../app.py")
+    assert status == 404
+
+
+def test_static_and_index():
+    status, headers, data = request("GET", "/")
+    assert status == 200
+    assert headers[b"content-type"].startswith(b"text/html")
+    assert request("GET", "/static/game.js")[0] == 200
+
+
+def test_model_exists():
+    status, data = request_json("GET", "/api/model-exists")
+    assert status == 200
+    assert set(data) == {"exists"}
+
+
+def test_handler_errors_return_json_500(monkeypatch):
+    def broken():
+        raise TypeError("boom")
+
+    monkeypatch.setattr(asgi.GameSession, "model_exists", staticmethod(broken))
+    assert request_json("GET", "/api/model-exists") == (500, {"error": "Internal Server Error."})
+
+
+@pytest.mark.parametrize("head", [
+    b"GARBAGE\r\n\r\n",
+    b"POST /api/move HTTP/1.1\r\nContent-Length: ten\r\n\r\n",
+    b"POST /api/move HTTP/1.1\r\nContent-Length: -1\r\n\r\n",
+])
+def test_server_rejects_malformed_requests(head):
+    async def scenario():
+        bound = asyncio.get_running_loop().create_future()
+        server = asyncio.ensure_future(serve(asgi.app, port=0, ready=bound.set_result))
+        reader, writer = await asyncio.open_connection("127.0.0.1", await bound)
+        writer.write(head)
+        response = await reader.read()
+        writer.close()
+        server.cancel()
+        return response
+
+    assert asyncio.run(scenario()).startswith(b"HTTP/1.1 400 Bad Request\r\n")
+
+
+def test_training_job_events_stream(monkeypatch):
+    release = threading.Event()
+
+    def fake_train(progress_callback=None):
+        release.wait(5)
+        progress_callback(1, 1)
+        return {"p1_wins": 0, "p2_wins": 0, "ties": 1}
+
+    monkeypatch.setattr(asgi.GameSession, "train", staticmethod(fake_train))
+    status, job = request_json("POST", "/api/train/jobs")
+    assert status == 202
+    release.set()
+    status, headers, data = request("GET", f"/api/train/jobs/{job['job_id']}/events")
+    assert headers[b"content-type"] == b"text/event-stream"
+    assert '"status": "done"' in data.decode()
+
+
+def test_event_streams_do_not_hold_game_threads(monkeypatch):
+    release = threading.Event()
+
+    def fake_train(progress_callback=None):
+        release.wait(5)
+        return {"p1_wins": 0, "p2_wins": 0, "ties": 0}
+
+    monkeypatch.setattr(asgi.GameSession, "train", staticmethod(fake_train))
+    monkeypatch.setattr(asgi, "executor", ThreadPoolExecutor(1))
+    job_id = request_json("POST", "/api/train/jobs")[1]["job_id"]
+
+    async def scenario():
+        watchers = [asyncio.ensure_future(asyncio.to_thread(
+            request, "GET", f"/api/train/jobs/{job_id}/events")) for _ in range(4)]
+        await asyncio.sleep(0.1)
+        status, _ = await asyncio.to_thread(
+            request_json, "POST", "/api/new-game", {"mode": "human-human"})
+        assert status == 200
+        assert not any(watcher.done() for watcher in watchers)
+        release.set()
+        for watcher in watchers:
+            assert '"status": "done"' in (await watcher)[2].decode()
+
+    asyncio.run(scenario())
+
+
+def test_moves_do_not_block_the_event_loop(monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_train(**options):
+        started.set()
+        release.wait(5)
+        return {"p1_wins": 0, "p2_wins": 0, "ties": 0}
+
+    monkeypatch.setattr(asgi.GameSession, "train", staticmethod(slow_train))
+
+    async def scenario():
+        async def call(path, body):
+            sent = []
+
+            async def receive():
+                return {"type": "http.request", "body": json.dumps(body).encode()}
+
+            async def send(message):
+                sent.append(message)
+
+            await asgi.app({"type": "http", "method": "POST", "path": path, "headers": []},
+                           receive, send)
+            return sent[0]["status"]
+
+        training = asyncio.ensure_future(call("/api/train", {}))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        assert await call("/api/new-game", {"mode": "human-human"}) == 200
+        assert not training.done()
+        release.set()
+        assert await training == 200
+
+    asyncio.run(scenario())
+
+
+def test_evaluate_batch():
+    status, data = request_json("POST", "/api/evaluate", {"codes": [9841, 9842]})
+    assert status == 200
+    assert data["positions"] == 2
+    assert request_json("POST", "/api/evaluate", {"codes": "nope"})[0] == 400
@@ -0,0 +1,57 @@
+import numpy as np
+
+from game.agent import Agent
+from game.batch_trainer import BatchTrainer
+
+
+def test_batch_training_returns_stats():
+    agent1 = Agent(1)
+    agent2 = Agent(-1)
+    trainer = BatchTrainer(agent1, agent2, episodes=250, batch_size=64)
+    stats = trainer.run()
+    assert set(stats) == {"p1_wins", "p2_wins", "ties"}
+    assert stats["p1_wins"] + stats["p2_wins"] + stats["ties"] == 250
+
+
+def test_batch_training_updates_memory_and_restores_hyperparameters():
+    agent1 = Agent(1)
+    agent2 = Agent(-1)
+    BatchTrainer(agent1, agent2, episodes=100, batch_size=32).run()
+    assert agent2.memory
+    assert any(v != 0.5 for v in agent2.memory.values())
+    assert agent1.learning_rate == Agent(1).learning_rate
+    assert agent2.moves == []
+
+
+def test_batch_training_reports_progress():
+    calls = []
+    BatchTrainer(Agent(1), Agent(-1), episodes=50, batch_size=20).run(
+        lambda done, total: calls.append((done, total))
+    )
+    assert calls == [(20, 50), (40, 50), (50, 50)]
+
+
+def test_batch_trained_agent_plays_from_memory():
+    agent1 = Agent(1)
+    agent2 = Agent(-1)
+    BatchTrainer(agent1, agent2, episodes=200, batch_size=50).run()
+    state = np.zeros((3, 3))
+    state[0, 0] = 1
+    i, j, symbol = agent2.choose_action(state, greedy=True)
+    assert symbol == -1
+    assert state[i, j] == 0
+
+
+def test_batch_training_with_canonical_keys():
+    agent1 = Agent(1, canonical=True)
+    agent2 = Agent(-1, canonical=True)
+    BatchTrainer(agent1, agent2, episodes=200, batch_size=50).run()
+    assert all(isinstance(k, int) for k in agent2.memory)
+
+
+def test_batch_training_with_array_store():
+    agent1 = Agent(1, store="array")
+    agent2 = Agent(-1, store="array", canonical=True)
+    BatchTrainer(agent1, agent2, episodes=200, batch_size=50).run()
+    assert len(agent1.memory) > 0
+    assert len(agent2.memory) > 0
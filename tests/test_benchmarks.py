@@ -0,0 +1,46 @@
+import json
+
+import pytest
+
+from benchmarks.__main__ import main
+from benchmarks.suite import BASELINE, compare, run_suite
+
+
+def _report(**rates):
+    return {"results": {name: {"rate": rate, "unit": "ops/s"} for name, rate in rates.items()}}
+
+
+def test_compare_flags_slowdowns_beyond_threshold():
+    baseline = _report(a=100.0, b=100.0, c=100.0)
+    report = _report(a=85.0, b=70.0, d=1.0)
+    assert compare(report, baseline, threshold=0.2) == [("b", 100.0, 70.0, pytest.approx(-0.3))]
+    assert compare(report, baseline, threshold=0.1)[0][0] == "a"
+
+
+def test_run_suite_reports_rates():
+    report = run_suite(["engine.make_move.bitboard"], repeat=1)
+    result = report["results"]["engine.make_move.bitboard"]
+    assert result["rate"] > 0
+    assert result["unit"] == "moves/s"
+    json.dumps(report)
+    with pytest.raises(ValueError):
+        run_suite(["nope"])
+
+
+def test_main_writes_json_and_fails_on_regression(tmp_path):
+    output = tmp_path / "bench.json"
+    assert main(["engine.make_move.bitboard", "--repeat", "1", "--output", str(output)]) == 0
+    report = json.loads(output.read_text())
+    report["results"]["engine.make_move.bitboard"]["rate"] *= 100
+    output.write_text(json.dumps(report))
+    assert main(["engine.make_move.bitboard", "--repeat", "1", "--baseline", str(output)]) == 1
+
+
+@pytest.mark.benchmark
+def test_no_regression_against_stored_baseline():
+    # The stored baseline is machine specific: regenerate it with
+    # ``python -m benchmarks --output benchmarks/baseline.json`` on the
+    # machine that runs this test.
+    with open(BASELINE) as f:
+        baseline = json.load(f)
+    assert compare(run_suite(repeat=5), baseline) == []
@@ -0,0 +1,126 @@
+import random
+
+import numpy as np
+import pytest
+
+from game.bitboard import BitboardEngine
+from game.engine import GameEngine, make_engine
+
+
+def test_row_win():
+    engine = BitboardEngine()
+    for j in range(3):
+        engine.make_move(0, j, 1)
+    assert engine.done
+    assert engine.winner == "Player 1"
+
+
+def test_anti_diagonal_win():
+    engine = BitboardEngine()
+    for i in range(3):
+        engine.make_move(i, 2 - i, -1)
+    assert engine.done
+    assert engine.winner == "Player 2"
+
+
+def test_invalid_move_returns_false():
+    engine = BitboardEngine()
+    engine.make_move(1, 1, 1)
+    assert engine.make_move(1, 1, -1) is False
+
+
+@pytest.mark.parametrize("row, col", [(0, 5), (3, 0), (-1, 0)])
+def test_off_board_move_raises(row, col):
+    engine = BitboardEngine()
+    with pytest.raises(ValueError):
+        engine.make_move(row, col, 1)
+    assert engine.bits == {1: 0, -1: 0}
+
+
+@pytest.mark.parametrize("row, col", [(0, -1), (0, 3), (3, 0)])
+def test_off_board_undo_raises(row, col):
+    engine = BitboardEngine()
+    engine.make_move(0, 2, 1)
+    with pytest.raises(ValueError):
+        engine.undo_move(row, col)
+    assert engine.bits == {1: 1 << 2, -1: 0}
+
+
+def test_state_matches_moves():
+    engine = BitboardEngine()
+    engine.make_move(0, 0, 1)
+    engine.make_move(2, 1, -1)
+    expected = np.zeros((3, 3))
+    expected[0, 0] = 1
+    expected[2, 1] = -1
+    assert np.array_equal(engine.state, expected)
+    assert (2, 1) not in engine.get_valid_moves()
+    assert len(engine.get_valid_moves()) == 7
+
+
+def test_reset_clears_board():
+    engine = BitboardEngine()
+    for j in range(3):
+        engine.make_move(0, j, 1)
+    engine.reset()
+    assert not engine.done
+    assert engine.winner is None
+    assert not engine.state.any()
+
+
+def test_matches_numpy_engine_on_random_games():
+    rng = random.Random(0)
+    for _ in range(200):
+        reference, engine = GameEngine(), BitboardEngine()
+        player = 1
+        while not reference.done:
+            assert engine.get_valid_moves() == reference.get_valid_moves()
+            r, c = rng.choice(reference.get_valid_moves())
+            reference.make_move(r, c, player)
+            engine.make_move(r, c, player)
+            player = -player
+        assert engine.done
+        assert engine.winner == reference.winner
+        assert np.array_equal(engine.state, reference.state)
+
+
+def test_make_engine_backends():
+    assert isinstance(make_engine("numpy"), GameEngine)
+    assert isinstance(make_engine("bitboard"), BitboardEngine)
+    with pytest.raises(ValueError):
+        make_engine("invalid")
+
+
+def test_undo_move_matches_numpy_engine():
+    rng = random.Random(1)
+    for _ in range(100):
+        reference, engine = GameEngine(), BitboardEngine()
+        player = 1
+        played = []
+        while not reference.done:
+            r, c = rng.choice(reference.get_valid_moves())
+            reference.make_move(r, c, player)
+            engine.make_move(r, c, player)
+            played.append((r, c))
+            player = -player
+        for r, c in reversed(played[-3:]):
+            assert engine.undo_move(r, c) and reference.undo_move(r, c)
+            assert np.array_equal(engine.state, reference.state)
+            assert engine.done == reference.done
+        assert engine.undo_move(*played[-3]) is False
+
+
+@pytest.mark.parametrize("size", [(4, 4, 3), (5, 5, 4), (15, 15, 5)])
+def test_matches_numpy_engine_on_larger_boards(size):
+    rng = random.Random(2)
+    for _ in range(30):
+        reference, engine = GameEngine(*size), BitboardEngine(*size)
+        player = 1
+        while not reference.done:
+            r, c = rng.choice(reference.get_valid_moves())
+            reference.make_move(r, c, player)
+            engine.make_move(r, c, player)
+            player = -player
+        assert engine.done
+        assert engine.winner == reference.winner
+        assert np.array_equal(engine.state, reference.state)
@@ -0,0 +1,94 @@
+import pytest
+
+from game.agent import Agent
+from game.checkpoint import iter_checkpoint, load_checkpoint, read_header, save_checkpoint
+from game.engine import make_engine
+from game.trainer import Trainer
+
+
+def _trained(**kwargs):
+    agent1 = Agent(1, **kwargs)
+    agent2 = Agent(-1, **kwargs)
+    Trainer(make_engine(), agent1, agent2, episodes=200).run()
+    return agent2
+
+
+@pytest.mark.parametrize("compression", ["none", "zlib", "lzma"])
+@pytest.mark.parametrize("options", [{}, {"store": "array"}, {"canonical": True}])
+def test_roundtrip(tmp_path, compression, options):
+    agent = _trained(**options)
+    path = tmp_path / "p2.ckpt"
+    save_checkpoint(agent, path, episodes=200, compression=compression)
+
+    loaded = Agent(-1)
+    header = load_checkpoint(loaded, path)
+    assert header["episodes"] == 200
+    assert header["records"] == len(agent.memory)
+    assert loaded.store == agent.store
+    assert loaded.canonical == agent.canonical
+    assert loaded.memory == agent.memory
+
+
+def test_streams_in_small_chunks(tmp_path):
+    agent = _trained()
+    path = tmp_path / "p2.ckpt"
+    save_checkpoint(agent, path)
+    assert dict(iter_checkpoint(path, chunk_bytes=7)) == agent.memory
+
+
+def test_large_board_keys(tmp_path):
+    agent1 = Agent(1)
+    agent2 = Agent(-1)
+    Trainer(make_engine(rows=4, cols=4, win_length=3), agent1, agent2, episodes=50).run()
+    path = tmp_path / "p2.ckpt"
+    save_checkpoint(agent2, path, board=(4, 4, 3))
+
+    loaded = Agent(-1)
+    header = load_checkpoint(loaded, path)
+    assert (header["rows"], header["cols"], header["win_length"]) == (4, 4, 3)
+    assert loaded.memory == agent2.memory
+
+
+def test_empty_table_on_large_board(tmp_path):
+    path = tmp_path / "p1.ckpt"
+    Agent(1).save(path, board=(7, 7, 4))
+    loaded = Agent(1)
+    header = load_checkpoint(loaded, path)
+    assert (header["rows"], header["cols"], header["records"]) == (7, 7, 0)
+    assert loaded.memory == {}
+
+
+def test_agent_load_detects_format(tmp_path):
+    agent = _trained()
+    for fmt in Agent.FORMATS:
+        path = tmp_path / f"p2.{fmt}"
+        agent.save(path, format=fmt)
+        loaded = Agent(-1)
+        loaded.load(path)
+        assert loaded.memory == agent.memory
+    with pytest.raises(ValueError):
+        agent.save(tmp_path / "p2.bad", format="json")
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "p2.dat"
+    Agent(-1).save(path, format="pickle")
+    with pytest.raises(ValueError):
+        read_header(path)
+
+
+def test_trainer_checkpoints_and_resumes(tmp_path):
+    agent1 = Agent(1)
+    agent2 = Agent(-1)
+    Trainer(make_engine(), agent1, agent2, episodes=100,
+            checkpoint_every=40, checkpoint_dir=tmp_path).run()
+    assert read_header(tmp_path / "p2.ckpt")["episodes"] == 80
+
+    resumed = Trainer(make_engine(), Agent(1), Agent(-1), episodes=100,
+                      checkpoint_every=40, checkpoint_dir=tmp_path)
+    assert resumed.resume() == 80
+    assert len(resumed.agent2.memory) > 0
+    calls = []
+    resumed.run(lambda done, total: calls.append(done))
+    assert calls == list(range(81, 101))
+
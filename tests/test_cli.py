@@ -0,0 +1,46 @@
+import json
+
+from cli import main
+
+
+def test_train_and_evaluate_print_json(tmp_path, capsys):
+    assert main(["train", "--episodes", "200", "--seed", "0", "--output", str(tmp_path)]) == 0
+    summary = json.loads(capsys.readouterr().out)
+    assert summary["p1_wins"] + summary["p2_wins"] + summary["ties"] == 200
+    assert (tmp_path / "p2.dat").exists()
+
+    assert main(["evaluate", str(tmp_path / "p1.dat"), "random", "--games", "500"]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["games"] == 500
+
+
+def test_evaluate_reports_unknown_player(capsys):
+    assert main(["evaluate", "perfect", "nobody"]) == 2
+    assert "error" in json.loads(capsys.readouterr().out)
+
+
+def test_metrics_go_to_stderr(capsys):
+    assert main(["--metrics", "evaluate", "random", "random", "--games", "10"]) == 0
+    captured = capsys.readouterr()
+    json.loads(captured.out)
+    assert "# TYPE tictactoe_moves counter" in captured.err
+
+
+def test_retrain_from_journal(tmp_path, capsys):
+    from game.journal import JournalWriter
+
+    journal = JournalWriter(tmp_path / "games.journal")
+    journal.record([0, 3, 1, 4, 2], 1)
+    journal.close()
+    assert main(["retrain", str(tmp_path / "games.journal"), "--output", str(tmp_path)]) == 0
+    assert json.loads(capsys.readouterr().out)["games"] == 1
+    assert main(["retrain", str(tmp_path / "p2.dat")]) == 2
+
+
+def test_train_early_stop(tmp_path, capsys):
+    assert main(["train", "--episodes", "20000", "--seed", "0", "--early-stop",
+                 "--output", str(tmp_path)]) == 0
+    summary = json.loads(capsys.readouterr().out)
+    assert summary["episodes"] <= 20000
+    assert len(summary["curve"]) == summary["episodes"] // 5000  # one point per window
+    assert main(["train", "--early-stop", "--workers", "2"]) == 2
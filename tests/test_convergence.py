@@ -0,0 +1,57 @@
+import pytest
+
+from game.agent import Agent
+from game.convergence import ConvergenceMonitor
+from game.engine import make_engine
+from game.trainer import Trainer
+
+
+def test_train_returns_total_td_change():
+    agent = Agent(1, learning_rate=0.5)
+    agent.moves = ["a", "b"]
+    agent.memory.update({"a": 0.5, "b": 0.5})
+    assert agent.train(1) == pytest.approx(0.5 + 0.25)
+    assert agent.memory == {"a": 0.5 + 0.25, "b": 1}
+
+
+def test_monitor_requires_settled_values_and_no_losses():
+    monitor = ConvergenceMonitor(window=10, td_threshold=0.1, opponent="perfect",
+                                 patience=2, eval_games=200, seed=0)
+    untrained = Agent(1), Agent(-1)
+    for _ in range(10):
+        monitor.observe(0.01)
+    assert not monitor.check(10, *untrained)  # settled, but loses to perfect play
+    point = monitor.curve[0]
+    assert point["episode"] == 10
+    assert point["td_delta"] == pytest.approx(0.01)
+    assert point["p1_loss_rate"] > 0
+
+    td_only = ConvergenceMonitor(window=10, td_threshold=0.1, opponent=None, patience=2)
+    for td in (0.5, 0.05, 0.05):
+        td_only.observe(td)
+        td_only.check(0, *untrained)
+    assert td_only.converged
+    assert [len(point) for point in td_only.curve] == [3, 3, 3]
+
+    with pytest.raises(ValueError):
+        ConvergenceMonitor(opponent="nobody")
+
+
+def test_run_stops_early_and_reports_curve():
+    monitor = ConvergenceMonitor(window=50, td_threshold=100, opponent=None, patience=2)
+    trainer = Trainer(make_engine(), Agent(1), Agent(-1), episodes=1000, seed=0)
+    stats = trainer.run(monitor=monitor)
+    assert stats["episodes"] == 100
+    assert stats["converged"] is True
+    assert stats["p1_wins"] + stats["p2_wins"] + stats["ties"] == 100
+    assert [point["episode"] for point in stats["curve"]] == [50, 100]
+    assert trainer.agent1.epsilon == Agent(1).epsilon  # hyperparameters restored
+
+
+def test_evaluation_is_skipped_until_td_settles():
+    monitor = ConvergenceMonitor(window=1, td_threshold=0.1, eval_every=3, eval_games=100)
+    agents = Agent(1), Agent(-1)
+    for _ in range(3):
+        monitor.observe(1.0)
+        monitor.check(0, *agents)
+    assert ["p1_loss_rate" in point for point in monitor.curve] == [False, False, True]
@@ -0,0 +1,35 @@
+import numpy as np
+
+from game.encoding import EMPTY_INDEX, N_STATES, board_bytes, decode, encode, encode_many
+
+
+def test_empty_board_index():
+    assert encode(np.zeros((3, 3))) == EMPTY_INDEX
+
+
+def test_encode_decode_roundtrip():
+    state = np.zeros((3, 3))
+    state[0, 0] = 1
+    state[2, 1] = -1
+    assert np.array_equal(decode(encode(state)), state)
+
+
+def test_indices_cover_range():
+    full_p1 = np.ones((3, 3))
+    full_p2 = -np.ones((3, 3))
+    assert encode(full_p2) == 0
+    assert encode(full_p1) == N_STATES - 1
+
+
+def test_encode_many_matches_encode():
+    rng = np.random.default_rng(0)
+    boards = rng.integers(-1, 2, size=(50, 9)).astype(float)
+    assert encode_many(boards).tolist() == [encode(b.reshape(3, 3)) for b in boards]
+
+
+def test_board_bytes_match_tobytes():
+    boards = np.zeros((2, 9))
+    boards[1, 4] = -1
+    keys = board_bytes(boards)
+    assert keys[1] == boards[1].reshape(3, 3).tobytes()
+    assert keys[0] != keys[1]
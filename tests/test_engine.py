@@ -1,3 +1,5 @@
+import pytest
+
 from game.engine import GameEngine
 
 
@@ -59,3 +61,99 @@ def test_make_move_alternates_player():
     engine.make_move(1, 1, -1)
     assert engine.state[0, 0] == 1
     assert engine.state[1, 1] == -1
+
+
+def test_undo_move_restores_position():
+    engine = GameEngine()
+    engine.make_move(0, 0, 1)
+    engine.make_move(1, 1, -1)
+    assert engine.undo_move(1, 1)
+    assert engine.state[1, 1] == 0
+    assert engine.move_count == 1
+    assert engine.undo_move(1, 1) is False
+
+
+def test_off_board_moves_raise():
+    engine = GameEngine()
+    engine.make_move(0, 2, 1)
+    line_sums = list(engine.line_sums)
+    for row, col in ((0, -1), (-1, 0), (0, 3), (3, 0)):
+        with pytest.raises(ValueError):
+            engine.undo_move(row, col)
+        with pytest.raises(ValueError):
+            engine.make_move(row, col, -1)
+    assert engine.state[0, 2] == 1
+    assert engine.line_sums == line_sums
+
+
+def test_undo_winning_move_reopens_game():
+    engine = GameEngine()
+    for j in range(3):
+        engine.make_move(0, j, 1)
+    assert engine.done
+    engine.undo_move(0, 2)
+    assert not engine.done
+    assert engine.winner is None
+    engine.make_move(0, 2, -1)
+    assert not engine.done
+
+
+def test_undo_then_replay_detects_win():
+    engine = GameEngine()
+    engine.make_move(0, 0, -1)
+    engine.make_move(1, 1, -1)
+    engine.make_move(2, 1, 1)
+    engine.undo_move(2, 1)
+    engine.make_move(2, 2, -1)
+    assert engine.winner == "Player 2"
+
+
+def test_check_winner_uses_line_sums():
+    engine = GameEngine()
+    for i in range(3):
+        engine.make_move(i, 2, 1)
+    engine.done = False
+    engine.winner = None
+    engine.check_winner()
+    assert engine.winner == "Player 1"
+
+
+def test_board_lines_count():
+    from game.lines import board_lines
+
+    lines, cell_lines = board_lines(15, 15, 5)
+    assert len(lines) == 2 * 15 * 11 + 2 * 11 * 11
+    assert max(len(ns) for ns in cell_lines) == 20
+
+
+def test_larger_board_needs_full_win_length():
+    engine = GameEngine(5, 5, 4)
+    for j in range(3):
+        engine.make_move(2, j, 1)
+    assert not engine.done
+    engine.make_move(2, 3, 1)
+    assert engine.done
+    assert engine.winner == "Player 1"
+
+
+def test_gomoku_diagonal_win():
+    engine = GameEngine(15, 15, 5)
+    for n in range(5):
+        engine.make_move(10 - n, 3 + n, -1)
+    assert engine.winner == "Player 2"
+
+
+def test_rectangular_board_tie():
+    engine = GameEngine(2, 3, 3)
+    moves = [(0, 0, 1), (0, 1, -1), (0, 2, 1), (1, 0, -1), (1, 1, 1), (1, 2, -1)]
+    for r, c, p in moves:
+        engine.make_move(r, c, p)
+    assert engine.done
+    assert engine.winner is None
+
+
+def test_invalid_win_length_raises():
+    import pytest
+
+    with pytest.raises(ValueError):
+        GameEngine(3, 3, 4)
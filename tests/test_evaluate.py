@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from game.agent import Agent
+from game.engine import make_engine
+from game.evaluate import (
+    agent_player, evaluate, load_player, perfect_player, random_player, wilson_interval,
+)
+from game.trainer import Trainer
+
+
+def test_wilson_interval():
+    low, high = wilson_interval(50, 100)
+    assert low == pytest.approx(0.4038, abs=1e-4)
+    assert high == pytest.approx(0.5962, abs=1e-4)
+    assert wilson_interval(0, 100)[0] == 0.0
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+
+
+def test_random_vs_random_matches_known_rates():
+    report = evaluate(random_player(), random_player(), 200000, seed=0)
+    assert report["p1_wins"] + report["p2_wins"] + report["ties"] == 200000
+    assert report["p1_win_rate"]["low"] < 0.585 < report["p1_win_rate"]["high"]
+    assert report["tie_rate"]["rate"] == pytest.approx(0.127, abs=0.005)
+
+
+def test_perfect_play_never_loses():
+    assert evaluate(perfect_player(), perfect_player(), 2000, seed=0)["ties"] == 2000
+    assert evaluate(random_player(), perfect_player(), 20000, seed=0)["p1_wins"] == 0
+
+
+def test_seeded_runs_repeat():
+    a = evaluate(random_player(), random_player(), 5000, seed=3, chunk_size=1000)
+    b = evaluate(random_player(), random_player(), 5000, seed=3, chunk_size=1000)
+    assert a == b
+
+
+def test_agent_player_reads_memory_without_adding():
+    agent1, agent2 = Agent(1), Agent(-1)
+    Trainer(make_engine(), agent1, agent2, episodes=300).run()
+    size = len(agent2.memory)
+    report = evaluate(random_player(), agent_player(agent2), 1000, seed=0)
+    assert report["games"] == 1000
+    assert len(agent2.memory) == size
+
+
+def test_load_player(tmp_path):
+    agent = Agent(-1)
+    agent.memory[np.zeros((3, 3)).tobytes()] = 0.5
+    path = tmp_path / "p2.dat"
+    agent.save(path)
+    assert load_player(str(path), -1).masks.shape == (3 ** 9, 9)
+    with pytest.raises(ValueError):
+        load_player("missing.dat", 1)
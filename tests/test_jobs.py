@@ -0,0 +1,92 @@
+import threading
+
+from web.jobs import JobManager, TrainingJob
+
+
+def test_job_records_stats_and_progress():
+    job = TrainingJob(progress_interval=0)
+
+    def train(progress_callback):
+        for episode in range(1, 11):
+            progress_callback(episode, 10)
+        return {"p1_wins": 1, "p2_wins": 2, "ties": 7}
+
+    job.run(train)
+    assert job.status == "done"
+    assert job.episodes_done == 10
+    assert job.stats["ties"] == 7
+
+
+def test_progress_is_throttled():
+    job = TrainingJob(progress_interval=3600)
+    job._last_publish = float("inf")
+    versions = []
+
+    def train(progress_callback):
+        for episode in range(1, 101):
+            progress_callback(episode, 100)
+            versions.append(job.version)
+        return {}
+
+    job.run(train)
+    # Only the final episode is published within the interval
+    assert len(set(versions[:-1])) == 1
+    assert job.episodes_done == 100
+
+
+def test_cancel_stops_training():
+    job = TrainingJob()
+    seen = []
+
+    def train(progress_callback):
+        for episode in range(1, 1001):
+            if episode == 5:
+                job.cancel()
+            progress_callback(episode, 1000)
+            seen.append(episode)
+        return {}
+
+    job.run(train)
+    assert job.status == "cancelled"
+    assert max(seen) == 4
+
+
+def test_failed_job_records_error():
+    job = TrainingJob()
+
+    def train(progress_callback):
+        raise RuntimeError("boom")
+
+    job.run(train)
+    assert job.status == "failed"
+    assert job.error == "boom"
+
+
+def test_manager_runs_one_job_at_a_time():
+    manager = JobManager()
+    release = threading.Event()
+
+    def train(progress_callback):
+        release.wait(5)
+        return {}
+
+    job, started = manager.start(train)
+    other, started_again = manager.start(train)
+    assert started and not started_again
+    assert other is job
+    release.set()
+    job.wait(-1, timeout=5)
+    while not job.finished:
+        job.wait(job.version, timeout=5)
+    assert manager.get(job.id).status == "done"
+
+
+def test_manager_keeps_recent_finished_jobs():
+    manager = JobManager(max_finished=2)
+    jobs = []
+    for _ in range(4):
+        job, _ = manager.start(lambda progress_callback: {})
+        while not job.finished:
+            job.wait(job.version, timeout=5)
+        jobs.append(job)
+    assert [manager.get(job.id) for job in jobs] == [None, jobs[1], jobs[2], jobs[3]]
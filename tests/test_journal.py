@@ -0,0 +1,148 @@
+import numpy as np
+import pytest
+
+from game.agent import Agent
+from game.engine import make_engine
+from game.journal import JournalWriter, iter_journal, read_header
+from game.session import GameSession
+from game.trainer import Trainer
+
+GAMES = [([0, 3, 1, 4, 2], 1), ([4, 0, 8, 2, 1, 7, 6, 3, 5], 0), ([0, 4, 1, 2, 8, 6], -1)]
+
+
+def _write(path, games, **kwargs):
+    journal = JournalWriter(path, **kwargs)
+    for cells, outcome in games:
+        journal.record(cells, outcome)
+    journal.close()
+    return journal
+
+
+def test_roundtrip_across_chunks(tmp_path):
+    path = tmp_path / "games.journal"
+    _write(path, GAMES * 100)
+    assert path.stat().st_size == 9 + 100 * (6 + 10 + 7)
+    for chunk_bytes in (1, 7, 1 << 20):
+        games = [(list(cells), outcome) for cells, outcome in iter_journal(path, chunk_bytes)]
+        assert games == GAMES * 100
+
+
+def test_appends_to_existing_journal(tmp_path):
+    path = tmp_path / "games.journal"
+    _write(path, GAMES[:1])
+    _write(path, GAMES[1:])
+    assert [outcome for _, outcome in iter_journal(path)] == [1, 0, -1]
+    with pytest.raises(ValueError):
+        JournalWriter(path, rows=4, cols=4, win_length=3)
+
+
+def test_background_flush(tmp_path):
+    path = tmp_path / "games.journal"
+    journal = JournalWriter(path, flush_bytes=1 << 20, flush_interval=60)
+    journal.record(*GAMES[0])
+    assert list(iter_journal(path)) == []  # still buffered
+    journal.flush()
+    assert len(list(iter_journal(path))) == 1
+    journal.close()
+    with pytest.raises(ValueError):
+        journal.record(*GAMES[0])
+
+
+def test_truncated_tail_is_skipped(tmp_path):
+    path = tmp_path / "games.journal"
+    _write(path, GAMES)
+    with open(path, "ab") as f:
+        f.write(bytes([0, 4, 1]))
+    assert len(list(iter_journal(path))) == 3
+    (tmp_path / "other").write_bytes(b"nope")
+    with pytest.raises(ValueError):
+        read_header(tmp_path / "other")
+
+
+def test_session_records_finished_games(tmp_path):
+    journal = JournalWriter(tmp_path / "games.journal")
+    session = GameSession(journal=journal)
+    session.new_game("human-human")
+    for row, col in ((0, 0), (1, 0), (0, 1), (1, 1)):
+        session.make_move(row, col)
+    assert journal.games == 0
+    session.make_move(0, 2)
+    session.new_game("human-ai")
+    while not session.get_state()["done"]:
+        board = session.get_state()["board"]
+        session.make_move(*next((r, c) for r in range(3) for c in range(3) if board[r][c] == 0))
+    session.new_game("human-human", rows=4, cols=4)
+    for col in range(3):
+        session.make_move(0, col)
+        session.make_move(1, col)
+    journal.close()
+
+    games = list(iter_journal(tmp_path / "games.journal"))
+    assert len(games) == 2  # the 4x4 game is not on the journal's board
+    assert games[0] == (bytes([0, 3, 1, 4, 2]), 1)
+    assert games[1][1] in (-1, 0)  # the solver never loses
+
+
+@pytest.mark.parametrize("options", [{}, {"store": "array"}, {"canonical": True}])
+def test_retrain_applies_td_updates(tmp_path, options):
+    path = tmp_path / "games.journal"
+    _write(path, GAMES[:1])
+    agent1, agent2 = Agent(1, **options), Agent(-1, **options)
+    stats = Trainer(make_engine(), agent1, agent2).retrain([path], learning_rate=0.5)
+    assert stats == {"games": 1, "p1_wins": 1, "p2_wins": 0, "ties": 0}
+    assert agent1.learning_rate == Agent(1).learning_rate
+
+    board = np.zeros(9)
+    for cell, player in zip(GAMES[0][0], (1, -1, 1, -1, 1)):
+        board[cell] = player
+        if cell == 1:
+            second_move = board.copy()
+    assert agent1.memory[agent1.state_key(board.reshape(3, 3))] == 1
+    assert agent1.memory[agent1.state_key(second_move.reshape(3, 3))] == 0.75
+    first_reply = np.array([[1., 0, 0], [-1, 0, 0], [0, 0, 0]])
+    assert agent2.memory[agent2.state_key(first_reply)] == 0.25
+    assert len(agent1.memory) == 3 and len(agent2.memory) == 2
+
+
+def test_reopening_drops_torn_tail(tmp_path):
+    path = tmp_path / "games.journal"
+    _write(path, GAMES[:1])
+    with open(path, "ab") as f:
+        f.write(bytes([4, 0]))
+    _write(path, GAMES[1:])
+    assert list(iter_journal(path)) == [(bytes(cells), outcome) for cells, outcome in GAMES]
+
+
+@pytest.mark.parametrize("game", [([0, 3, 1, 4, 2], 0), ([0, 3, 1, 4, 2, 5], 1), ([0, 3, 1], 1)])
+def test_retrain_rejects_games_that_do_not_replay(tmp_path, game):
+    path = tmp_path / "games.journal"
+    _write(path, [game])
+    with pytest.raises(ValueError):
+        Trainer(make_engine(), Agent(1), Agent(-1)).retrain([path])
+
+
+def test_retrain_rejects_bad_outcome(tmp_path):
+    path = tmp_path / "games.journal"
+    _write(path, GAMES[:1])
+    with open(path, "ab") as f:
+        f.write(bytes([0, 4, 0x85]))
+    with pytest.raises(ValueError):
+        Trainer(make_engine(), Agent(1), Agent(-1)).retrain([path])
+
+
+def test_retrain_rejects_other_boards(tmp_path):
+    path = tmp_path / "games.journal"
+    _write(path, GAMES, rows=4, cols=4)
+    with pytest.raises(ValueError):
+        Trainer(make_engine(), Agent(1), Agent(-1)).retrain([path])
+
+
+def test_session_retrain_updates_saved_models(tmp_path):
+    path = tmp_path / "games.journal"
+    _write(path, GAMES * 10)
+    stats = GameSession.retrain([str(path)], model_dir=str(tmp_path))
+    assert stats["games"] == 30
+    agent = Agent(-1)
+    agent.load(tmp_path / "p2.dat")
+    assert len(agent.memory) > 0
+    assert (tmp_path / "p2.policy").exists()
@@ -0,0 +1,76 @@
+import numpy as np
+
+from game.agent import Agent
+from game.engine import make_engine
+from game.mcts import MCTSAgent, td_evaluator
+
+
+def test_returns_legal_move():
+    agent = MCTSAgent(-1, iterations=50)
+    state = np.zeros((3, 3))
+    state[1, 1] = 1
+    i, j, symbol = agent.choose_action(state)
+    assert state[i, j] == 0
+    assert symbol == -1
+    assert agent.playouts == 50
+
+
+def test_takes_immediate_win():
+    state = np.zeros((3, 3))
+    state[0, 0] = state[0, 1] = -1
+    state[1, 0] = state[1, 1] = 1
+    state[2, 2] = 1
+    i, j, _ = MCTSAgent(-1, iterations=300).choose_action(state)
+    assert (i, j) == (0, 2)
+
+
+def test_blocks_opponent_win():
+    state = np.zeros((3, 3))
+    state[0, 0] = state[0, 1] = 1
+    state[1, 1] = -1
+    i, j, _ = MCTSAgent(-1, iterations=500).choose_action(state)
+    assert (i, j) == (0, 2)
+
+
+def test_reuses_subtree_between_moves():
+    agent = MCTSAgent(-1, iterations=200)
+    state = np.zeros((3, 3))
+    state[0, 0] = 1
+    i, j, _ = agent.choose_action(state)
+    state[i, j] = -1
+    child = agent._root
+    reply = next(c for c in child.children)
+    state[reply.move] = 1
+    assert agent._reuse_root(state) is reply
+    agent.choose_action(state)
+    assert reply.visits >= 200
+
+
+def test_time_budget():
+    agent = MCTSAgent(1, time_budget=0.05)
+    agent.choose_action(np.zeros((3, 3)))
+    assert agent.playouts > 0
+
+
+def test_plays_on_larger_board():
+    agent = MCTSAgent(-1, iterations=100, win_length=4)
+    engine = make_engine(rows=6, cols=6, win_length=4)
+    engine.make_move(2, 2, 1)
+    i, j, _ = agent.choose_action(engine.state)
+    assert engine.make_move(i, j, -1)
+
+
+def test_td_evaluator_scores_known_leaves():
+    agent = Agent(-1)
+    state = np.zeros((3, 3))
+    state[1, 1] = -1
+    agent.memory[agent.state_key(state)] = 0.9
+    evaluate = td_evaluator(agent)
+    assert evaluate(state, -1) == 0.9
+    assert evaluate(state, 1) is None
+
+    mcts = MCTSAgent(-1, iterations=100, evaluator=evaluate)
+    start = np.zeros((3, 3))
+    start[0, 0] = 1
+    i, j, _ = mcts.choose_action(start)
+    assert start[i, j] == 0
@@ -0,0 +1,66 @@
+import pytest
+
+from game import metrics
+from game.agent import Agent
+from game.engine import make_engine
+from game.session import GameSession
+from game.trainer import Trainer
+
+
+@pytest.fixture
+def instrumented():
+    metrics.registry.reset()
+    metrics.enable()
+    yield metrics
+    metrics.disable()
+    metrics.registry.reset()
+
+
+def test_disabled_by_default_leaves_methods_untouched():
+    original = Agent.choose_action
+    metrics.enable()
+    assert Agent.choose_action is not original
+    metrics.disable()
+    assert Agent.choose_action is original
+    assert not metrics.enabled()
+
+
+def test_counts_training(instrumented):
+    agents = Agent(1), Agent(-1)
+    Trainer(make_engine(), *agents, episodes=20).run()
+    text = metrics.render()
+    assert 'tictactoe_episodes_total{trainer="Trainer"} 20' in text
+    assert "tictactoe_episode_seconds_count 20" in text
+    assert metrics.td_updates.labels().value > 0
+    assert 'tictactoe_decision_seconds_count{player="Agent"}' in text
+    assert f'tictactoe_agent_table_states{{symbol="-1"}} {len(agents[1].memory)}' in text
+
+
+def test_counts_session_moves(instrumented):
+    session = GameSession()
+    session.new_game("human-human")
+    session.make_move(0, 0)
+    session.make_move(1, 1)
+    assert metrics.moves.labels().value == 2
+    assert "tictactoe_move_seconds_count 2" in metrics.render()
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = metrics.Histogram("t_seconds", "test", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value)
+    lines = histogram.render().splitlines()
+    assert lines[:2] == ["# HELP t_seconds test", "# TYPE t_seconds histogram"]
+    assert lines[2:6] == [
+        't_seconds_bucket{le="0.1"} 1',
+        't_seconds_bucket{le="1.0"} 3',
+        't_seconds_bucket{le="+Inf"} 4',
+        "t_seconds_sum 6.05",
+    ]
+    assert lines[6] == "t_seconds_count 4"
+
+
+def test_table_bytes():
+    agent = Agent(1, store="array")
+    assert metrics.table_bytes(agent.memory) == agent.memory.nbytes
+    assert metrics.table_bytes({b"x": 0.5}) > 0
@@ -0,0 +1,57 @@
+import os
+
+from game.model_cache import ModelCache
+
+
+def _write(path, text):
+    path.write_text(text)
+
+
+def test_loads_once_and_counts_hits(tmp_path):
+    path = tmp_path / "model.dat"
+    _write(path, "v1")
+    loads = []
+    cache = ModelCache(check_interval=0)
+
+    def loader(p):
+        loads.append(p)
+        return open(p).read()
+
+    assert cache.get(str(path), loader) == "v1"
+    assert cache.get(str(path), loader) == "v1"
+    assert len(loads) == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_missing_file_returns_none(tmp_path):
+    cache = ModelCache()
+    assert cache.get(str(tmp_path / "missing.dat"), open) is None
+    assert cache.misses == 1
+
+
+def test_reloads_replaced_file(tmp_path):
+    path = tmp_path / "model.dat"
+    _write(path, "v1")
+    cache = ModelCache(check_interval=0)
+    old = cache.get(str(path), lambda p: open(p).read())
+
+    replacement = tmp_path / "model.tmp"
+    _write(replacement, "version 2")
+    os.replace(replacement, path)
+
+    assert cache.get(str(path), lambda p: open(p).read()) == "version 2"
+    assert old == "v1"
+    assert cache.reloads == 1
+
+
+def test_check_interval_skips_stat_until_invalidated(tmp_path):
+    path = tmp_path / "model.dat"
+    _write(path, "v1")
+    cache = ModelCache(check_interval=3600)
+    cache.get(str(path), lambda p: open(p).read())
+    _write(path, "version 2")
+    assert cache.get(str(path), lambda p: open(p).read()) == "v1"
+
+    cache.invalidate()
+    assert cache.get(str(path), lambda p: open(p).read()) == "version 2"
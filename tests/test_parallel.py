@@ -0,0 +1,44 @@
+from game.agent import Agent
+from game.parallel import ParallelTrainer, merge_memories
+
+
+def test_merge_is_visit_weighted():
+    merged = merge_memories([
+        ({"a": 1.0, "b": 0.2}, {"a": 3}),
+        ({"a": 0.0, "b": 0.6}, {"a": 1}),
+    ])
+    assert merged["a"] == 0.75
+    assert merged["b"] == 0.4
+
+
+def test_merge_keeps_states_seen_by_one_worker():
+    merged = merge_memories([({"a": 0.9}, {"a": 2}), ({"c": 0.1}, {})])
+    assert merged == {"a": 0.9, "c": 0.1}
+
+
+def test_parallel_training_merges_worker_tables():
+    agent1 = Agent(1)
+    agent2 = Agent(-1)
+    stats = ParallelTrainer(agent1, agent2, episodes=101, workers=2).run()
+    assert stats["p1_wins"] + stats["p2_wins"] + stats["ties"] == 101
+    assert [w["episodes"] for w in stats["workers"]] == [51, 50]
+    assert stats["seconds"] > 0
+    assert stats["parallelism"] > 0
+    assert agent2.memory
+    assert any(v != 0.5 for v in agent2.memory.values())
+
+
+def test_parallel_batched_training_reports_progress():
+    calls = []
+    ParallelTrainer(Agent(1), Agent(-1), episodes=60, workers=2, batch_size=16).run(
+        lambda done, total: calls.append((done, total))
+    )
+    assert calls[-1] == (60, 60)
+
+
+def test_parallel_training_keeps_array_store():
+    agent1 = Agent(1, store="array")
+    agent2 = Agent(-1, store="array")
+    ParallelTrainer(agent1, agent2, episodes=40, workers=2).run()
+    assert agent2.store == "array"
+    assert len(agent2.memory) > 0
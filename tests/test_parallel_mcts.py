@@ -0,0 +1,29 @@
+import numpy as np
+
+from game.mcts import MCTSAgent
+from game.parallel_mcts import ParallelMCTSAgent, get_pool
+
+
+def test_root_visits_cover_legal_moves():
+    state = np.zeros((3, 3))
+    state[1, 1] = 1
+    visits = MCTSAgent(-1, iterations=200).root_visits(state)
+    assert set(visits) == {(i, j) for i in range(3) for j in range(3) if (i, j) != (1, 1)}
+    assert sum(visits.values()) == 200
+
+
+def test_parallel_search_merges_worker_playouts():
+    agent = ParallelMCTSAgent(-1, workers=2, iterations=300)
+    state = np.zeros((3, 3))
+    state[0, 0] = state[0, 1] = 1
+    state[1, 1] = -1
+    i, j, symbol = agent.choose_action(state)
+    assert (i, j, symbol) == (0, 2, -1)
+    assert agent.playouts == 600
+    assert agent.merge_seconds >= 0
+
+
+def test_pool_is_reused_between_moves():
+    pool = get_pool(2)
+    ParallelMCTSAgent(1, workers=2, iterations=20).choose_action(np.zeros((3, 3)))
+    assert get_pool(2) is pool
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from game.agent import Agent
+from game.policy import PolicyTable, export_policy
+from game.solver import SolverAgent
+from game.trainer import Trainer
+from game.engine import make_engine
+
+
+def test_solver_policy_matches_solver(tmp_path):
+    path = tmp_path / "solver.policy"
+    solver = SolverAgent(-1)
+    export_policy(solver, path)
+    table = PolicyTable(path)
+
+    state = np.zeros((3, 3))
+    state[0, 0] = 1
+    assert table.choose_action(state) == solver.choose_action(state, greedy=True)
+    assert table.value(state) == solver.value(state)
+    table.close()
+
+
+def test_agent_policy_matches_greedy_agent(tmp_path):
+    agent1 = Agent(1)
+    agent2 = Agent(-1)
+    Trainer(make_engine(), agent1, agent2, episodes=300).run()
+    path = tmp_path / "p2.policy"
+    export_policy(agent2, path)
+    table = PolicyTable(path)
+
+    state = np.zeros((3, 3))
+    state[1, 1] = 1
+    i, j, symbol = table.choose_action(state)
+    assert symbol == -1
+    state[i, j] = symbol
+    best = agent2.memory.get(state.tobytes(), 0.5)
+    state[i, j] = 0
+    for r, c in zip(*np.nonzero(state == 0)):
+        state[r, c] = -1
+        assert agent2.memory.get(state.tobytes(), 0.5) <= best
+        state[r, c] = 0
+    table.close()
+
+
+def test_export_does_not_grow_agent_memory(tmp_path):
+    agent = Agent(-1)
+    export_policy(agent, tmp_path / "p2.policy")
+    assert agent.memory == {}
+
+
+def test_export_without_values(tmp_path):
+    path = tmp_path / "p2.policy"
+    export_policy(SolverAgent(1), path, with_values=False)
+    table = PolicyTable(path)
+    with pytest.raises(ValueError):
+        table.value(np.zeros((3, 3)))
+    table.close()
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "bogus.policy"
+    path.write_bytes(b"not a policy file at all")
+    with pytest.raises(ValueError):
+        PolicyTable(path)
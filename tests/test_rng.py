@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from game.agent import Agent
+from game.batch_trainer import BatchTrainer
+from game.engine import make_engine
+from game.rng import RandomStream, spawn
+from game.session import GameSession
+from game.trainer import Trainer, schedule
+
+
+def test_stream_repeats_for_a_seed():
+    a, b = RandomStream(7, block=16), RandomStream(7, block=16)
+    draws = [a.random() for _ in range(40)]
+    assert draws == [b.random() for _ in range(40)]
+    assert draws[:16] == np.random.default_rng(7).random(16).tolist()
+    assert all(0 <= a.randrange(3) < 3 for _ in range(100))
+    items = list(range(10))
+    a.shuffle(items)
+    assert sorted(items) == list(range(10))
+
+
+def test_spawn_gives_independent_reproducible_seeds():
+    first, second = spawn(1, 2)
+    assert np.random.default_rng(first).random() != np.random.default_rng(second).random()
+    assert np.random.default_rng(spawn(1, 2)[0]).random() == np.random.default_rng(first).random()
+
+
+def test_schedule_is_vectorized():
+    epsilon, lr_scale, use_random_p1 = schedule(np.random.default_rng(0), 0, 1000, 1000)
+    assert epsilon[0] == pytest.approx(0.1)
+    assert lr_scale[-1] == pytest.approx(0.1009)
+    assert use_random_p1[:100].mean() > use_random_p1[-100:].mean()
+
+
+@pytest.mark.parametrize("make_trainer", [
+    lambda a1, a2, seed: Trainer(make_engine(), a1, a2, episodes=300, seed=seed),
+    lambda a1, a2, seed: BatchTrainer(a1, a2, episodes=300, batch_size=64, seed=seed),
+])
+def test_seeded_trainers_repeat(make_trainer):
+    runs = []
+    for _ in range(2):
+        agent1, agent2 = Agent(1, seed=1), Agent(-1, seed=2)
+        stats = make_trainer(agent1, agent2, 3).run()
+        runs.append((stats, list(agent1.memory.items()), list(agent2.memory.items())))
+    assert runs[0] == runs[1]
+
+
+@pytest.mark.parametrize("options", [{}, {"batch_size": 64}, {"workers": 2, "batch_size": 64}])
+def test_seeded_training_writes_identical_models(tmp_path, options):
+    for run in ("a", "b"):
+        GameSession.train(episodes=400, model_dir=str(tmp_path / run), seed=42, **options)
+    for name in ("p1.dat", "p2.dat", "p2.policy"):
+        assert (tmp_path / "a" / name).read_bytes() == (tmp_path / "b" / name).read_bytes()
+
+
+def test_different_seeds_differ(tmp_path):
+    for seed in (1, 2):
+        GameSession.train(episodes=200, model_dir=str(tmp_path / str(seed)), seed=seed)
+    assert (tmp_path / "1" / "p2.dat").read_bytes() != (tmp_path / "2" / "p2.dat").read_bytes()
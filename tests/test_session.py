@@ -1,9 +1,10 @@
 import json
 import os
 
+import numpy as np
 import pytest
 
-from game.session import GameSession
+from game.session import GameSession, preload
 from game.config import MODEL_DIR
 
 
@@ -117,3 +118,139 @@ def test_new_game_resets_state():
     assert state["board"] == [[0, 0, 0]] * 3
     assert state["current_player"] == 1
     assert state["done"] is False
+
+
+def test_human_ai_without_model_uses_solver(monkeypatch, tmp_path):
+    monkeypatch.setattr("game.session.MODEL_DIR", str(tmp_path))
+    session = GameSession()
+    session.new_game("human-ai")
+    state = session.make_move(0, 0)
+    assert "ai_move" in state
+    assert state["ai_move"] == [1, 1]  # the only move that avoids a loss
+
+
+def test_human_ai_uses_exported_policy(monkeypatch, tmp_path):
+    from game.policy import PolicyTable, export_policy
+    from game.solver import SolverAgent
+
+    monkeypatch.setattr("game.session.MODEL_DIR", str(tmp_path))
+    export_policy(SolverAgent(-1), tmp_path / "p2.policy")
+    session = GameSession()
+    session.new_game("human-ai")
+    assert isinstance(session._ai, PolicyTable)
+    state = session.make_move(0, 0)
+    assert state["ai_move"] == [1, 1]
+
+
+def test_human_ai_games_share_cached_model(monkeypatch, tmp_path):
+    from game.agent import Agent
+    from game.model_cache import ModelCache
+
+    monkeypatch.setattr("game.session.MODEL_DIR", str(tmp_path))
+    cache = ModelCache()
+    monkeypatch.setattr("game.session.model_cache", cache)
+    Agent(-1).save(tmp_path / "p2.dat")
+
+    first, second = GameSession(), GameSession()
+    first.new_game("human-ai")
+    second.new_game("human-ai")
+    assert first._ai is not second._ai
+    assert first._ai.memory is second._ai.memory
+    assert first._ai.rng is not second._ai.rng
+    first.make_move(0, 0)
+    assert len(first._ai.memory) == 0  # the cached model is never written
+    assert cache.stats()["models"] == 1
+    assert cache.hits == 1
+
+
+def test_preload_warms_model_cache(monkeypatch, tmp_path):
+    from game.agent import Agent
+    from game.model_cache import ModelCache
+
+    monkeypatch.setattr("game.session.MODEL_DIR", str(tmp_path))
+    cache = ModelCache()
+    monkeypatch.setattr("game.session.model_cache", cache)
+    Agent(-1).save(tmp_path / "p2.dat")
+
+    preload()
+    assert cache.stats()["models"] == 1
+    GameSession().new_game("human-ai")
+    assert cache.hits == 1
+
+
+def test_human_human_game_loads_no_ai_modules():
+    from benchmarks.bench_startup import run_game
+
+    for module in ("cli", "web.app", "web.asgi"):
+        assert run_game(module)[1] == []
+
+
+def test_new_game_with_board_size():
+    session = GameSession()
+    state = session.new_game("human-human", rows=5, cols=5, win_length=4)
+    assert state["board"] == [[0] * 5] * 5
+    for j in range(3):
+        session.make_move(0, j)
+        state = session.make_move(4, j)
+    assert state["done"] is False
+    state = session.make_move(0, 3)
+    assert state["winner"] == "Player 1"
+    state = session.new_game("human-human")
+    assert len(state["board"]) == 5  # size persists until changed
+
+
+def test_larger_board_models_use_sized_names(monkeypatch, tmp_path):
+    from game.session import model_path
+
+    monkeypatch.setattr("game.session.MODEL_DIR", str(tmp_path))
+    assert model_path("p2.dat") == str(tmp_path / "p2.dat")
+    assert model_path("p2.dat", 15, 15, 5) == str(tmp_path / "p2_15x15k5.dat")
+
+
+def test_larger_board_human_ai_uses_mcts(monkeypatch, tmp_path):
+    from game.mcts import MCTSAgent
+
+    monkeypatch.setattr("game.session.MODEL_DIR", str(tmp_path))
+    session = GameSession()
+    session.new_game("human-ai", rows=5, cols=5, win_length=4)
+    assert isinstance(session._ai, MCTSAgent)
+    state = session.make_move(2, 2)
+    assert "ai_move" in state
+
+
+def test_evaluate_positions_without_model_uses_solver(monkeypatch, tmp_path):
+    monkeypatch.setattr("game.session.MODEL_DIR", str(tmp_path))
+    result = GameSession.evaluate_positions(boards=[
+        [[1, 0, 0], [0, 0, 0], [0, 0, 0]],
+        [[1, 1, 1], [-1, -1, 0], [0, 0, 0]],
+    ])
+    assert result["player"] == [-1, -1]
+    assert result["moves"] == [[1, 1], None]
+    assert result["values"] == [0, None]
+    assert result["source"] == {"1": "solver", "-1": "solver"}
+    assert GameSession.evaluate_positions(codes=[9841])["moves"] == [[0, 0]]
+
+
+def test_evaluate_positions_uses_trained_models(monkeypatch, tmp_path):
+    from game.agent import Agent
+
+    monkeypatch.setattr("game.session.MODEL_DIR", str(tmp_path))
+    for symbol, name in ((1, "p1.dat"), (-1, "p2.dat")):
+        agent = Agent(symbol)
+        agent.memory[agent.state_key(np.array([[0., 0, 1], [0, 0, 0], [0, 0, 0]]))] = 0.8
+        agent.memory[agent.state_key(np.array([[0., 0, 1], [0, 0, 0], [0, 0, -1]]))] = 0.7
+        agent.save(tmp_path / name)
+    result = GameSession.evaluate_positions(boards=[[0] * 9, [0, 0, 1, 0, 0, 0, 0, 0, 0]])
+    assert result["moves"] == [[0, 2], [2, 2]]
+    assert result["values"] == [0.8, 0.7]
+    assert result["source"] == {"1": "model", "-1": "model"}
+
+
+@pytest.mark.parametrize("kwargs", [
+    {}, {"boards": [[2] * 9]}, {"boards": [[1] * 9]}, {"boards": [[0] * 8]},
+    {"codes": [-1]}, {"codes": ["x"]}, {"boards": [[0] * 9], "codes": [0]},
+    {"codes": 5}, {"codes": True}, {"codes": [2 ** 63]}, {"codes": [True]},
+])
+def test_evaluate_positions_rejects_bad_input(kwargs):
+    with pytest.raises(ValueError):
+        GameSession.evaluate_positions(**kwargs)
@@ -0,0 +1,48 @@
+from web.sessions import SessionStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_create_and_acquire():
+    store = SessionStore()
+    game_id, session = store.create()
+    with store.acquire(game_id) as found:
+        assert found is session
+
+
+def test_unknown_game_yields_none():
+    store = SessionStore()
+    with store.acquire("missing") as found:
+        assert found is None
+
+
+def test_lru_eviction_at_capacity():
+    store = SessionStore(max_games=2)
+    first, _ = store.create()
+    second, _ = store.create()
+    with store.acquire(first):
+        pass  # first is now most recently used
+    third, _ = store.create()
+    assert first in store
+    assert second not in store
+    assert third in store
+    assert store.evictions == 1
+
+
+def test_idle_games_expire():
+    clock = FakeClock()
+    store = SessionStore(ttl=60, clock=clock)
+    old, _ = store.create()
+    clock.now = 30
+    recent, _ = store.create()
+    clock.now = 70
+    with store.acquire(recent) as session:
+        assert session is not None
+    assert old not in store
+    assert len(store) == 1
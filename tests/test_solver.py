@@ -0,0 +1,57 @@
+import numpy as np
+
+from game.encoding import EMPTY_INDEX
+from game.engine import make_engine
+from game.solver import Solver, SolverAgent, solved
+
+
+def test_solves_every_reachable_position():
+    solver = solved()
+    # 5478 reachable positions, 958 of them terminal
+    assert len(solver.values) == 4520
+    assert solver.values[EMPTY_INDEX] == 0
+
+
+def test_solved_table_is_shared():
+    assert SolverAgent(1).solver is SolverAgent(-1).solver
+
+
+def test_takes_immediate_win():
+    state = np.zeros((3, 3))
+    state[0, 0] = state[0, 1] = 1
+    state[1, 0] = state[1, 1] = -1
+    i, j, symbol = SolverAgent(1).choose_action(state, greedy=True)
+    assert (i, j, symbol) == (0, 2, 1)
+
+
+def test_blocks_opponent_win():
+    state = np.zeros((3, 3))
+    state[0, 0] = state[0, 1] = 1
+    state[1, 1] = -1
+    i, j, _ = SolverAgent(-1).choose_action(state, greedy=True)
+    assert (i, j) == (0, 2)
+
+
+def test_solver_never_loses_to_random_play():
+    rng = np.random.default_rng(0)
+    ai = SolverAgent(-1)
+    engine = make_engine()
+    for _ in range(200):
+        engine.reset()
+        player = 1
+        while not engine.done:
+            if player == 1:
+                moves = engine.get_valid_moves()
+                r, c = moves[rng.integers(len(moves))]
+                engine.make_move(r, c, 1)
+            else:
+                i, j, sym = ai.choose_action(engine.state)
+                engine.make_move(i, j, sym)
+            player = -player
+        assert engine.winner != "Player 1"
+
+
+def test_self_play_is_a_draw():
+    solver = Solver().solve()
+    assert solver.values[EMPTY_INDEX] == 0
+    assert len(solver.best_moves[EMPTY_INDEX]) == 9
@@ -0,0 +1,33 @@
+from game.store import ArrayStore
+
+
+def test_unseen_keys_default_to_half():
+    store = ArrayStore()
+    assert 5 not in store
+    assert store.setdefault(5) == 0.5
+    assert 5 in store
+    assert len(store) == 1
+
+
+def test_set_get_and_items():
+    store = ArrayStore()
+    store[10] = 0.25
+    store[3] = 1.0
+    assert store[10] == 0.25
+    assert dict(store.items()) == {3: 1.0, 10: 0.25}
+    assert store.get(4) is None
+
+
+def test_lookup_marks_keys_seen():
+    store = ArrayStore()
+    values = store.lookup([1, 2, 3])
+    assert values.tolist() == [0.5, 0.5, 0.5]
+    assert len(store) == 3
+
+
+def test_copy_is_independent():
+    store = ArrayStore()
+    store[1] = 0.9
+    other = store.copy()
+    other[1] = 0.1
+    assert store[1] != other[1]
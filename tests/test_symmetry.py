@@ -0,0 +1,48 @@
+import numpy as np
+
+from game.agent import Agent
+from game.symmetry import CANONICAL, canonical, canonical_many
+
+
+def test_symmetric_boards_share_canonical_index():
+    state = np.zeros((3, 3))
+    state[0, 1] = 1
+    state[1, 1] = -1
+    variants = []
+    for k in range(4):
+        rotated = np.rot90(state, k)
+        variants += [rotated, np.fliplr(rotated)]
+    assert len({canonical(v) for v in variants}) == 1
+
+
+def test_distinct_positions_stay_distinct():
+    corner = np.zeros((3, 3))
+    corner[0, 0] = 1
+    edge = np.zeros((3, 3))
+    edge[0, 1] = 1
+    assert canonical(corner) != canonical(edge)
+
+
+def test_number_of_symmetry_classes():
+    # Burnside's lemma: (3^9 + 2*3^3 + 3^5 + 4*3^6) / 8
+    assert len(set(CANONICAL.tolist())) == 2862
+
+
+def test_canonical_many_matches_canonical():
+    rng = np.random.default_rng(1)
+    boards = rng.integers(-1, 2, size=(20, 9)).astype(float)
+    assert canonical_many(boards).tolist() == [canonical(b.reshape(3, 3)) for b in boards]
+
+
+def test_canonical_agent_shares_values_across_symmetries():
+    agent = Agent(1, canonical=True)
+    state = np.zeros((3, 3))
+    state[0, 0] = 1
+    agent.memory[agent.state_key(state)] = 1.0
+
+    # With (0, 0) valued highest, every corner is an equally good move.
+    i, j, _ = agent.choose_action(np.zeros((3, 3)), greedy=True)
+    assert (i, j) in {(0, 0), (0, 2), (2, 0), (2, 2)}
+    assert len(agent.memory) == 1  # greedy play only reads
+    agent.choose_action(np.zeros((3, 3)))
+    assert len(agent.memory) == 3  # corner, edge and centre classes
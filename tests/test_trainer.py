@@ -22,3 +22,18 @@ def test_training_returns_stats():
     assert "p2_wins" in stats
     assert "ties" in stats
     assert stats["p1_wins"] + stats["p2_wins"] + stats["ties"] == 100
+
+
+def test_training_on_larger_board():
+    engine = GameEngine(4, 4, 3)
+    agent1 = Agent(1)
+    agent2 = Agent(-1)
+    stats = Trainer(engine, agent1, agent2, episodes=20).run()
+    assert stats["p1_wins"] + stats["p2_wins"] + stats["ties"] == 20
+    assert agent2.memory
+
+
+def test_training_on_single_line_boards():
+    for rows, cols in ((1, 9), (9, 1)):
+        stats = Trainer(GameEngine(rows, cols, 3), Agent(1), Agent(-1), episodes=20).run()
+        assert stats["p1_wins"] + stats["p2_wins"] + stats["ties"] == 20
@@ -1,9 +1,45 @@
-from flask import Flask, jsonify, render_template, request
+import functools
+import json
 
-from game.session import GameSession
+from flask import Flask, Response, abort, jsonify, render_template, request
+
+from game import metrics
+from game.config import METRICS_ENABLED, PRELOAD_MODELS
+from game.model_cache import model_cache
+from game.session import GameSession, preload
+from web.jobs import JobManager
+from web.params import board_size, move_position, training_options
+from web.sessions import SessionStore
 
 app = Flask(__name__)
-session = GameSession()
+sessions = SessionStore()
+jobs = JobManager()
+if METRICS_ENABLED:
+    metrics.enable()
+if PRELOAD_MODELS:
+    preload()
+
+
+def _bad_request(message):
+    abort(Response(json.dumps({"error": message}), 400, mimetype="application/json"))
+
+
+def _json():
+    """The JSON body as a dict; an empty dict without one. Aborts with 400 for other JSON values."""
+    data = request.get_json(silent=True)
+    if data is None:
+        return {}
+    if not isinstance(data, dict):
+        _bad_request("Request body must be a JSON object.")
+    return data
+
+
+def _game_id():
+    """Game id from the JSON body, falling back to the ``game_id`` cookie."""
+    game_id = _json().get("game_id") or request.cookies.get("game_id")
+    if game_id is not None and not isinstance(game_id, str):
+        _bad_request("game_id must be a string.")
+    return game_id
 
 
 @app.route("/")
@@ -13,32 +49,117 @@ def index():
 
 @app.route("/api/new-game", methods=["POST"])
 def new_game():
-    mode = request.json.get("mode")
-    try:
-        state = session.new_game(mode)
-    except ValueError as e:
-        return jsonify({"error": str(e)}), 400
-    return jsonify(state)
+    mode = _json().get("mode")
+    game_id = _game_id()
+    with sessions.acquire(game_id) as session:
+        if session is None:
+            # A fresh id is not shared with any other client yet.
+            game_id, session = sessions.create()
+        try:
+            state = session.new_game(mode, **board_size(_json()))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+    response = jsonify({**state, "game_id": game_id})
+    response.set_cookie("game_id", game_id, httponly=True, samesite="Strict")
+    return response
 
 
 @app.route("/api/move", methods=["POST"])
 def move():
-    row = request.json.get("row")
-    col = request.json.get("col")
-    state = session.make_move(row, col)
-    return jsonify(state)
+    game_id = _game_id()
+    with sessions.acquire(game_id) as session:
+        if session is None:
+            return jsonify({"error": "Unknown or expired game. Start a new game."}), 404
+        try:
+            row, col = move_position(_json())
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        state = session.make_move(row, col)
+    return jsonify({**state, "game_id": game_id})
 
 
 @app.route("/api/train", methods=["POST"])
 def train():
-    stats = GameSession.train()
+    try:
+        options = training_options(_json())
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    stats = GameSession.train(**options)
     return jsonify(stats)
 
 
+@app.route("/api/train/jobs", methods=["POST"])
+def start_training_job():
+    try:
+        options = training_options(_json())
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    job, started = jobs.start(functools.partial(GameSession.train, **options))
+    return jsonify(job.to_dict()), 202 if started else 409
+
+
+@app.route("/api/train/jobs/<job_id>")
+def training_job(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown training job."}), 404
+    return jsonify(job.to_dict())
+
+
+@app.route("/api/train/jobs/<job_id>/cancel", methods=["POST"])
+def cancel_training_job(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown training job."}), 404
+    job.cancel()
+    return jsonify(job.to_dict())
+
+
+@app.route("/api/train/jobs/<job_id>/events")
+def training_job_events(job_id):
+    """Server-sent events with the job's state after each progress update."""
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown training job."}), 404
+
+    def stream():
+        version = -1
+        while True:
+            version = job.wait(version, timeout=15)
+            yield f"data: {json.dumps(job.to_dict())}\n\n"
+            if job.finished:
+                return
+
+    return Response(stream(), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache"})
+
+
+@app.route("/api/evaluate", methods=["POST"])
+def evaluate_positions():
+    """AI move and value for a batch of ``boards`` or ``codes``."""
+    data = _json()
+    try:
+        return jsonify(GameSession.evaluate_positions(data.get("boards"), data.get("codes")))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+
 @app.route("/api/model-exists")
 def model_exists():
     return jsonify({"exists": GameSession.model_exists()})
 
 
+@app.route("/api/model-cache")
+def model_cache_stats():
+    return jsonify(model_cache.stats())
+
+
+@app.route("/metrics")
+def metrics_text():
+    """Prometheus scrape endpoint. Empty series unless metrics are enabled."""
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+
 if __name__ == "__main__":
     app.run(debug=True)
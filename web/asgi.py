@@ -0,0 +1,361 @@
+"""The game API as a plain ASGI 3 application, with no dependencies.
+
+Same routes and JSON contract as :mod:`web.app`. Handlers run on the event
+loop and hand all game work (session locks, AI moves) to a thread pool,
+and training to a separate single-thread pool, so a slow AI decision or a
+training run never blocks other connections.
+
+Serve it with any ASGI server (``uvicorn web.asgi:app``) or the bundled
+asyncio server: ``python -m web.asgi --port 8000``.
+"""
+import asyncio
+import functools
+import json
+import logging
+import mimetypes
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.cookies import SimpleCookie
+
+from game import metrics
+from game.config import ASGI_THREADS, METRICS_ENABLED, PRELOAD_MODELS
+from game.model_cache import model_cache
+from game.session import GameSession, preload
+from web.jobs import JobManager
+from web.params import board_size, move_position, training_options
+from web.sessions import SessionStore
+
+WEB_DIR = os.path.dirname(os.path.abspath(__file__))
+
+sessions = SessionStore()
+jobs = JobManager()
+executor = ThreadPoolExecutor(ASGI_THREADS, thread_name_prefix="asgi-game")
+training_executor = ThreadPoolExecutor(1, thread_name_prefix="asgi-train")
+if METRICS_ENABLED:
+    metrics.enable()
+if PRELOAD_MODELS:
+    preload()
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class Request:
+    def __init__(self, scope, body):
+        self.method = scope["method"]
+        self.path = scope["path"]
+        self.headers = {k.decode("latin-1").lower(): v.decode("latin-1")
+                        for k, v in scope.get("headers", [])}
+        self.body = body
+
+    @functools.cached_property
+    def json(self):
+        """The parsed JSON body; an empty dict for an empty body."""
+        if not self.body:
+            return {}
+        try:
+            data = json.loads(self.body)
+        except ValueError:
+            raise HTTPError(400, "Request body is not valid JSON.") from None
+        if not isinstance(data, dict):
+            raise HTTPError(400, "Request body must be a JSON object.")
+        return data
+
+    @functools.cached_property
+    def cookies(self):
+        cookie = SimpleCookie()
+        cookie.load(self.headers.get("cookie", ""))
+        return {name: morsel.value for name, morsel in cookie.items()}
+
+    def game_id(self):
+        """Game id from the JSON body, falling back to the ``game_id`` cookie."""
+        game_id = self.json.get("game_id") or self.cookies.get("game_id")
+        if game_id is not None and not isinstance(game_id, str):
+            raise HTTPError(400, "game_id must be a string.")
+        return game_id
+
+
+class Response:
+    def __init__(self, body=b"", status=200, content_type="application/json", headers=()):
+        self.body = body
+        self.status = status
+        self.headers = [(b"content-type", content_type.encode())]
+        self.headers += [(k.encode(), v.encode()) for k, v in headers]
+
+    async def __call__(self, send):
+        await send({"type": "http.response.start", "status": self.status,
+                    "headers": self.headers + [(b"content-length", str(len(self.body)).encode())]})
+        await send({"type": "http.response.body", "body": self.body})
+
+
+class StreamingResponse(Response):
+    """Response whose body is produced by an async iterator of bytes."""
+
+    def __init__(self, chunks, content_type, headers=()):
+        super().__init__(b"", 200, content_type, headers)
+        self.chunks = chunks
+
+    async def __call__(self, send):
+        await send({"type": "http.response.start", "status": self.status, "headers": self.headers})
+        async for chunk in self.chunks:
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+
+
+def json_response(data, status=200, headers=()):
+    return Response(json.dumps(data).encode(), status, headers=headers)
+
+
+async def offload(fn, *args, pool=None):
+    """Run ``fn(*args)`` on a worker thread and await its result."""
+    return await asyncio.get_running_loop().run_in_executor(pool or executor, fn, *args)
+
+
+ROUTES = []
+
+
+def route(method, pattern):
+    def register(handler):
+        ROUTES.append((method, re.compile(pattern + "$"), handler))
+        return handler
+    return register
+
+
+async def _file_response(path):
+    content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    if content_type.startswith("text/") or content_type.endswith("javascript"):
+        content_type += "; charset=utf-8"
+    return Response(await offload(_read_file, path), content_type=content_type)
+
+
+def _read_file(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+@route("GET", "/")
+async def index(request):
+    return await _file_response(os.path.join(WEB_DIR, "templates", "index.html"))
+
+
+@route("GET", "/static/(?P<name>.+)")
+async def static_file(request, name):
+    static_dir = os.path.join(WEB_DIR, "static")
+    path = os.path.normpath(os.path.join(static_dir, name))
+    if not path.startswith(static_dir + os.sep) or not os.path.isfile(path):
+        raise HTTPError(404, "Not found.")
+    return await _file_response(path)
+
+
+def _new_game(body, game_id):
+    mode = body.get("mode")
+    with sessions.acquire(game_id) as session:
+        if session is None:
+            # A fresh id is not shared with any other client yet.
+            game_id, session = sessions.create()
+        try:
+            state = session.new_game(mode, **board_size(body))
+        except ValueError as e:
+            return 400, {"error": str(e)}
+    return 200, {**state, "game_id": game_id}
+
+
+@route("POST", "/api/new-game")
+async def new_game(request):
+    status, data = await offload(_new_game, request.json, request.game_id())
+    if status != 200:
+        return json_response(data, status)
+    cookie = f"game_id={data['game_id']}; HttpOnly; Path=/; SameSite=Strict"
+    return json_response(data, headers=[("set-cookie", cookie)])
+
+
+def _move(body, game_id):
+    with sessions.acquire(game_id) as session:
+        if session is None:
+            return 404, {"error": "Unknown or expired game. Start a new game."}
+        try:
+            row, col = move_position(body)
+        except ValueError as e:
+            return 400, {"error": str(e)}
+        state = session.make_move(row, col)
+    return 200, {**state, "game_id": game_id}
+
+
+@route("POST", "/api/move")
+async def move(request):
+    status, data = await offload(_move, request.json, request.game_id())
+    return json_response(data, status)
+
+
+def _training_options(request):
+    try:
+        return training_options(request.json)
+    except ValueError as e:
+        raise HTTPError(400, str(e)) from None
+
+
+@route("POST", "/api/train")
+async def train(request):
+    options = _training_options(request)
+    stats = await offload(functools.partial(GameSession.train, **options), pool=training_executor)
+    return json_response(stats)
+
+
+@route("POST", "/api/train/jobs")
+async def start_training_job(request):
+    options = _training_options(request)
+    job, started = jobs.start(functools.partial(GameSession.train, **options))
+    return json_response(job.to_dict(), 202 if started else 409)
+
+
+def _job(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPError(404, "Unknown training job.")
+    return job
+
+
+@route("GET", "/api/train/jobs/(?P<job_id>[0-9a-f]+)")
+async def training_job(request, job_id):
+    return json_response(_job(job_id).to_dict())
+
+
+@route("POST", "/api/train/jobs/(?P<job_id>[0-9a-f]+)/cancel")
+async def cancel_training_job(request, job_id):
+    job = _job(job_id)
+    job.cancel()
+    return json_response(job.to_dict())
+
+
+@route("GET", "/api/train/jobs/(?P<job_id>[0-9a-f]+)/events")
+async def training_job_events(request, job_id):
+    """Server-sent events with the job's state after each progress update.
+
+    Waits on the event loop, woken by the training thread, so watchers
+    never hold one of the executor's game threads.
+    """
+    job = _job(job_id)
+
+    async def stream():
+        loop = asyncio.get_running_loop()
+        changed = asyncio.Event()
+
+        def notify():
+            try:
+                loop.call_soon_threadsafe(changed.set)
+            except RuntimeError:  # the loop has closed
+                pass
+
+        job.add_listener(notify)
+        try:
+            version = -1
+            while True:
+                if job.version <= version and not job.finished:
+                    try:
+                        await asyncio.wait_for(changed.wait(), 15)
+                    except asyncio.TimeoutError:
+                        pass
+                changed.clear()
+                version = job.version
+                yield f"data: {json.dumps(job.to_dict())}\n\n".encode()
+                if job.finished:
+                    return
+        finally:
+            job.remove_listener(notify)
+
+    return StreamingResponse(stream(), "text/event-stream", [("cache-control", "no-cache")])
+
+
+def _evaluate(body):
+    try:
+        return 200, GameSession.evaluate_positions(body.get("boards"), body.get("codes"))
+    except ValueError as e:
+        return 400, {"error": str(e)}
+
+
+@route("POST", "/api/evaluate")
+async def evaluate_positions(request):
+    status, data = await offload(_evaluate, request.json)
+    return json_response(data, status)
+
+
+@route("GET", "/api/model-exists")
+async def model_exists(request):
+    return json_response({"exists": await offload(GameSession.model_exists)})
+
+
+@route("GET", "/api/model-cache")
+async def model_cache_stats(request):
+    return json_response(model_cache.stats())
+
+
+@route("GET", "/metrics")
+async def metrics_text(request):
+    return Response(metrics.render().encode(), content_type="text/plain; version=0.0.4")
+
+
+async def _read_body(receive):
+    body = b""
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return None
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            return body
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            executor.shutdown(wait=False)
+            training_executor.shutdown(wait=False)
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    """ASGI entry point."""
+    if scope["type"] == "lifespan":
+        return await _lifespan(receive, send)
+    if scope["type"] != "http":
+        return
+
+    body = await _read_body(receive)
+    if body is None:
+        return
+    request = Request(scope, body)
+    try:
+        allowed = False
+        for method, pattern, handler in ROUTES:
+            match = pattern.match(request.path)
+            if match is None:
+                continue
+            if method != request.method:
+                allowed = True
+                continue
+            response = await handler(request, **match.groupdict())
+            break
+        else:
+            status = 405 if allowed else 404
+            raise HTTPError(status, HTTPStatus(status).phrase + ".")
+    except HTTPError as e:
+        response = json_response({"error": str(e)}, e.status)
+    except Exception:
+        logging.getLogger(__name__).exception("Error handling %s %s", request.method, request.path)
+        response = json_response({"error": "Internal Server Error."}, 500)
+    await response(send)
+
+
+if __name__ == "__main__":
+    from web.asgi_server import main
+
+    main(app)
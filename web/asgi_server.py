@@ -0,0 +1,132 @@
+"""Minimal asyncio HTTP/1.1 server for ASGI apps.
+
+Enough to run :mod:`web.asgi` without installing an ASGI server: keep-alive
+connections, ``Content-Length`` request bodies, and chunked responses for
+streamed bodies (server-sent events). Use a production server such as
+uvicorn where one is available.
+"""
+import argparse
+import asyncio
+from http import HTTPStatus
+from urllib.parse import unquote
+
+MAX_HEADER_BYTES = 64 * 1024
+
+
+async def _handle(app, reader, writer):
+    server = writer.get_extra_info("sockname")
+    client = writer.get_extra_info("peername")
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, ConnectionError):
+                return
+            except asyncio.LimitOverrunError:
+                _reject(writer, 431)
+                return
+            lines = head.decode("latin-1").split("\r\n")
+            request_line = lines[0].split(" ")
+            if len(request_line) != 3 or not request_line[2].startswith("HTTP/"):
+                _reject(writer, 400)
+                return
+            method, target, version = request_line
+            headers = []
+            for line in lines[1:]:
+                if line:
+                    name, _, value = line.partition(":")
+                    headers.append((name.strip().lower().encode("latin-1"),
+                                    value.strip().encode("latin-1")))
+            header_map = dict(headers)
+            length = header_map.get(b"content-length", b"0")
+            if not length.isdigit():
+                _reject(writer, 400)
+                return
+            try:
+                body = await reader.readexactly(int(length))
+            except (asyncio.IncompleteReadError, ConnectionError):
+                return
+            keep_alive = (version == "HTTP/1.1"
+                          and header_map.get(b"connection", b"").lower() != b"close")
+            path, _, query = target.partition("?")
+            scope = {
+                "type": "http", "asgi": {"version": "3.0"}, "http_version": version[5:],
+                "method": method, "scheme": "http", "path": unquote(path),
+                "raw_path": path.encode("latin-1"), "query_string": query.encode("latin-1"),
+                "root_path": "", "headers": headers, "client": client, "server": server,
+            }
+            keep_alive = await _run(app, scope, body, writer, keep_alive)
+            if not keep_alive:
+                return
+    finally:
+        writer.close()
+
+
+def _reject(writer, status):
+    """Answer a request the server cannot parse; the connection is then closed."""
+    writer.write(f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+                 f"Content-Length: 0\r\nConnection: close\r\n\r\n".encode())
+
+
+async def _run(app, scope, body, writer, keep_alive):
+    """Run one request through *app*. Returns whether the connection stays open."""
+    received = False
+    chunked = False
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await asyncio.Future()  # no disconnect detection: wait forever
+
+    async def send(message):
+        nonlocal chunked
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            headers = list(message.get("headers", []))
+            names = {name.lower() for name, _ in headers}
+            chunked = b"content-length" not in names
+            if chunked:
+                headers.append((b"transfer-encoding", b"chunked"))
+            if not keep_alive:
+                headers.append((b"connection", b"close"))
+            lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}".encode()]
+            lines += [name + b": " + value for name, value in headers]
+            writer.write(b"\r\n".join(lines) + b"\r\n\r\n")
+        elif message["type"] == "http.response.body":
+            data = message.get("body", b"")
+            more = message.get("more_body", False)
+            if chunked:
+                if data:
+                    writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                if not more:
+                    writer.write(b"0\r\n\r\n")
+            else:
+                writer.write(data)
+            await writer.drain()
+
+    await app(scope, receive, send)
+    return keep_alive
+
+
+async def serve(app, host="127.0.0.1", port=8000, ready=None):
+    """Serve *app* until cancelled. *ready*, if given, receives the bound port."""
+    server = await asyncio.start_server(
+        lambda r, w: _handle(app, r, w), host, port, limit=MAX_HEADER_BYTES)
+    if ready is not None:
+        ready(server.sockets[0].getsockname()[1])
+    async with server:
+        await server.serve_forever()
+
+
+def main(app, argv=None):
+    parser = argparse.ArgumentParser(description="Serve the game API over asyncio.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args(argv)
+    print(f"Serving on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(serve(app, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,132 @@
+import threading
+import time
+import uuid
+
+from game.config import MAX_FINISHED_JOBS, PROGRESS_INTERVAL
+
+
+class TrainingCancelled(Exception):
+    """Raised from the progress callback to stop a cancelled training run."""
+
+
+class TrainingJob:
+    """One background training run and its latest progress.
+
+    The trainer's ``progress_callback`` is called every episode; it only
+    checks for cancellation and publishes progress to waiters at most once
+    per *progress_interval* seconds, so it adds almost nothing to the loop.
+    """
+
+    def __init__(self, progress_interval=PROGRESS_INTERVAL):
+        self.id = uuid.uuid4().hex
+        self.status = "pending"
+        self.episodes_done = 0
+        self.episodes_total = None
+        self.stats = None
+        self.error = None
+        self.version = 0
+        self.progress_interval = progress_interval
+        self._last_publish = 0.0
+        self._cancel = threading.Event()
+        self._changed = threading.Condition()
+        self._listeners = set()
+
+    @property
+    def finished(self):
+        return self.status in ("done", "cancelled", "failed")
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "episodes_done": self.episodes_done,
+            "episodes_total": self.episodes_total,
+            "stats": self.stats,
+            "error": self.error,
+        }
+
+    def cancel(self):
+        self._cancel.set()
+
+    def progress(self, done, total):
+        if self._cancel.is_set():
+            raise TrainingCancelled()
+        now = time.monotonic()
+        if done == total or now - self._last_publish >= self.progress_interval:
+            self._last_publish = now
+            self._publish(episodes_done=done, episodes_total=total)
+
+    def run(self, train):
+        """Run ``train(progress_callback)`` and record its outcome."""
+        self._publish(status="running")
+        try:
+            stats = train(self.progress)
+        except TrainingCancelled:
+            self._publish(status="cancelled")
+        except Exception as e:
+            self._publish(status="failed", error=str(e))
+        else:
+            self._publish(status="done", stats=stats)
+
+    def wait(self, version, timeout=None):
+        """Block until the job changes past *version* or finishes. Returns the new version."""
+        with self._changed:
+            self._changed.wait_for(lambda: self.version > version or self.finished, timeout)
+            return self.version
+
+    def add_listener(self, listener):
+        """Call ``listener()`` from the training thread after every change, until removed."""
+        with self._changed:
+            self._listeners.add(listener)
+
+    def remove_listener(self, listener):
+        with self._changed:
+            self._listeners.discard(listener)
+
+    def _publish(self, **changes):
+        with self._changed:
+            for name, value in changes.items():
+                setattr(self, name, value)
+            self.version += 1
+            self._changed.notify_all()
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener()
+
+
+class JobManager:
+    """Runs training jobs in background threads, one at a time.
+
+    Only the *max_finished* most recent finished jobs are kept for lookup;
+    older ones are dropped when a new job starts, which bounds memory use.
+    """
+
+    def __init__(self, max_finished=MAX_FINISHED_JOBS):
+        self.max_finished = max_finished
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def running(self):
+        """Return the unfinished job, if any."""
+        return next((job for job in self._jobs.values() if not job.finished), None)
+
+    def start(self, train):
+        """Start ``train(progress_callback)`` in a new thread.
+
+        Returns (job, started); if a job is already running it is returned
+        with ``started`` False instead of starting another.
+        """
+        with self._lock:
+            job = self.running()
+            if job is not None:
+                return job, False
+            finished = list(self._jobs)  # no job is running, so all are finished
+            for job_id in finished[:max(len(finished) - self.max_finished, 0)]:
+                del self._jobs[job_id]
+            job = TrainingJob()
+            self._jobs[job.id] = job
+        threading.Thread(target=job.run, args=(train,), daemon=True).start()
+        return job, True
@@ -0,0 +1,36 @@
+"""Validation of request parameters shared by the Flask and ASGI apps."""
+from game.config import MAX_BOARD_SIZE
+
+
+def board_size(body):
+    """Optional ``rows``/``cols``/``win_length`` from a JSON body, bounded by MAX_BOARD_SIZE."""
+    size = {}
+    for name in ("rows", "cols", "win_length"):
+        value = body.get(name)
+        if value is None:
+            continue
+        if not isinstance(value, int) or isinstance(value, bool) or not 1 <= value <= MAX_BOARD_SIZE:
+            raise ValueError(f"{name} must be an integer from 1 to {MAX_BOARD_SIZE}")
+        size[name] = value
+    return size
+
+
+def move_position(body):
+    """``row`` and ``col`` from a JSON body, as integers within MAX_BOARD_SIZE."""
+    position = []
+    for name in ("row", "col"):
+        value = body.get(name)
+        if not isinstance(value, int) or isinstance(value, bool) or not 0 <= value < MAX_BOARD_SIZE:
+            raise ValueError(f"{name} must be an integer from 0 to {MAX_BOARD_SIZE - 1}")
+        position.append(value)
+    return tuple(position)
+
+
+def training_options(body):
+    """Optional ``seed`` from a JSON body for a reproducible training run."""
+    seed = body.get("seed")
+    if seed is None:
+        return {}
+    if not isinstance(seed, int) or isinstance(seed, bool) or seed < 0:
+        raise ValueError("seed must be a non-negative integer")
+    return {"seed": seed}
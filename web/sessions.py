@@ -0,0 +1,80 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from game.config import SESSION_MAX_GAMES, SESSION_TTL
+from game.session import GameSession
+
+
+class _Entry:
+    __slots__ = ("session", "lock", "last_used")
+
+    def __init__(self, session, now):
+        self.session = session
+        self.lock = threading.Lock()
+        self.last_used = now
+
+
+class SessionStore:
+    """Bounded store of :class:`GameSession` objects keyed by game id.
+
+    Games are kept in least-recently-used order. A game idle for longer than
+    *ttl* seconds is dropped, and once *max_games* are live the least
+    recently used one is evicted to make room, which bounds memory use.
+    Each game has its own lock so concurrent requests for different games
+    do not serialize on each other.
+    """
+
+    def __init__(self, max_games=SESSION_MAX_GAMES, ttl=SESSION_TTL, clock=time.monotonic):
+        self.max_games = max_games
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, game_id):
+        return game_id in self._entries
+
+    def create(self):
+        """Register a new game. Returns (game_id, session)."""
+        game_id = uuid.uuid4().hex
+        session = GameSession()
+        with self._lock:
+            now = self._clock()
+            self._expire(now)
+            while len(self._entries) >= self.max_games:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            self._entries[game_id] = _Entry(session, now)
+        return game_id, session
+
+    @contextmanager
+    def acquire(self, game_id):
+        """Hold the game's lock while the block runs. Yields None for unknown games."""
+        with self._lock:
+            now = self._clock()
+            self._expire(now)
+            entry = self._entries.get(game_id)
+            if entry is not None:
+                entry.last_used = now
+                self._entries.move_to_end(game_id)
+        if entry is None:
+            yield None
+            return
+        with entry.lock:
+            yield entry.session
+
+    def _expire(self, now):
+        # Entries are in last-used order, so expired ones are at the front.
+        while self._entries:
+            game_id, entry = next(iter(self._entries.items()))
+            if now - entry.last_used < self.ttl:
+                break
+            del self._entries[game_id]
+            self.evictions += 1
@@ -1,4 +1,5 @@
 let currentMode = null;
+let gameId = null;
 let gameDone = false;
 
 const cells = document.querySelectorAll(".cell");
@@ -21,7 +22,7 @@ async function newGame(mode) {
     const res = await fetch("/api/new-game", {
         method: "POST",
         headers: {"Content-Type": "application/json"},
-        body: JSON.stringify({mode})
+        body: JSON.stringify({mode, game_id: gameId})
     });
     if (!res.ok) {
         const data = await res.json();
@@ -29,6 +30,7 @@ async function newGame(mode) {
         return;
     }
     const state = await res.json();
+    gameId = state.game_id;
     renderBoard(state);
     newGameBtn.style.display = "inline-block";
     trainBtn.style.display = "none";
@@ -38,7 +40,7 @@ async function makeMove(row, col) {
     const res = await fetch("/api/move", {
         method: "POST",
         headers: {"Content-Type": "application/json"},
-        body: JSON.stringify({row, col})
+        body: JSON.stringify({row, col, game_id: gameId})
     });
     const state = await res.json();
     if (state.error) {
@@ -84,10 +86,24 @@ function renderBoard(state) {
 async function trainModel() {
     statusEl.textContent = "Training AI model... please wait.";
     trainBtn.disabled = true;
-    const res = await fetch("/api/train", {method: "POST"});
-    const stats = await res.json();
-    statusEl.textContent = `Training done! P1: ${stats.p1_wins}, P2: ${stats.p2_wins}, Ties: ${stats.ties}`;
-    trainBtn.style.display = "none";
+    const res = await fetch("/api/train/jobs", {method: "POST"});
+    const job = await res.json();
+    const events = new EventSource(`/api/train/jobs/${job.job_id}/events`);
+    events.onmessage = (event) => {
+        const update = JSON.parse(event.data);
+        if (update.status === "running" && update.episodes_total) {
+            const percent = Math.floor(100 * update.episodes_done / update.episodes_total);
+            statusEl.textContent = `Training AI model... ${percent}%`;
+        } else if (update.status === "done") {
+            const stats = update.stats;
+            statusEl.textContent = `Training done! P1: ${stats.p1_wins}, P2: ${stats.p2_wins}, Ties: ${stats.ties}`;
+            trainBtn.style.display = "none";
+        } else if (update.status === "failed" || update.status === "cancelled") {
+            statusEl.textContent = `Training ${update.status}.`;
+            trainBtn.disabled = false;
+        }
+        if (["done", "failed", "cancelled"].includes(update.status)) events.close();
+    };
 }
 
 async function checkModel() {